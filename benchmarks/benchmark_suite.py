@@ -0,0 +1,394 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks of the numerical functions, at several problem sizes.
+
+Each benchmark times a function over n conditions, either as a loop over the
+scalar function ("scalar") or as one call to the array version ("batch"), the
+latter also in single precision ("float32") where the array version has a
+dtype argument. The
+results are written as JSON, appended to a history file and compared with a
+baseline run, so that they can be compared across commits.
+
+Run from the command line, offline:
+    python -m pymarcyb.benchmarks.benchmark_suite --output results.json
+        --baseline baseline.json --threshold 0.25 --history history.jsonl
+"""
+
+from argparse import ArgumentParser
+from collections import namedtuple
+from datetime import datetime, timezone
+from functools import partial
+import json
+import platform
+import subprocess
+import sys
+import timeit
+from pymarcyb.trajgens import minimum_jerk_trajectory as mjt
+from pymarcyb.util.enumerations import ThrusterType, WindSpectrumType
+from pymarcyb.util.filters import lowpass_filters as lpf
+from pymarcyb.util.kinematics import angle_transformation as at
+from pymarcyb.util.kinematics import referenceframe_transformation as rt
+from pymarcyb.util.profiling import profiler
+from pymarcyb.util.thrusters import power_to_force as p2f
+from pymarcyb.util.waves import wave_spectrum as wvs
+from pymarcyb.util.wind import wind_coefficients as wc
+from pymarcyb.util.wind import wind_forces as wf
+from pymarcyb.util.wind import wind_spectrum as ws
+import numpy as np
+
+DEFAULT_SIZES = (10, 1000, 100000)
+
+# Sizes above this are skipped for the scalar loops, which would take too long
+MAX_SCALAR_SIZE = 1000
+
+VESSEL = {"frontal_area": 530.0, "lateral_area": 1500.0, "Loa": 107.5, "s_L": 11.5}
+BLENDERMANN = dict(VESSEL, vessel_type="Offshore supply vessel")
+
+Benchmark = namedtuple("Benchmark", ["name", "variant", "setup"])
+
+
+def _conditions(size, seed=0):
+    """Return random wind speeds and directions."""
+
+    rng = np.random.default_rng(seed)
+
+    return rng.uniform(1.0, 30.0, size), rng.uniform(0.0, 2 * np.pi, size)
+
+
+def _wind_forces_scalar(size):
+    """wind_forces_and_moment() for each condition."""
+
+    speeds, directions = _conditions(size)
+    return lambda: [wf.wind_forces_and_moment(U, d, **BLENDERMANN) for U, d in zip(speeds, directions)]
+
+
+def _wind_forces_batch(size, dtype=np.float64):
+    """wind_forces_and_moment_batch() for all conditions."""
+
+    speeds, directions = (values.astype(dtype) for values in _conditions(size))
+    return lambda: wf.wind_forces_and_moment_batch(speeds, directions, dtype=dtype, **BLENDERMANN)
+
+
+def _blendermann_scalar(size):
+    """blendermann() for each angle."""
+
+    _, angles = _conditions(size)
+    return lambda: [wc.blendermann("Offshore supply vessel", 530.0, 1500.0, 107.5, 11.5, a) for a in angles]
+
+
+def _blendermann_batch(size, dtype=np.float64):
+    """blendermann() for all angles at once."""
+
+    angles = _conditions(size)[1].astype(dtype)
+    return lambda: wc.blendermann("Offshore supply vessel", 530.0, 1500.0, 107.5, 11.5, angles, dtype=dtype)
+
+
+def _isherwood_scalar(size):
+    """isherwood() for each angle."""
+
+    _, angles = _conditions(size)
+    return lambda: [wc.isherwood(530.0, 1500.0, 1500.0 / 9.0, 107.5, 35.0, 107.5, 11.5, 1, a) for a in angles]
+
+
+def _isherwood_batch(size, dtype=np.float64):
+    """isherwood() for all angles at once."""
+
+    angles = _conditions(size)[1].astype(dtype)
+    return lambda: wc.isherwood(530.0, 1500.0, 1500.0 / 9.0, 107.5, 35.0, 107.5, 11.5, 1, angles, dtype=dtype)
+
+
+# The spectra are evaluated at 100 frequencies for each wind speed
+WIND_SPECTRUM_STEP = 0.01
+WAVE_SPECTRUM_STEP = 0.02
+
+
+def _wind_spectrum_scalar(spectrum_function):
+    """Setup of a wind spectrum function for each wind speed."""
+
+    def setup(size):
+        speeds, _ = _conditions(size)
+        return lambda: [spectrum_function(U, step_size=WIND_SPECTRUM_STEP) for U in speeds]
+    return setup
+
+
+def _wind_spectrum_batch(spectrum_type, dtype=np.float64):
+    """Setup of wind_spectrum_batch() for all wind speeds."""
+
+    def setup(size):
+        speeds = _conditions(size)[0].astype(dtype)
+        frequencies = np.arange(WIND_SPECTRUM_STEP, 1.0, WIND_SPECTRUM_STEP).astype(dtype)
+        return lambda: ws.wind_spectrum_batch(spectrum_type, speeds[:, np.newaxis], frequencies, dtype=dtype)
+    return setup
+
+
+def _wave_spectrum_scalar(spectrum_function):
+    """Setup of a wave spectrum function for each wind speed."""
+
+    def setup(size):
+        speeds, _ = _conditions(size)
+        return lambda: [spectrum_function(U, step_size=WAVE_SPECTRUM_STEP) for U in speeds]
+    return setup
+
+
+def _wave_spectrum_batch(spectrum_function, dtype=np.float64):
+    """Setup of a batch wave spectrum function for all wind speeds."""
+
+    def setup(size):
+        speeds = _conditions(size)[0].astype(dtype)
+        omegas = np.arange(0.01, 2.0, WAVE_SPECTRUM_STEP).astype(dtype)
+        return lambda: spectrum_function(speeds[:, np.newaxis], omegas, dtype=dtype)
+    return setup
+
+
+def _lowpass_filter_scalar(size):
+    """lowpass_filter() of a series."""
+
+    series = list(np.random.default_rng(0).normal(size=size))
+    return lambda: lpf.lowpass_filter(series, 10.0)
+
+
+def _lowpass_filter_batch(size, dtype=np.float64):
+    """lowpass_filter_batch() of a series."""
+
+    series = np.random.default_rng(0).normal(size=size).astype(dtype)
+    return lambda: lpf.lowpass_filter_batch(series, 10.0, dtype=dtype)
+
+
+def _transform_to_pipi_scalar(size):
+    """transform_to_pipi() for each angle."""
+
+    _, angles = _conditions(size)
+    angles = 10.0 * angles - 30.0
+    return lambda: [at.transform_to_pipi(a) for a in angles]
+
+
+def _transform_to_pipi_batch(size, dtype=np.float64):
+    """transform_to_pipi_array() for all angles."""
+
+    _, angles = _conditions(size)
+    angles = (10.0 * angles - 30.0).astype(dtype)
+    return lambda: at.transform_to_pipi_array(angles, dtype=dtype)
+
+
+def _rotations_scalar(size):
+    """rotate_NED_to_BODY() and back for each coordinate."""
+
+    rng = np.random.default_rng(0)
+    coordinates = [np.matrix(rng.normal(size=(3, 1))) for _ in range(size)]
+    return lambda: [rt.rotate_BODY_to_NED(rt.rotate_NED_to_BODY(c)) for c in coordinates]
+
+
+def _rotations_batch(size, dtype=np.float64):
+    """rotate_NED_to_BODY_batch() and back for all coordinates."""
+
+    coordinates = np.random.default_rng(0).normal(size=(3, size)).astype(dtype)
+    return lambda: rt.rotate_BODY_to_NED_batch(rt.rotate_NED_to_BODY_batch(coordinates, dtype=dtype), dtype=dtype)
+
+
+def _mjtg_scalar(size):
+    """mjtg() with size samples."""
+
+    return lambda: mjt.mjtg(15.0, 27.0, size / 10.0, 10.0)
+
+
+def _mjtg_batch(size, dtype=np.float64):
+    """mjtg_array() with size samples."""
+
+    return lambda: mjt.mjtg_array(15.0, 27.0, size / 10.0, 10.0, dtype=dtype)
+
+def _imca_p2f_scalar(size):
+    """imca_p2f() for each thruster."""
+
+    rng = np.random.default_rng(0)
+    types = rng.choice([ThrusterType.tunnel, ThrusterType.azimuth, ThrusterType.propeller], size)
+    powers = rng.uniform(500.0, 3000.0, size)
+    return lambda: [p2f.imca_p2f(t, p, p) for t, p in zip(types, powers)]
+
+
+def _imca_p2f_batch(size):
+    """imca_p2f_batch() for all thrusters."""
+
+    rng = np.random.default_rng(0)
+    types = rng.choice([ThrusterType.tunnel.value, ThrusterType.azimuth.value, ThrusterType.propeller.value], size)
+    powers = rng.uniform(500.0, 3000.0, size)
+    return lambda: p2f.imca_p2f_batch(types, powers, powers)
+
+
+BENCHMARKS = [
+    Benchmark("wind_forces_and_moment", "scalar", _wind_forces_scalar),
+    Benchmark("wind_forces_and_moment", "batch", _wind_forces_batch),
+    Benchmark("wind_forces_and_moment", "float32", partial(_wind_forces_batch, dtype=np.float32)),
+    Benchmark("blendermann", "scalar", _blendermann_scalar),
+    Benchmark("blendermann", "batch", _blendermann_batch),
+    Benchmark("blendermann", "float32", partial(_blendermann_batch, dtype=np.float32)),
+    Benchmark("isherwood", "scalar", _isherwood_scalar),
+    Benchmark("isherwood", "batch", _isherwood_batch),
+    Benchmark("isherwood", "float32", partial(_isherwood_batch, dtype=np.float32)),
+    Benchmark("davenport", "scalar", _wind_spectrum_scalar(ws.davenport)),
+    Benchmark("davenport", "batch", _wind_spectrum_batch(WindSpectrumType.davenport)),
+    Benchmark("davenport", "float32", _wind_spectrum_batch(WindSpectrumType.davenport, np.float32)),
+    Benchmark("harris", "scalar", _wind_spectrum_scalar(ws.harris)),
+    Benchmark("harris", "batch", _wind_spectrum_batch(WindSpectrumType.harris)),
+    Benchmark("harris", "float32", _wind_spectrum_batch(WindSpectrumType.harris, np.float32)),
+    Benchmark("ochi_shin", "scalar", _wind_spectrum_scalar(ws.ochi_shin)),
+    Benchmark("ochi_shin", "batch", _wind_spectrum_batch(WindSpectrumType.ochi_shin)),
+    Benchmark("ochi_shin", "float32", _wind_spectrum_batch(WindSpectrumType.ochi_shin, np.float32)),
+    Benchmark("npd", "scalar", _wind_spectrum_scalar(ws.npd)),
+    Benchmark("npd", "batch", _wind_spectrum_batch(WindSpectrumType.npd)),
+    Benchmark("npd", "float32", _wind_spectrum_batch(WindSpectrumType.npd, np.float32)),
+    Benchmark("api", "scalar", _wind_spectrum_scalar(ws.api)),
+    Benchmark("api", "batch", _wind_spectrum_batch(WindSpectrumType.api)),
+    Benchmark("api", "float32", _wind_spectrum_batch(WindSpectrumType.api, np.float32)),
+    Benchmark("pierson_moskowitz", "scalar", _wave_spectrum_scalar(wvs.pierson_moskowitz)),
+    Benchmark("pierson_moskowitz", "batch", _wave_spectrum_batch(wvs.pierson_moskowitz_batch)),
+    Benchmark("pierson_moskowitz", "float32", _wave_spectrum_batch(wvs.pierson_moskowitz_batch, np.float32)),
+    Benchmark("jonswap", "scalar", _wave_spectrum_scalar(wvs.jonswap)),
+    Benchmark("jonswap", "batch", _wave_spectrum_batch(wvs.jonswap_batch)),
+    Benchmark("jonswap", "float32", _wave_spectrum_batch(wvs.jonswap_batch, np.float32)),
+    Benchmark("lowpass_filter", "scalar", _lowpass_filter_scalar),
+    Benchmark("lowpass_filter", "batch", _lowpass_filter_batch),
+    Benchmark("lowpass_filter", "float32", partial(_lowpass_filter_batch, dtype=np.float32)),
+    Benchmark("transform_to_pipi", "scalar", _transform_to_pipi_scalar),
+    Benchmark("transform_to_pipi", "batch", _transform_to_pipi_batch),
+    Benchmark("transform_to_pipi", "float32", partial(_transform_to_pipi_batch, dtype=np.float32)),
+    Benchmark("rotations", "scalar", _rotations_scalar),
+    Benchmark("rotations", "batch", _rotations_batch),
+    Benchmark("rotations", "float32", partial(_rotations_batch, dtype=np.float32)),
+    Benchmark("mjtg", "scalar", _mjtg_scalar),
+    Benchmark("mjtg", "batch", _mjtg_batch),
+    Benchmark("mjtg", "float32", partial(_mjtg_batch, dtype=np.float32)),
+    Benchmark("imca_p2f", "scalar", _imca_p2f_scalar),
+    Benchmark("imca_p2f", "batch", _imca_p2f_batch),
+]
+
+
+def run(sizes=DEFAULT_SIZES, names=None, repeat=3, min_time=0.05, max_scalar_size=MAX_SCALAR_SIZE):
+    """Run the benchmarks.
+
+    Args:
+        sizes (list of ints)        -- the problem sizes (default: DEFAULT_SIZES)
+        names (list of strings)     -- names of the benchmarks to run (default: None, all)
+        repeat (int)                -- number of timings of each benchmark, the best is used (default: 3)
+        min_time (float)            -- minimum duration of each timing in s (default: 0.05)
+        max_scalar_size (int)       -- largest size for the scalar loops (default: MAX_SCALAR_SIZE)
+
+    Returns:
+        results (dict)              -- seconds per call and per item, keyed by "name/variant/size"
+    """
+
+    results = {}
+
+    for benchmark in BENCHMARKS:
+        if names is not None and benchmark.name not in names:
+            continue
+
+        for size in sizes:
+            if benchmark.variant == "scalar" and size > max_scalar_size:
+                continue
+
+            timer = timeit.Timer(benchmark.setup(size))
+            number = 1
+            while timer.timeit(number) < min_time and number < 10**6:
+                number *= 10
+            best = min(timer.repeat(repeat, number)) / number
+
+            results["{0}/{1}/{2}".format(benchmark.name, benchmark.variant, size)] = {
+                "name": benchmark.name, "variant": benchmark.variant, "size": size,
+                "seconds": best, "seconds_per_item": best / size}
+
+    return results
+
+
+def environment():
+    """Return a description of the machine and the code the benchmarks ran on."""
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=10,
+                                cwd=sys.path[0] or None).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {"commit": commit, "time": datetime.now(timezone.utc).isoformat(), "python": platform.python_version(),
+            "numpy": np.__version__, "machine": platform.machine(), "processor": platform.processor(),
+            "system": platform.platform()}
+
+
+def compare(results, baseline, threshold=0.25):
+    """Compare results with a baseline.
+
+    Args:
+        results (dict)              -- the results of run()
+        baseline (dict)             -- earlier results of run()
+        threshold (float)           -- relative slowdown counted as a regression (default: 0.25)
+
+    Returns:
+        ratios (dict)               -- new time / baseline time, for the keys in both
+        regressions (list)          -- the keys slower than the threshold
+    """
+
+    ratios = {key: results[key]["seconds"] / baseline[key]["seconds"] for key in results if key in baseline}
+    regressions = [key for key, ratio in ratios.items() if ratio > 1.0 + threshold]
+
+    return ratios, regressions
+
+
+def main(argv=None):
+    """Run the benchmarks from the command line.
+
+    Args:
+        argv (list of strings)      -- the arguments (default: None, sys.argv[1:])
+
+    Returns:
+        status (int)                -- 1 if there are regressions, otherwise 0
+    """
+
+    parser = ArgumentParser(description="Benchmarks of the pymarcyb numerical functions.")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="comma-separated problem sizes")
+    parser.add_argument("--names", help="comma-separated names of the benchmarks to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-time", type=float, default=0.05, help="minimum duration of each timing in s")
+    parser.add_argument("--output", help="JSON file to write the results to")
+    parser.add_argument("--history", help="JSON lines file to append the results to")
+    parser.add_argument("--baseline", help="JSON file with earlier results to compare with")
+    parser.add_argument("--threshold", type=float, default=0.25, help="relative slowdown counted as a regression")
+    parser.add_argument("--profile", action="store_true",
+                        help="run with profiling enabled, to measure its overhead, and print the profile")
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        profiler.enable()
+    try:
+        results = run([int(size) for size in args.sizes.split(",")], args.names.split(",") if args.names else None,
+                      args.repeat, args.min_time)
+    finally:
+        profiler.disable()
+    document = {"environment": dict(environment(), profiling=args.profile), "results": results}
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    ratios, regressions = compare(results, baseline, args.threshold) if baseline else ({}, [])
+
+    print("{0:<40} {1:>14} {2:>14} {3:>8}".format("benchmark", "s/call", "s/item", "ratio"))
+    for key, result in results.items():
+        ratio = "{0:.2f}".format(ratios[key]) if key in ratios else ""
+        flag = " REGRESSION" if key in regressions else ""
+        print("{0:<40} {1:>14.3e} {2:>14.3e} {3:>8}{4}".format(key, result["seconds"], result["seconds_per_item"],
+                                                                ratio, flag))
+
+    if args.profile:
+        print("\n" + profiler.report())
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+    if args.history:
+        with open(args.history, "a") as f:
+            f.write(json.dumps(document, sort_keys=True) + "\n")
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
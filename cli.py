@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+"""Command-line interface for bulk calculations over condition tables.
+
+The condition tables are read in chunks from CSV files with a header line, or from
+.npy files, which are memory-mapped. A .npy file either has named fields, or is a
+2-D array with the column names given by --columns. Each chunk is pushed through
+the vectorized functions and written to the output file before the next chunk is
+read, so memory use is bounded by the chunk size.
+
+Example:
+    pymarcyb wind-forces conditions.csv forces.npy --frontal-area 530 --lateral-area 1500
+        --loa 107.5 --s-l 11.5 --vessel-type "Offshore supply vessel"
+"""
+
+from argparse import ArgumentParser
+from itertools import islice
+import sys
+import time
+from pymarcyb.util.enumerations import CoefficientType, WindSpectrumType
+from pymarcyb.util.thrusters import power_to_force as p2f
+from pymarcyb.util.waves import wave_spectrum as wvs
+from pymarcyb.util.wind import wind_forces as wf
+from pymarcyb.util.wind import wind_spectrum as ws
+import numpy as np
+
+
+def main(argv=None):
+    """Run the command line interface.
+
+    Args:
+        argv (list of strings)      -- the arguments (default: None, sys.argv[1:])
+
+    Returns:
+        status (int)                -- the exit status
+    """
+
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.check is not None:
+        args.check(parser, args)
+
+    names = args.columns.split(",") if args.columns else None
+    try:
+        columns, chunks = _read_chunks(args.input, args.chunk_size, names)
+    except ValueError as error:
+        print("pymarcyb: error: {0}".format(error), file=sys.stderr)
+        return 1
+
+    missing = [name for name in args.required if name not in columns]
+    if missing:
+        parser.error("Missing input columns: {0}".format(", ".join(missing)))
+
+    # Only a .npy output is preallocated, so only then is a CSV input read an extra time to count the rows
+    n_rows = _count_rows(args.input) if args.output.endswith(".npy") else None
+    writer = _Writer(args.output, args.output_columns(args), n_rows)
+
+    total_rows = 0
+    start = chunk_start = time.perf_counter()
+    try:
+        for i, chunk in enumerate(chunks):
+            try:
+                writer.write(args.calculate(args, chunk))
+            except ValueError as error:
+                print("pymarcyb: error: {0}".format(error), file=sys.stderr)
+                return 1
+
+            n_chunk = len(next(iter(chunk.values())))
+            total_rows += n_chunk
+            if not args.quiet:
+                elapsed = time.perf_counter() - chunk_start
+                print("Chunk {0}: {1} rows in {2:.3f} s ({3:.0f} rows/s)"
+                      .format(i, n_chunk, elapsed, n_chunk / max(elapsed, 1e-12)), file=sys.stderr)
+            chunk_start = time.perf_counter()
+    finally:
+        writer.close()
+
+    if not args.quiet:
+        elapsed = time.perf_counter() - start
+        print("Total: {0} rows in {1:.3f} s ({2:.0f} rows/s)"
+              .format(total_rows, elapsed, total_rows / max(elapsed, 1e-12)), file=sys.stderr)
+
+    return 0
+
+
+def _wind_forces(args, chunk):
+    """Wind forces and moment for each row."""
+
+    directions = chunk["wind_direction"]
+    headings = chunk.get("vessel_heading", 0.0)
+    if args.degrees:
+        directions, headings = np.radians(directions), np.radians(headings)
+
+    loads = wf.wind_forces_and_moment_batch(
+        chunk["wind_speed"], directions, args.frontal_area, args.lateral_area, args.loa, args.s_l,
+        coeffs=CoefficientType[args.coeffs], vessel_type=args.vessel_type,
+        superstructure_area=args.superstructure_area, breadth=args.breadth, S=args.S, masts=args.masts,
+        temperature=chunk.get("temperature", 20.0), vessel_heading=headings,
+        vessel_speed_surge=chunk.get("vessel_speed_surge", 0.0),
+        vessel_speed_sway=chunk.get("vessel_speed_sway", 0.0))
+
+    return loads.T
+
+
+def _check_wind_spectrum(parser, args):
+    """Reject the spectrum parameters the chosen spectrum type does not have."""
+
+    accepted = ws.WIND_SPECTRUM_PARAMETERS[WindSpectrumType[args.type]]
+    rejected = ["--" + name for name in ("kappa", "L", "C_10", "C")
+                if getattr(args, name) is not None and name not in accepted]
+    if rejected:
+        parser.error("The {0} spectrum does not take: {1}".format(args.type, ", ".join(rejected)))
+
+
+def _wind_spectrum(args, chunk):
+    """Wind gust spectrum at the given frequencies for each row."""
+
+    parameters = {name: getattr(args, name) for name in ws.WIND_SPECTRUM_PARAMETERS[WindSpectrumType[args.type]]
+                  if getattr(args, name) is not None}
+
+    return ws.wind_spectrum_batch(WindSpectrumType[args.type], chunk["U_10"][:, np.newaxis],
+                                  _floats(args.frequencies), **parameters)
+
+
+def _wave_spectrum(args, chunk):
+    """Wave spectrum at the given circular frequencies for each row."""
+
+    U_10 = chunk["U_10"][:, np.newaxis]
+    omegas = _floats(args.omegas)
+
+    if args.type == "pierson_moskowitz":
+        beta = 0.74 if args.beta is None else args.beta
+        return wvs.pierson_moskowitz_batch(U_10, omegas, alpha=args.alpha, beta=beta)
+
+    beta = 1.25 if args.beta is None else args.beta
+    if "fetch" in chunk:
+        return wvs.jonswap_batch(U_10, omegas, fetch_dependent=True, fetch=chunk["fetch"][:, np.newaxis],
+                                 beta=beta, gamma=args.gamma)
+
+    return wvs.jonswap_batch(U_10, omegas, alpha=args.alpha, beta=beta, gamma=args.gamma, omega_p=args.omega_p)
+
+
+def _thruster_limits(args, chunk):
+    """Maximum thruster forces for each row, from ABS if the diameter is given, otherwise IMCA."""
+
+    if "diameter" not in chunk and "thruster_type" not in chunk:
+        raise ValueError("Missing input columns: thruster_type or diameter")
+
+    if "diameter" in chunk:
+        ducted = chunk.get("ducted", np.zeros(len(chunk["diameter"]))).astype(bool)
+        forces = p2f.abs_p2f_batch(chunk["power_positive"], chunk["power_negative"], chunk["diameter"], ducted)
+    else:
+        forces = p2f.imca_p2f_batch(chunk["thruster_type"].astype(int), chunk["power_positive"],
+                                    chunk["power_negative"])
+
+    return np.column_stack(forces)
+
+
+def _parser():
+    """Return the argument parser with its subcommands."""
+
+    parser = ArgumentParser(prog="pymarcyb", description="Bulk calculations over condition tables.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    common = ArgumentParser(add_help=False)
+    common.add_argument("input", help="input .csv or .npy file")
+    common.add_argument("output", help="output .csv or .npy file")
+    common.add_argument("--chunk-size", type=int, default=1000000, help="rows per chunk (default: 1000000)")
+    common.add_argument("--columns", help="comma-separated column names of a 2-D .npy input")
+    common.add_argument("--quiet", action="store_true", help="do not report the throughput")
+    common.set_defaults(check=None)
+
+    wind_forces = subparsers.add_parser(
+        "wind-forces", parents=[common],
+        help="wind forces and moment, from columns wind_speed and wind_direction, and optionally "
+             "vessel_heading, vessel_speed_surge, vessel_speed_sway and temperature")
+    wind_forces.add_argument("--frontal-area", type=float, required=True)
+    wind_forces.add_argument("--lateral-area", type=float, required=True)
+    wind_forces.add_argument("--loa", type=float, required=True)
+    wind_forces.add_argument("--s-l", type=float, required=True)
+    wind_forces.add_argument("--coeffs", choices=["blendermann", "isherwood"], default="blendermann")
+    wind_forces.add_argument("--vessel-type")
+    wind_forces.add_argument("--superstructure-area", type=float)
+    wind_forces.add_argument("--breadth", type=float)
+    wind_forces.add_argument("--S", type=float)
+    wind_forces.add_argument("--masts", type=int)
+    wind_forces.add_argument("--degrees", action="store_true", help="the angles are in degrees")
+    wind_forces.set_defaults(calculate=_wind_forces, required=["wind_speed", "wind_direction"],
+                             output_columns=lambda args: ["force_surge", "force_sway", "moment_yaw"])
+
+    wind_spectrum = subparsers.add_parser(
+        "wind-spectrum", parents=[common], help="wind gust spectrum at given frequencies, from column U_10")
+    wind_spectrum.add_argument("--type", choices=[t.name for t in WindSpectrumType], default="harris")
+    wind_spectrum.add_argument("--frequencies", required=True, help="comma-separated frequencies in Hz")
+    wind_spectrum.add_argument("--kappa", type=float)
+    wind_spectrum.add_argument("--L", type=float)
+    wind_spectrum.add_argument("--C_10", type=float)
+    wind_spectrum.add_argument("--C", type=float)
+    wind_spectrum.set_defaults(calculate=_wind_spectrum, check=_check_wind_spectrum, required=["U_10"],
+                               output_columns=lambda args: ["S_" + f for f in args.frequencies.split(",")])
+
+    wave_spectrum = subparsers.add_parser(
+        "wave-spectrum", parents=[common],
+        help="wave spectrum at given circular frequencies, from column U_10, and optionally fetch for JONSWAP")
+    wave_spectrum.add_argument("--type", choices=["pierson_moskowitz", "jonswap"], default="pierson_moskowitz")
+    wave_spectrum.add_argument("--omegas", required=True, help="comma-separated circular frequencies in rad/s")
+    wave_spectrum.add_argument("--alpha", type=float, default=0.0081)
+    wave_spectrum.add_argument("--beta", type=float, help="default: 0.74 for Pierson-Moskowitz, 1.25 for JONSWAP")
+    wave_spectrum.add_argument("--gamma", type=float, default=3.3)
+    wave_spectrum.add_argument("--omega-p", type=float, default=0.5)
+    wave_spectrum.set_defaults(calculate=_wave_spectrum, required=["U_10"],
+                               output_columns=lambda args: ["S_" + w for w in args.omegas.split(",")])
+
+    thruster_limits = subparsers.add_parser(
+        "thruster-limits", parents=[common],
+        help="maximum thruster forces, from columns power_positive, power_negative and thruster_type "
+             "(IMCA), or diameter and optionally ducted (ABS)")
+    thruster_limits.set_defaults(calculate=_thruster_limits, required=["power_positive", "power_negative"],
+                                 output_columns=lambda args: ["max_force_positive", "max_force_negative"])
+
+    return parser
+
+
+def _floats(values):
+    """Parse a comma-separated list of floats."""
+
+    return np.array([float(value) for value in values.split(",")])
+
+
+def _count_rows(path):
+    """Return the number of rows of an input file."""
+
+    if path.endswith(".npy"):
+        return len(np.load(path, mmap_mode="r"))
+
+    with open(path) as f:
+        return sum(1 for line in f if line.strip()) - 1
+
+
+def _read_chunks(path, chunk_size, names=None):
+    """Return the column names of the input file, and an iterator over it in chunks, as dicts from
+    column name to array. The input is checked here, before the output file is created.
+
+    Raises:
+        ValueError                  -- if a .npy file without named fields is given no column names
+    """
+
+    if path.endswith(".npy"):
+        table = np.load(path, mmap_mode="r")
+        if table.dtype.names is None and names is None:
+            raise ValueError("--columns is needed for a .npy file without named fields.")
+        return list(table.dtype.names or names), _npy_chunks(table, chunk_size, names)
+
+    with open(path) as f:
+        header = [name.strip() for name in f.readline().split(",")]
+
+    return header, _csv_chunks(path, chunk_size)
+
+
+def _npy_chunks(table, chunk_size, names):
+    """Yield a memory-mapped table in chunks."""
+
+    for start in range(0, len(table), chunk_size):
+        rows = table[start:start + chunk_size]
+        if table.dtype.names is not None:
+            yield {name: np.asarray(rows[name], dtype=float) for name in table.dtype.names}
+        else:
+            rows = np.asarray(rows, dtype=float).reshape(len(rows), -1)
+            yield {name: rows[:, i] for i, name in enumerate(names)}
+
+
+def _csv_chunks(path, chunk_size):
+    """Yield a CSV file with a header line in chunks."""
+
+    with open(path) as f:
+        header = [name.strip() for name in f.readline().split(",")]
+        while True:
+            lines = [line for line in islice(f, chunk_size) if line.strip()]
+            if not lines:
+                return
+            rows = np.loadtxt(lines, delimiter=",", ndmin=2)
+            yield {name: rows[:, i] for i, name in enumerate(header)}
+
+
+class _Writer(object):
+    """Streams chunks of results to a .csv file, or to a memory-mapped .npy file."""
+
+    def __init__(self, path, columns, n_rows=None):
+        """Open the output file, with room for n_rows rows if it is a .npy file. n_rows is not needed
+        for a .csv file.
+        """
+
+        self._row = 0
+        if path.endswith(".npy"):
+            self._file = None
+            self._table = np.lib.format.open_memmap(path, mode="w+", dtype=float, shape=(n_rows, len(columns)))
+        else:
+            self._file = open(path, "w")
+            self._file.write(",".join(columns) + "\n")
+
+    def write(self, results):
+        """Write the results of a chunk, one row per input row."""
+
+        results = np.asarray(results, dtype=float).reshape(len(results), -1)
+        if self._file is None:
+            self._table[self._row:self._row + len(results)] = results
+        else:
+            np.savetxt(self._file, results, delimiter=",", fmt="%.10g")
+        self._row += len(results)
+
+    def close(self):
+        """Flush and close the output file."""
+
+        if self._file is None:
+            self._table.flush()
+            del self._table
+        else:
+            self._file.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
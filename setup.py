@@ -13,5 +13,6 @@ setup(name='pymarcyb',
       license='GPLv3',
       packages=['pymarcyb'],
       install_requires=['numpy'],
+      entry_points={'console_scripts': ['pymarcyb = pymarcyb.cli:main']},
       include_package_data=True,
       zip_safe=False)
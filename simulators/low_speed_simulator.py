@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""Time-domain simulator for the 3-DOF low-speed manoeuvring model.
+
+    eta_dot = R(psi) nu
+    M nu_dot + D nu = tau_wind + tau_waves + tau_thrust
+
+where eta = (north, east, heading) and nu = (surge, sway, yaw rate). The loads
+are in kN and kNm, so M has to be given in tonnes (and tonne m^2 for yaw) and D
+in kN s/m (and kNm s for yaw).
+
+Everything that does not depend on the vessel state is prepared before the time
+loop. The wind coefficients are tabulated over the angle of attack once, for a
+wind speed of 1 m/s, and the wind loads are scaled with the relative wind speed
+squared in the loop. The wave loads and the thrust are given as time series. The
+loads are held constant over each time step, so the time loop only does scalar
+matrix-vector work on preallocated arrays.
+"""
+
+from math import atan2, cos, pi, sin
+from pymarcyb.util.enumerations import IntegrationMethod
+from pymarcyb.util.wind import wind_forces as wf
+import numpy as np
+
+
+class LowSpeedSimulator(object):
+    """Simulator for a vessel with mass matrix M and linear damping matrix D."""
+
+    def __init__(self, M, D, wind_parameters=None, n_wind_angles=720, cache=None):
+        """Set up the simulator.
+
+        Args:
+            M (array of floats)         -- mass matrix including added mass, shape (3, 3)
+            D (array of floats)         -- linear damping matrix, shape (3, 3)
+            wind_parameters (dict)      -- keyword arguments for wind_forces_and_moment_batch(),
+                                           except wind_speed, wind_direction and the vessel
+                                           state (default: None, no wind loads)
+            n_wind_angles (int)         -- number of angles of attack in the wind table (default: 720)
+            cache (ModelCache)          -- cache to load the wind table from, or store it in
+                                           (default: None, no cache)
+        """
+
+        self.M = np.array(M, dtype=float).reshape(3, 3)
+        self.D = np.array(D, dtype=float).reshape(3, 3)
+        self.M_inv = np.linalg.inv(self.M)
+        self._F = -self.M_inv @ self.D
+
+        self.wind_parameters = wind_parameters
+        self.n_wind_angles = n_wind_angles
+
+        if wind_parameters is None:
+            self.wind_table = np.zeros((3, n_wind_angles + 2))
+        else:
+            def build():
+                # With the vessel at rest and heading north, the angle of attack equals the wind direction.
+                angles = np.arange(n_wind_angles + 2) * (2 * pi / n_wind_angles)
+                return {"wind_table": wf.wind_forces_and_moment_batch(1.0, angles, **wind_parameters)}
+
+            if cache is None:
+                self.wind_table = build()["wind_table"]
+            else:
+                self.wind_table = cache.get_or_build("low_speed_wind_table", {"wind_parameters": wind_parameters,
+                                                                              "n_wind_angles": n_wind_angles},
+                                                     build)["wind_table"]
+
+    def simulate(self, dt, n_steps, eta_0=(0.0, 0.0, 0.0), nu_0=(0.0, 0.0, 0.0), wind_speed=0.0,
+                 wind_direction=0.0, wave_loads=None, thrust=None, method=IntegrationMethod.rk4, out=None):
+        """Run a simulation with a fixed time step.
+
+        Args:
+            dt (float)                          -- time step in s
+            n_steps (int)                       -- number of time steps
+            eta_0 (array of floats)             -- initial north and east in m and heading in radians
+            nu_0 (array of floats)              -- initial surge and sway speed in m/s and yaw rate in rad/s
+            wind_speed (float or array)         -- wind speed in m/s, per time step, e.g. a mean wind
+                                                   speed plus a gust realization (default: 0.0)
+            wind_direction (float or array)     -- direction the wind is coming from, in radians, per
+                                                   time step (default: 0.0)
+            wave_loads (array of floats)        -- wave forces and moment in BODY in kN/kNm, shape
+                                                   (3, n_steps) (default: None, no wave loads)
+            thrust (array of floats)            -- thruster forces and moment in BODY in kN/kNm, shape
+                                                   (3, n_steps) (default: None, no thrust)
+            method (IntegrationMethod)          -- the integration method (default: rk4)
+            out (tuple of np.ndarray)           -- preallocated C-contiguous float64 eta and nu output arrays,
+                                                   each of shape (3, n_steps + 1), e.g. from an earlier run
+                                                   (default: None, allocated)
+
+        Returns:
+            times (np.ndarray)                  -- the times in s, shape (n_steps + 1,)
+            eta (np.ndarray)                    -- north, east and heading, shape (3, n_steps + 1)
+            nu (np.ndarray)                     -- surge and sway speed and yaw rate, shape (3, n_steps + 1)
+
+        Raises:
+            ValueError                          -- if the integration method is unknown, or an output array
+                                                   is not C-contiguous float64 of the right shape
+        """
+
+        if method not in (IntegrationMethod.rk4, IntegrationMethod.semi_implicit_euler):
+            raise ValueError("Illegal integration method: {0}".format(method))
+
+        n_samples = n_steps + 1
+        if out is None:
+            eta, nu = np.empty((3, n_samples)), np.empty((3, n_samples))
+        else:
+            eta, nu = out
+            # The time loop writes through flat views, which would be copies of any other layout
+            for array in (eta, nu):
+                if array.dtype != np.float64 or array.shape != (3, n_samples) or not array.flags.c_contiguous:
+                    raise ValueError("Illegal output array: {0} {1}, C-contiguous: {2}".format(
+                        array.dtype, array.shape, array.flags.c_contiguous))
+        eta[:, 0] = eta_0
+        nu[:, 0] = nu_0
+
+        # Environmental and thruster loads, prepared for the whole run
+        external = np.zeros((3, n_steps))
+        if wave_loads is not None:
+            external += wave_loads
+        if thrust is not None:
+            external += thrust
+        external = self.M_inv @ external
+
+        speeds = np.ascontiguousarray(np.broadcast_to(np.asarray(wind_speed, dtype=float), (n_steps,)))
+        directions = np.ascontiguousarray(np.broadcast_to(np.asarray(wind_direction, dtype=float), (n_steps,)))
+        wind_table = self.M_inv @ self.wind_table
+
+        self._run(dt, n_steps, method is IntegrationMethod.rk4, memoryview(external.reshape(-1)),
+                  memoryview(speeds), memoryview(directions), wind_table, memoryview(eta.reshape(-1)),
+                  memoryview(nu.reshape(-1)))
+
+        return np.arange(n_samples) * dt, eta, nu
+
+    def _run(self, h, n_steps, rk4, external, speeds, directions, wind_table, eta, nu):
+        """The time loop, on flat memoryviews of the inputs and outputs."""
+
+        (F00, F01, F02), (F10, F11, F12), (F20, F21, F22) = self._F.tolist()
+        table_x, table_y, table_n = (memoryview(np.ascontiguousarray(row)) for row in wind_table)
+        bins_per_radian = self.n_wind_angles / (2 * pi)
+        wind = self.wind_parameters is not None
+        half_h, sixth_h = 0.5 * h, h / 6.0
+
+        n_samples = n_steps + 1
+        north, east, psi = eta[0], eta[n_samples], eta[2 * n_samples]
+        u, v, r = nu[0], nu[n_samples], nu[2 * n_samples]
+
+        for k in range(n_steps):
+            # Loads per unit mass, held over the step
+            gx, gy, gn = external[k], external[n_steps + k], external[2 * n_steps + k]
+
+            if wind:
+                U = speeds[k]
+                relative_angle = directions[k] - psi
+                relative_u = u - U * cos(relative_angle)
+                relative_v = v - U * sin(relative_angle)
+                squared_speed = relative_u * relative_u + relative_v * relative_v
+                x = (atan2(relative_v, relative_u) + pi) * bins_per_radian
+                i = int(x)
+                w = x - i
+                gx += squared_speed * (table_x[i] + w * (table_x[i + 1] - table_x[i]))
+                gy += squared_speed * (table_y[i] + w * (table_y[i + 1] - table_y[i]))
+                gn += squared_speed * (table_n[i] + w * (table_n[i + 1] - table_n[i]))
+
+            if rk4:
+                c, s = cos(psi), sin(psi)
+                a1u = F00 * u + F01 * v + F02 * r + gx
+                a1v = F10 * u + F11 * v + F12 * r + gy
+                a1r = F20 * u + F21 * v + F22 * r + gn
+                d1n, d1e = c * u - s * v, s * u + c * v
+
+                u2, v2, r2 = u + half_h * a1u, v + half_h * a1v, r + half_h * a1r
+                psi2 = psi + half_h * r
+                c, s = cos(psi2), sin(psi2)
+                a2u = F00 * u2 + F01 * v2 + F02 * r2 + gx
+                a2v = F10 * u2 + F11 * v2 + F12 * r2 + gy
+                a2r = F20 * u2 + F21 * v2 + F22 * r2 + gn
+                d2n, d2e = c * u2 - s * v2, s * u2 + c * v2
+
+                u3, v3, r3 = u + half_h * a2u, v + half_h * a2v, r + half_h * a2r
+                psi3 = psi + half_h * r2
+                c, s = cos(psi3), sin(psi3)
+                a3u = F00 * u3 + F01 * v3 + F02 * r3 + gx
+                a3v = F10 * u3 + F11 * v3 + F12 * r3 + gy
+                a3r = F20 * u3 + F21 * v3 + F22 * r3 + gn
+                d3n, d3e = c * u3 - s * v3, s * u3 + c * v3
+
+                u4, v4, r4 = u + h * a3u, v + h * a3v, r + h * a3r
+                psi4 = psi + h * r3
+                c, s = cos(psi4), sin(psi4)
+                a4u = F00 * u4 + F01 * v4 + F02 * r4 + gx
+                a4v = F10 * u4 + F11 * v4 + F12 * r4 + gy
+                a4r = F20 * u4 + F21 * v4 + F22 * r4 + gn
+                d4n, d4e = c * u4 - s * v4, s * u4 + c * v4
+
+                north += sixth_h * (d1n + 2.0 * (d2n + d3n) + d4n)
+                east += sixth_h * (d1e + 2.0 * (d2e + d3e) + d4e)
+                psi += sixth_h * (r + 2.0 * (r2 + r3) + r4)
+                u += sixth_h * (a1u + 2.0 * (a2u + a3u) + a4u)
+                v += sixth_h * (a1v + 2.0 * (a2v + a3v) + a4v)
+                r += sixth_h * (a1r + 2.0 * (a2r + a3r) + a4r)
+            else:
+                # Semi-implicit Euler: the position is updated with the new velocity
+                u, v, r = (u + h * (F00 * u + F01 * v + F02 * r + gx),
+                           v + h * (F10 * u + F11 * v + F12 * r + gy),
+                           r + h * (F20 * u + F21 * v + F22 * r + gn))
+                c, s = cos(psi), sin(psi)
+                north += h * (c * u - s * v)
+                east += h * (s * u + c * v)
+                psi += h * r
+
+            j = k + 1
+            eta[j], eta[n_samples + j], eta[2 * n_samples + j] = north, east, psi
+            nu[j], nu[n_samples + j], nu[2 * n_samples + j] = u, v, r
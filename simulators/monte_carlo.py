@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""Monte Carlo runner for station-keeping statistics over randomized scenarios.
+
+Each scenario has a wind speed and direction, and its own gust and wave seeds.
+The seeds are spawned from one SeedSequence per scenario, so a run is reproducible
+no matter how many processes are used or in what order the scenarios finish.
+
+The wind and wave spectra are tabulated over a grid of wind speeds once, and the
+tables, the force RAOs and the thrust are put in shared memory, so that the workers
+read them instead of getting a pickled copy each. Only the simulator and the small
+settings are pickled, once per worker. The results are streamed back to running
+statistics, so the results of the single scenarios are not kept.
+"""
+
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from pymarcyb.util.enumerations import IntegrationMethod, WindSpectrumType
+from pymarcyb.util.math import spectral_realization as sr
+from pymarcyb.util.waves import wave_spectrum as wvs
+from pymarcyb.util.wind import wind_spectrum as ws
+import numpy as np
+
+WIND_SPECTRA = {
+    WindSpectrumType.davenport: ws.davenport,
+    WindSpectrumType.harris: ws.harris,
+    WindSpectrumType.ochi_shin: ws.ochi_shin,
+    WindSpectrumType.npd: ws.npd,
+    WindSpectrumType.api: ws.api,
+}
+
+# Set in each worker process by _initialize_worker()
+_worker = {}
+
+
+class RunningStatistics(object):
+    """Count, mean, variance, minimum and maximum of a stream of samples,
+    updated one sample at a time with Welford's algorithm.
+    """
+
+    def __init__(self, n_values):
+        """Set up the statistics.
+
+        Args:
+            n_values (int)      -- number of values in each sample
+        """
+
+        self.count = 0
+        self.mean = np.zeros(n_values)
+        self.minimum = np.full(n_values, np.inf)
+        self.maximum = np.full(n_values, -np.inf)
+        self._sum_of_squares = np.zeros(n_values)
+
+    @property
+    def variance(self):
+        """Sample variance of each value."""
+
+        return self._sum_of_squares / (self.count - 1) if self.count > 1 else np.zeros_like(self.mean)
+
+    @property
+    def std(self):
+        """Sample standard deviation of each value."""
+
+        return np.sqrt(self.variance)
+
+    def update(self, sample):
+        """Add a sample.
+
+        Args:
+            sample (array of floats)    -- the values of the sample
+        """
+
+        sample = np.asarray(sample, dtype=float)
+        self.count += 1
+        delta = sample - self.mean
+        self.mean += delta / self.count
+        self._sum_of_squares += delta * (sample - self.mean)
+        np.minimum(self.minimum, sample, out=self.minimum)
+        np.maximum(self.maximum, sample, out=self.maximum)
+
+
+def footprint_metrics(times, eta, nu):
+    """Return the station-keeping metrics of a simulation.
+
+    Args:
+        times (np.ndarray)      -- the times in s
+        eta (np.ndarray)        -- north, east and heading, shape (3, n_samples)
+        nu (np.ndarray)         -- surge and sway speed and yaw rate, shape (3, n_samples)
+
+    Returns:
+        metrics (np.ndarray)    -- maximum distance from the start position in m, standard deviation
+                                   of north, east and heading, and maximum heading deviation
+    """
+
+    offset = eta - eta[:, :1]
+
+    return np.array([np.hypot(offset[0], offset[1]).max(), offset[0].std(), offset[1].std(), offset[2].std(),
+                     np.abs(offset[2]).max()])
+
+
+class MonteCarloRunner(object):
+    """Runner for randomized scenarios of a LowSpeedSimulator."""
+
+    def __init__(self, simulator, dt, n_steps, wind_speed_range, wind_spectrum=WindSpectrumType.harris,
+                 wave_force_rao=None, wave_rao_frequencies=None, thrust=None, method=IntegrationMethod.rk4,
+                 metrics=footprint_metrics, n_table_speeds=50):
+        """Set up the runner and tabulate the spectra.
+
+        Args:
+            simulator (LowSpeedSimulator)       -- the simulator
+            dt (float)                          -- time step in s
+            n_steps (int)                       -- number of time steps per scenario
+            wind_speed_range (tuple of floats)  -- lowest and highest mean wind speed in m/s, for the tables
+            wind_spectrum (WindSpectrumType)    -- the wind gust spectrum (default: harris)
+            wave_force_rao (array of floats)    -- wave forces and moment in kN/kNm per m of wave amplitude,
+                                                   shape (3, n_frequencies) (default: None, no wave loads)
+            wave_rao_frequencies (array)        -- circular frequencies of the RAOs in rad/s (default: None)
+            thrust (array of floats)            -- thruster forces and moment in BODY in kN/kNm, shape
+                                                   (3, n_steps) (default: None, no thrust)
+            method (IntegrationMethod)          -- the integration method (default: rk4)
+            metrics (function)                  -- function of (times, eta, nu) returning an array of
+                                                   metrics per scenario, must be picklable
+                                                   (default: footprint_metrics)
+            n_table_speeds (int)                -- number of wind speeds in the spectrum tables (default: 50)
+
+        Raises:
+            ValueError                          -- if the wind spectrum type is unknown
+        """
+
+        if wind_spectrum not in WIND_SPECTRA:
+            raise ValueError("Illegal wind spectrum type: {0}".format(wind_spectrum))
+
+        self.simulator = simulator
+        self.dt = dt
+        self.n_steps = n_steps
+        self.method = method
+        self.metrics = metrics
+
+        self.table_speeds = np.linspace(max(wind_speed_range[0], 0.1), wind_speed_range[1], n_table_speeds)
+        self.tables = {}
+
+        wind_frequencies = np.fft.rfftfreq(n_steps, dt)
+        self.tables["wind_frequencies"] = wind_frequencies
+        self.tables["wind_spectra"] = np.array([_on_grid(wind_frequencies, *WIND_SPECTRA[wind_spectrum](U_10))
+                                                for U_10 in self.table_speeds])
+
+        if wave_force_rao is not None:
+            omegas = np.asarray(wave_rao_frequencies, dtype=float)
+            # From circular frequency to Hz: S(f) = 2 pi S(omega)
+            self.tables["wave_frequencies"] = omegas / (2 * np.pi)
+            self.tables["wave_spectra"] = np.array([2 * np.pi * _on_grid(omegas, *wvs.pierson_moskowitz(U_10))
+                                                    for U_10 in self.table_speeds])
+            self.tables["wave_force_rao"] = np.asarray(wave_force_rao, dtype=float)
+
+        if thrust is not None:
+            self.tables["thrust"] = np.ascontiguousarray(np.broadcast_to(np.asarray(thrust, dtype=float),
+                                                                         (3, n_steps)))
+
+        self.tables["table_speeds"] = self.table_speeds
+
+    @property
+    def thrust(self):
+        """The thruster forces and moment, shape (3, n_steps), or None."""
+
+        return self.tables.get("thrust")
+
+    def run(self, wind_speeds, wind_directions, seed=None, processes=None, chunksize=4):
+        """Run the scenarios and return the running statistics of the metrics.
+
+        Args:
+            wind_speeds (array of floats)       -- mean wind speed of each scenario in m/s
+            wind_directions (array of floats)   -- wind direction of each scenario in radians
+            seed (int or SeedSequence)          -- root seed of the run (default: None, fresh entropy)
+            processes (int)                     -- number of worker processes, 1 to run in this process
+                                                   (default: None, one per CPU)
+            chunksize (int)                     -- number of scenarios sent to a worker at a time (default: 4)
+
+        Returns:
+            statistics (RunningStatistics)      -- statistics of the metrics over all the scenarios
+        """
+
+        seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        wind_speeds = np.asarray(wind_speeds, dtype=float)
+        wind_directions = np.broadcast_to(np.asarray(wind_directions, dtype=float), wind_speeds.shape)
+        scenarios = zip(wind_speeds, wind_directions, seed_sequence.spawn(len(wind_speeds)))
+
+        statistics = None
+        settings = (self.simulator, self.dt, self.n_steps, self.method, self.metrics)
+
+        if processes == 1:
+            _worker.update(settings=settings, tables=self.tables, memory=[])
+            try:
+                for metrics in map(_run_scenario, scenarios):
+                    statistics = _aggregate(statistics, metrics)
+            finally:
+                _worker.clear()
+            return statistics
+
+        blocks, layout = _share(self.tables)
+        try:
+            with Pool(processes, initializer=_initialize_worker, initargs=(settings, layout)) as pool:
+                for metrics in pool.imap_unordered(_run_scenario, scenarios, chunksize=chunksize):
+                    statistics = _aggregate(statistics, metrics)
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        return statistics
+
+
+def _on_grid(grid, frequencies, spectrum):
+    """Interpolate a spectrum onto a frequency grid, zero outside its frequencies."""
+
+    return np.interp(grid, np.asarray(frequencies, dtype=float), np.asarray(spectrum, dtype=float),
+                     left=0.0, right=0.0)
+
+
+def _aggregate(statistics, metrics):
+    """Add the metrics of a scenario to the running statistics."""
+
+    if statistics is None:
+        statistics = RunningStatistics(len(metrics))
+    statistics.update(metrics)
+
+    return statistics
+
+
+def _share(tables):
+    """Copy the tables to shared memory. Returns the blocks and the layout the workers need."""
+
+    blocks, layout = [], {}
+    for name, table in tables.items():
+        block = SharedMemory(create=True, size=max(table.nbytes, 1))
+        np.ndarray(table.shape, dtype=table.dtype, buffer=block.buf)[...] = table
+        blocks.append(block)
+        layout[name] = (block.name, table.shape, table.dtype.str)
+
+    return blocks, layout
+
+
+def _initialize_worker(settings, layout):
+    """Attach a worker process to the shared tables."""
+
+    memory, tables = [], {}
+    for name, (block_name, shape, dtype) in layout.items():
+        block = SharedMemory(name=block_name)
+        memory.append(block)
+        tables[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+    _worker.update(settings=settings, tables=tables, memory=memory)
+
+
+def _run_scenario(scenario):
+    """Simulate one scenario and return its metrics."""
+
+    wind_speed, wind_direction, seed_sequence = scenario
+    simulator, dt, n_steps, method, metrics = _worker["settings"]
+    tables = _worker["tables"]
+    gust_rng, wave_rng = (np.random.default_rng(s) for s in seed_sequence.spawn(2))
+
+    wind_spectrum = _table_row(tables["table_speeds"], tables["wind_spectra"], wind_speed)
+    wind_speeds = wind_speed + sr.realization(tables["wind_frequencies"], wind_spectrum, n_steps, dt, gust_rng)
+
+    wave_loads = None
+    if "wave_spectra" in tables:
+        wave_spectrum = _table_row(tables["table_speeds"], tables["wave_spectra"], wind_speed)
+        wave_loads = sr.realization(tables["wave_frequencies"], wave_spectrum, n_steps, dt, wave_rng,
+                                    transfer=tables["wave_force_rao"])
+
+    times, eta, nu = simulator.simulate(dt, n_steps, wind_speed=wind_speeds, wind_direction=wind_direction,
+                                        wave_loads=wave_loads, thrust=tables.get("thrust"), method=method)
+
+    return metrics(times, eta, nu)
+
+
+def _table_row(speeds, table, wind_speed):
+    """Interpolate a table linearly between the two nearest wind speeds."""
+
+    i = int(np.clip(np.searchsorted(speeds, wind_speed) - 1, 0, len(speeds) - 2))
+    w = np.clip((wind_speed - speeds[i]) / (speeds[i + 1] - speeds[i]), 0.0, 1.0)
+
+    return (1.0 - w) * table[i] + w * table[i + 1]
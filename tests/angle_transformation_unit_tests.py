@@ -2,6 +2,7 @@
 """Unit tests for the thruster functions."""
 
 import unittest
+import numpy as np
 from pymarcyb.util.kinematics import angle_transformation as at
 
 
@@ -26,6 +27,17 @@ class TestAngleTransformationMethods(unittest.TestCase):
         self.assertAlmostEqual(output_angle, 2.28, 2)
         self.assertEqual(revolutions, -1)
 
+    def test_transform_to_pipi_array(self):
+        """Unit test for transform_to_pipi_array(), compared with transform_to_pipi()."""
+
+        input_angles = np.array([-10.0, -4.0, -1.0, 0.0, 1.0, 4.0, 10.0])
+        output_angles, revolutions = at.transform_to_pipi_array(input_angles)
+
+        for i, input_angle in enumerate(input_angles):
+            output_angle, revolution = at.transform_to_pipi(input_angle)
+            self.assertAlmostEqual(output_angles[i], output_angle)
+            self.assertEqual(revolutions[i], revolution)
+
 
 if __name__ == '__main__':
     unittest.main()
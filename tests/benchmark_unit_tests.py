@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the benchmark suite."""
+
+import unittest
+from pymarcyb.benchmarks import benchmark_suite as bs
+
+
+class TestBenchmarkMethods(unittest.TestCase):
+    """Unit test class for the benchmark suite methods."""
+
+    def test_run(self):
+        """Unit test for run(...), with a small size and a selection of benchmarks."""
+
+        results = bs.run(sizes=[10], names=["imca_p2f", "mjtg"], repeat=1, min_time=0.0)
+
+        self.assertEqual(sorted(results), ["imca_p2f/batch/10", "imca_p2f/scalar/10", "mjtg/batch/10",
+                                           "mjtg/float32/10", "mjtg/scalar/10"])
+        self.assertGreater(results["mjtg/batch/10"]["seconds"], 0.0)
+
+    def test_compare(self):
+        """Unit test for compare(...), with one regression and one key missing from the baseline."""
+
+        baseline = {"a": {"seconds": 1.0}, "b": {"seconds": 2.0}}
+        results = {"a": {"seconds": 1.5}, "b": {"seconds": 2.1}, "c": {"seconds": 1.0}}
+
+        ratios, regressions = bs.compare(results, baseline, threshold=0.25)
+
+        self.assertEqual(sorted(ratios), ["a", "b"])
+        self.assertAlmostEqual(ratios["b"], 1.05)
+        self.assertEqual(regressions, ["a"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the capability analysis functions."""
+
+import unittest
+import numpy as np
+from pymarcyb.util.capability import capability_analysis as ca
+from pymarcyb.util.thrusters import thrust_allocation as ta
+from pymarcyb.util.wind import wind_forces as wf
+from pymarcyb.util.enumerations import ThrusterType
+
+
+class TestCapabilityMethods(unittest.TestCase):
+    """Unit test class for the capability analysis methods."""
+
+    def setUp(self):
+        """Setting up for the test."""
+
+        thruster_types = [ThrusterType.tunnel, ThrusterType.tunnel, ThrusterType.azimuth,
+                          ThrusterType.azimuth, ThrusterType.propeller, ThrusterType.propeller]
+        positions = [(40.0, 0.0), (35.0, 0.0), (-30.0, 6.0), (-30.0, -6.0), (-40.0, 5.0), (-40.0, -5.0)]
+        max_power = [880.0, 880.0, 2200.0, 2200.0, 5000.0, 5000.0]
+
+        self.allocator = ta.ThrustAllocator.from_power(thruster_types, positions, max_power, max_power)
+        self.wind_parameters = {'frontal_area': 530.0, 'lateral_area': 1500.0, 'Loa': 107.5,
+                                's_L': 11.5, 'vessel_type': "Offshore supply vessel"}
+        self.directions = ca.capability_directions(np.pi / 4)
+
+    def test_failure_reduces_capability(self):
+        """Unit test for wind_capability(...), with and without failed thrusters.
+        Checking that a failure never increases the capability.
+        """
+
+        wind_speeds = ca.wind_capability(self.allocator, self.directions, self.wind_parameters,
+                                         failure_cases=[[], [0], [0, 1]], tolerance=0.1, processes=1)
+
+        self.assertEqual(wind_speeds.shape, (3, 8))
+        self.assertTrue(np.all(wind_speeds[1] <= wind_speeds[0] + 0.1))
+        self.assertTrue(np.all(wind_speeds[2] <= wind_speeds[1] + 0.1))
+        self.assertTrue(np.all(self.allocator.max_forces_positive > 0.0))
+
+    def test_capability_limit(self):
+        """Unit test for wind_capability(...), checking the found wind speed against the allocator."""
+
+        wind_speeds = ca.wind_capability(self.allocator, self.directions[2:3], self.wind_parameters,
+                                         tolerance=0.01, processes=1)
+        unit_load = wf.wind_forces_and_moment_batch(1.0, self.directions[2], **self.wind_parameters)
+
+        self.assertTrue(ca.is_feasible(self.allocator, -wind_speeds[0, 0]**2 * unit_load))
+        self.assertFalse(ca.is_feasible(self.allocator, -(wind_speeds[0, 0] + 0.02)**2 * unit_load))
+
+    def test_capability_limit_independent(self):
+        """Unit test for wind_capability(...), checking the found wind speeds with projected gradients.
+        Checking that the loads just below the envelope can be produced within the limits, and the
+        loads just above cannot, without using the allocator to decide.
+        """
+
+        wind_speeds = ca.wind_capability(self.allocator, self.directions, self.wind_parameters,
+                                         failure_cases=[[], [2]], tolerance=0.01, processes=1)
+        unit_loads = wf.wind_forces_and_moment_batch(1.0, self.directions, **self.wind_parameters)
+        max_forces_positive = self.allocator.max_forces_positive.copy()
+        max_forces_negative = self.allocator.max_forces_negative.copy()
+        max_forces_positive[2], max_forces_negative[2] = 0.0, 0.0
+
+        for case, limits in enumerate([(self.allocator.max_forces_positive, self.allocator.max_forces_negative),
+                                       (max_forces_positive, max_forces_negative)]):
+            for direction, wind_speed in enumerate(wind_speeds[case]):
+                if wind_speed == 0.0:
+                    continue
+
+                below = -(0.98 * wind_speed)**2 * unit_loads[:, direction]
+                self.assertLess(_min_residual(self.allocator, limits, below), 1e-3 * np.linalg.norm(below))
+                if wind_speed < 60.0:
+                    above = -(1.02 * wind_speed)**2 * unit_loads[:, direction]
+                    self.assertGreater(_min_residual(self.allocator, limits, above), 1e-3 * np.linalg.norm(above))
+
+    def test_intact_case_in_parallel(self):
+        """Unit test for wind_capability(...), with the directions of the intact case split over processes."""
+
+        serial = ca.wind_capability(self.allocator, self.directions, self.wind_parameters, tolerance=0.1,
+                                    processes=1)
+        parallel = ca.wind_capability(self.allocator, self.directions, self.wind_parameters, tolerance=0.1,
+                                      processes=3)
+
+        np.testing.assert_array_equal(parallel, serial)
+
+
+def _min_residual(allocator, limits, tau, n_iterations=3000):
+    """Return the smallest residual within the force limits, found by accelerated projected gradients.
+
+    The moment is scaled down by the length of the vessel, so it is comparable with the forces.
+    """
+
+    max_forces_positive, max_forces_negative = limits
+    scale = np.array([1.0, 1.0, 1.0 / 40.0])
+    B = scale[:, None] * allocator._B
+    tau = scale * np.asarray(tau, dtype=float)
+    columns = allocator._column_thruster
+    upper, lower = max_forces_positive[columns], -max_forces_negative[columns]
+    azimuth_x, azimuth_y = allocator._azimuth_x, allocator._azimuth_y
+    radii = max_forces_positive[columns[azimuth_x]]
+    upper[azimuth_x], upper[azimuth_y] = np.inf, np.inf
+    lower[azimuth_x], lower[azimuth_y] = -np.inf, -np.inf
+
+    def project(u):
+        u = np.clip(u, lower, upper)
+        magnitudes = np.hypot(u[azimuth_x], u[azimuth_y])
+        shrink = np.minimum(1.0, radii / np.maximum(magnitudes, 1e-12))
+        u[azimuth_x] *= shrink
+        u[azimuth_y] *= shrink
+        return u
+
+    u = np.zeros(B.shape[1])
+    momentum, t = u.copy(), 1.0
+    step = 1.0 / np.linalg.norm(B, 2)**2
+
+    for _ in range(n_iterations):
+        u_next = project(momentum + step * (B.T @ (tau - B @ momentum)))
+        t_next = 0.5 * (1.0 + np.sqrt(1.0 + 4.0 * t * t))
+        momentum = u_next + (t - 1.0) / t_next * (u_next - u)
+        u, t = u_next, t_next
+
+    return np.linalg.norm((tau - B @ u) / scale)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the command line interface."""
+
+import os
+import tempfile
+import unittest
+import numpy as np
+from pymarcyb import cli
+from pymarcyb.util.enumerations import ThrusterType
+from pymarcyb.util.thrusters import power_to_force as p2f
+from pymarcyb.util.wind import wind_forces as wf
+from pymarcyb.util.wind import wind_spectrum as ws
+
+
+VESSEL = ["--frontal-area", "530", "--lateral-area", "1500", "--loa", "107.5", "--s-l", "11.5",
+          "--vessel-type", "Offshore supply vessel"]
+
+
+class TestCommandLineMethods(unittest.TestCase):
+    """Unit test class for the command line interface."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        """Return a path in the temporary directory."""
+
+        return os.path.join(self.directory.name, name)
+
+    def test_wind_forces_csv(self):
+        """Unit test for the wind-forces subcommand, from CSV to CSV in several chunks."""
+
+        conditions = np.array([[10.0, 0.0], [15.0, 1.0], [20.0, 2.0], [25.0, 3.0], [5.0, 4.0]])
+        with open(self.path("conditions.csv"), "w") as f:
+            f.write("wind_speed,wind_direction\n")
+            np.savetxt(f, conditions, delimiter=",")
+
+        status = cli.main(["wind-forces", self.path("conditions.csv"), self.path("forces.csv"), "--chunk-size", "2",
+                           "--quiet"] + VESSEL)
+
+        forces = np.loadtxt(self.path("forces.csv"), delimiter=",", skiprows=1)
+        expected = wf.wind_forces_and_moment_batch(conditions[:, 0], conditions[:, 1], 530.0, 1500.0, 107.5, 11.5,
+                                                   vessel_type="Offshore supply vessel")
+        self.assertEqual(status, 0)
+        np.testing.assert_allclose(forces, expected.T, rtol=1e-9, atol=1e-9)
+
+    def test_wind_spectrum_npy(self):
+        """Unit test for the wind-spectrum subcommand, from a 2-D .npy file to a .npy file."""
+
+        np.save(self.path("conditions.npy"), np.array([[8.0], [12.0], [16.0]]))
+
+        status = cli.main(["wind-spectrum", self.path("conditions.npy"), self.path("spectra.npy"), "--columns",
+                           "U_10", "--type", "davenport", "--frequencies", "0.01,0.1", "--quiet"])
+
+        spectra = np.load(self.path("spectra.npy"))
+        self.assertEqual(status, 0)
+        np.testing.assert_allclose(spectra, ws.davenport_batch([[8.0], [12.0], [16.0]], [0.01, 0.1]))
+
+    def test_thruster_limits_structured_npy(self):
+        """Unit test for the thruster-limits subcommand, from a .npy file with named fields."""
+
+        table = np.zeros(2, dtype=[("thruster_type", float), ("power_positive", float), ("power_negative", float)])
+        table["thruster_type"] = [ThrusterType.tunnel.value, ThrusterType.azimuth.value]
+        table["power_positive"] = [1000.0, 2000.0]
+        table["power_negative"] = [1000.0, 1500.0]
+        np.save(self.path("thrusters.npy"), table)
+
+        status = cli.main(["thruster-limits", self.path("thrusters.npy"), self.path("limits.csv"), "--quiet"])
+
+        limits = np.loadtxt(self.path("limits.csv"), delimiter=",", skiprows=1)
+        expected = p2f.imca_p2f_batch([1, 2], [1000.0, 2000.0], [1000.0, 1500.0])
+        self.assertEqual(status, 0)
+        np.testing.assert_allclose(limits, np.column_stack(expected), rtol=1e-9)
+
+    def test_error(self):
+        """Unit test for main(...), with missing vessel parameters."""
+
+        with open(self.path("conditions.csv"), "w") as f:
+            f.write("wind_speed,wind_direction\n10.0,0.0\n")
+
+        status = cli.main(["wind-forces", self.path("conditions.csv"), self.path("forces.csv"), "--quiet",
+                           "--frontal-area", "530", "--lateral-area", "1500", "--loa", "107.5", "--s-l", "11.5"])
+
+        self.assertEqual(status, 1)
+
+    def test_missing_columns(self):
+        """Unit test for main(...), with an input without a required column.
+        Checking that it is rejected before an existing output file is overwritten.
+        """
+
+        with open(self.path("conditions.csv"), "w") as f:
+            f.write("wind_speed\n10.0\n")
+        with open(self.path("forces.csv"), "w") as f:
+            f.write("previous results\n")
+
+        with self.assertRaises(SystemExit):
+            cli.main(["wind-forces", self.path("conditions.csv"), self.path("forces.csv"), "--quiet"] + VESSEL)
+
+        with open(self.path("forces.csv")) as f:
+            self.assertEqual(f.read(), "previous results\n")
+
+    def test_npy_without_columns(self):
+        """Unit test for main(...), with a 2-D .npy file and no column names."""
+
+        np.save(self.path("conditions.npy"), np.array([[8.0], [12.0]]))
+
+        status = cli.main(["wind-spectrum", self.path("conditions.npy"), self.path("spectra.csv"),
+                           "--frequencies", "0.1", "--quiet"])
+
+        self.assertEqual(status, 1)
+        self.assertFalse(os.path.exists(self.path("spectra.csv")))
+
+    def test_wind_spectrum_parameters(self):
+        """Unit test for the wind-spectrum subcommand, with a parameter the spectrum type does not have.
+        Checking that it is rejected before the output file is created, and that an accepted one is used.
+        """
+
+        np.save(self.path("conditions.npy"), np.array([[8.0], [12.0]]))
+        arguments = ["wind-spectrum", self.path("conditions.npy"), self.path("spectra.npy"), "--columns", "U_10",
+                     "--frequencies", "0.1", "--quiet"]
+
+        with self.assertRaises(SystemExit):
+            cli.main(arguments + ["--type", "ochi_shin", "--kappa", "0.1"])
+        self.assertFalse(os.path.exists(self.path("spectra.npy")))
+
+        status = cli.main(arguments + ["--type", "ochi_shin", "--C_10", "0.03"])
+
+        self.assertEqual(status, 0)
+        np.testing.assert_allclose(np.load(self.path("spectra.npy")),
+                                   ws.ochi_shin_batch([[8.0], [12.0]], [0.1], C_10=0.03))
+
+
+if __name__ == '__main__':
+    unittest.main()
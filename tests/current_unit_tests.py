@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the current functions."""
+
+import unittest
+import numpy as np
+from pymarcyb.util.current import current_coefficients as cc
+from pymarcyb.util.current import current_forces as cf
+
+
+class TestCurrentMethods(unittest.TestCase):
+    """Unit test class for the current methods."""
+
+    def setUp(self):
+        """Setting up for the test."""
+
+        self.coefficients = cc.CurrentCoefficients(np.radians([0.0, 90.0, 180.0]), [-0.1, 0.0, 0.1],
+                                                   [0.0, -0.8, 0.0], [0.0, -0.1, 0.0])
+
+    def test_mirrored_table(self):
+        """Unit test for CurrentCoefficients(...), with a table from 0 to 180 degrees.
+        Checking the mirrored side.
+        """
+
+        C_X, C_Y, C_N = self.coefficients(np.radians([45.0, 315.0]))
+
+        self.assertAlmostEqual(C_X[0], C_X[1], 10)
+        self.assertAlmostEqual(C_Y[0], -C_Y[1], 10)
+        self.assertAlmostEqual(C_N[0], -C_N[1], 10)
+        self.assertAlmostEqual(C_Y[0], -0.4, 10)
+
+    def test_beam_current(self):
+        """Unit test for current_forces_and_moment(...), with beam current."""
+
+        forces = cf.current_forces_and_moment(1.0, np.pi / 2, self.coefficients, 120.0, 600.0, 100.0)
+
+        self.assertAlmostEqual(forces[0, 0], 0.0, 10)
+        self.assertAlmostEqual(forces[1, 0], -0.5 * 1025.0 * 0.8 * 600.0 / 1000.0, 10)
+
+    def test_batch(self):
+        """Unit test for current_forces_and_moment_batch(...), compared with current_forces_and_moment(...)."""
+
+        speeds = np.array([0.5, 1.0, 1.5])
+        directions = np.array([0.3, 2.0, 4.0])
+        forces = cf.current_forces_and_moment_batch(speeds, directions, self.coefficients, 120.0, 600.0, 100.0,
+                                                    vessel_heading=0.2, vessel_speed_surge=0.5)
+
+        for i in range(3):
+            expected = cf.current_forces_and_moment(speeds[i], directions[i], self.coefficients, 120.0, 600.0,
+                                                    100.0, vessel_heading=0.2, vessel_speed_surge=0.5)
+            np.testing.assert_allclose(forces[:, i], np.asarray(expected).ravel())
+
+
+if __name__ == '__main__':
+    unittest.main()
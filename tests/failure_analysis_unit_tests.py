@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the failure analysis functions."""
+
+import unittest
+import numpy as np
+from pymarcyb.util.capability import failure_analysis as fa
+from pymarcyb.util.enumerations import ThrusterType
+
+
+class TestFailureAnalysisMethods(unittest.TestCase):
+    """Unit test class for the failure analysis methods."""
+
+    def setUp(self):
+        """Setting up for the test."""
+
+        thruster_types = [ThrusterType.tunnel, ThrusterType.tunnel, ThrusterType.azimuth,
+                          ThrusterType.azimuth, ThrusterType.propeller, ThrusterType.propeller]
+        self.positions = [(40.0, 0.0), (35.0, 0.0), (-30.0, 6.0), (-30.0, -6.0), (-40.0, 5.0), (-40.0, -5.0)]
+        max_power = [880.0, 880.0, 2200.0, 2200.0, 5000.0, 5000.0]
+
+        self.power_system = fa.PowerSystem(thruster_types, [0, 1, 0, 1, 0, 1], max_power, max_power,
+                                           [0, 0, 1, 1], [3000.0, 3000.0, 3000.0, 3000.0])
+        self.analysis = fa.FailureAnalysis(self.power_system, self.positions)
+
+    def test_group_failure(self):
+        """Unit test for force_limits(...), for a switchboard group failure.
+        Checking that the thrusters in the group have no force left.
+        """
+
+        max_forces_positive, _ = self.analysis.force_limits([self.power_system.group_mask(0)])
+
+        np.testing.assert_array_equal(max_forces_positive[0, [0, 2, 4]], 0.0)
+        self.assertTrue(np.all(max_forces_positive[0, [1, 3, 5]] > 0.0))
+
+    def test_generator_failure(self):
+        """Unit test for available_power(...), for a generator failure.
+        Checking that the remaining generator power is shared in the group.
+        """
+
+        intact, _ = self.power_system.available_power([0])
+        power_positive, _ = self.power_system.available_power([self.power_system.failed_mask(generators=[0])])
+
+        self.assertAlmostEqual(power_positive[0, [0, 2, 4]].sum(), 3000.0, 6)
+        np.testing.assert_allclose(power_positive[0, [1, 3, 5]], intact[0, [1, 3, 5]])
+
+    def test_worst_case(self):
+        """Unit test for worst_case(...).
+        Checking that the worst case needs more power than the intact vessel.
+        """
+
+        index, total_power = self.analysis.worst_case([300.0, 100.0, 2000.0])
+
+        self.assertGreaterEqual(total_power[index], total_power[0])
+        self.assertTrue(np.all(np.isfinite(total_power)))
+
+    def test_shared_allocation(self):
+        """Unit test for evaluate(...), for a generator failure that leaves enough power.
+        Checking that it shares the allocation of the intact vessel, and that the caches are bounded.
+        """
+
+        max_power = self.power_system.thruster_power_positive
+        power_system = fa.PowerSystem(self.power_system.thruster_types, [0, 1, 0, 1, 0, 1], max_power, max_power,
+                                      [0, 0, 1, 1], [9000.0, 9000.0, 9000.0, 9000.0])
+        analysis = fa.FailureAnalysis(power_system, self.positions, cache_size=3)
+
+        _, _, thruster_power, _ = analysis.evaluate([0, power_system.failed_mask(generators=[0])],
+                                                    [300.0, 100.0, 2000.0])
+
+        self.assertEqual(len(analysis._allocation_cache), 1)
+        np.testing.assert_array_equal(thruster_power[0], thruster_power[1])
+
+        _, masks = analysis.failure_combinations()
+        analysis.worst_case([300.0, 100.0, 2000.0], masks)
+        self.assertLessEqual(len(analysis._limit_cache), 3)
+        self.assertLessEqual(len(analysis._allocation_cache), 3)
+
+    def test_smallest_cache(self):
+        """Unit test for FailureAnalysis(...), with a cache of one entry and of no entries.
+        Checking that one entry gives the same evaluation as the default cache, and no entries is rejected.
+        """
+
+        _, masks = self.analysis.failure_combinations()
+        analysis = fa.FailureAnalysis(self.power_system, self.positions, cache_size=1)
+
+        expected = self.analysis.evaluate(masks, [300.0, 100.0, 2000.0])
+        for result, expected_result in zip(analysis.evaluate(masks, [300.0, 100.0, 2000.0]), expected):
+            np.testing.assert_allclose(result, expected_result, atol=1e-6)
+
+        with self.assertRaises(ValueError):
+            fa.FailureAnalysis(self.power_system, self.positions, cache_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
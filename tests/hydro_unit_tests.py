@@ -2,7 +2,10 @@
 """Unit tests for the hydro functions."""
 
 import unittest
+import numpy as np
 from pymarcyb.util.hydro import coeffs as c
+from pymarcyb.util.hydro import retardation as r
+from pymarcyb.util.hydro.resistance import HoltropMennen, ResistanceTable
 
 
 class TestHydroMethods(unittest.TestCase):
@@ -26,5 +29,150 @@ class TestHydroMethods(unittest.TestCase):
         self.assertAlmostEqual(c.cb_extrapolation(0.80, 10.0, 7.3), 0.778, 3)
 
 
+class TestRetardationMethods(unittest.TestCase):
+    """Unit test class for the retardation methods. The retardation functions are damped
+    cosines, c exp(-a t) cos(b t), with the damping and added mass known in closed form.
+    """
+
+    def setUp(self):
+        """Setting up for the test."""
+
+        a = np.array([[0.5, 0.6], [0.6, 0.8]])
+        b = np.array([[1.0, 0.8], [0.8, 0.5]])
+        c = np.array([[1.0, 0.3], [0.3, 2.0]])
+        self.A_inf = np.array([[5.0, 1.0], [1.0, 8.0]])
+        self.dt = 0.1
+        self.times = np.arange(401) * self.dt
+        self.frequencies = np.linspace(0.0, 60.0, 6001)
+
+        t = self.times[:, np.newaxis, np.newaxis]
+        w = self.frequencies[:, np.newaxis, np.newaxis]
+        self.K = c * np.exp(-a * t) * np.cos(b * t)
+        self.damping = 0.5 * c * (a / (a**2 + (w - b)**2) + a / (a**2 + (w + b)**2))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.added_mass = self.A_inf - 0.5 * c * ((w + b) / (a**2 + (w + b)**2) +
+                                                      (w - b) / (a**2 + (w - b)**2)) / w
+
+    def test_retardation_functions(self):
+        """Unit test for retardation_functions(...) and infinite_frequency_added_mass(...)."""
+
+        K = r.retardation_functions(self.frequencies, self.damping, self.times)
+        A_inf = r.infinite_frequency_added_mass(self.frequencies[1:], self.added_mass[1:], self.times, K)
+
+        np.testing.assert_allclose(K, self.K, atol=0.02)
+        np.testing.assert_allclose(A_inf, self.A_inf, atol=0.01)
+
+    def test_memory_force_batch(self):
+        """Unit test for memory_force_batch(...), compared with the convolution sum."""
+
+        velocities = np.random.default_rng(0).normal(size=(60, 2))
+        result = r.memory_force_batch(self.K, velocities, self.dt)
+
+        weights = np.full(len(self.K), self.dt)
+        weights[0] *= 0.5
+        expected = [sum(weights[j] * self.K[j] @ velocities[k - j] for j in range(k + 1)) for k in range(60)]
+
+        np.testing.assert_allclose(result, expected, atol=1e-12)
+
+    def test_state_space(self):
+        """Unit test for RetardationStateSpace. Damped cosines are second order, and the time
+        stepping must match the convolution.
+        """
+
+        model, A_inf = r.RetardationStateSpace.from_hydrodynamics(self.frequencies, self.added_mass, self.damping,
+                                                                  self.dt, 40.0)
+        K = r.retardation_functions(self.frequencies, self.damping, self.times)
+
+        self.assertEqual(r.RetardationStateSpace(self.K, self.dt).order, 8)
+        np.testing.assert_allclose(model.retardation(len(self.times)), K, atol=1e-3)
+        np.testing.assert_allclose(A_inf, self.A_inf, atol=0.01)
+
+        velocities = np.cumsum(np.random.default_rng(1).normal(size=(2000, 2)), axis=0) * 0.01
+        expected = r.memory_force_batch(K, velocities, self.dt)
+        result = np.array([model.step(velocity) for velocity in velocities])
+        np.testing.assert_allclose(result, expected, atol=1e-3)
+
+        model.reset()
+        np.testing.assert_allclose(model.step(velocities[0]), expected[0])
+
+    def test_illegal_order(self):
+        """Unit test for RetardationStateSpace with an illegal order. Must raise ValueError."""
+
+        with self.assertRaises(ValueError):
+            r.RetardationStateSpace(self.K, self.dt, order=0)
+        with self.assertRaises(ValueError):
+            r.RetardationStateSpace(self.K[:5], self.dt, order=4)
+
+
+class TestResistanceMethods(unittest.TestCase):
+    """Unit test class for the resistance methods."""
+
+    def setUp(self):
+        """Setting up for the test. The example vessel of Holtrop and Mennen (1982)."""
+
+        self.hull = HoltropMennen(205.0, 32.0, 10.0, 37500.0 / (205.0 * 32.0 * 10.0), 0.98, 0.75, lcb=-0.75,
+                                  A_BT=20.0, h_B=4.0, A_T=16.0, S_APP=50.0)
+
+    def test_example_vessel(self):
+        """Unit test for the example vessel at 25 knots, compared with the published values."""
+
+        coefficients = self.hull.hull_coefficients([10.0])
+
+        self.assertAlmostEqual(coefficients["volume"][0], 37500.0, 6)
+        self.assertAlmostEqual(coefficients["S"][0], 7381.45, 1)
+        self.assertAlmostEqual(coefficients["k_1"][0], 1.156, 2)
+        self.assertAlmostEqual(coefficients["C_A"][0], 0.000352, 6)
+        np.testing.assert_allclose(self.hull.resistance([10.0], [25.0 * 1852.0 / 3600.0]), 1793.2, rtol=2e-3)
+
+    def test_grid(self):
+        """Unit test for resistance(...) on a grid, compared with one point at a time, and for the
+        caching of the hull coefficients.
+        """
+
+        draughts = np.array([8.0, 9.5, 11.0])
+        speeds = np.array([0.0, 4.0, 12.0, 18.0, 20.0, 26.0])
+        result = self.hull.resistance(draughts, speeds)
+        expected = [[self.hull.resistance([T], [V])[0, 0] for V in speeds] for T in draughts]
+
+        np.testing.assert_allclose(result, expected)
+        self.assertEqual(result[0, 0], 0.0)
+        self.assertTrue(np.all(np.diff(result, axis=1) > 0.0))
+        self.assertIs(self.hull.hull_coefficients(draughts), self.hull.hull_coefficients(draughts.copy()))
+        np.testing.assert_allclose(self.hull.hull_coefficients(draughts)["C_B"],
+                                   c.cb_extrapolation(self.hull.C_B_design, 10.0, draughts))
+
+    def test_wave_resistance_blend(self):
+        """Unit test for the resistance at the ends of the blend between the low and high speed
+        wave resistance formulas. Must be continuous.
+        """
+
+        speeds = np.array([0.4, 0.55])[:, np.newaxis] * np.sqrt(9.81 * 205.0) + np.array([-1e-6, 1e-6])
+        result = self.hull.resistance([10.0], speeds.ravel()).reshape(2, 2)
+
+        np.testing.assert_allclose(result[:, 0], result[:, 1], rtol=1e-5)
+
+    def test_table(self):
+        """Unit test for ResistanceTable. Must give the table values at the nodes, reproduce a
+        bilinear function, and clamp outside the table.
+        """
+
+        draughts = np.array([8.0, 9.0, 11.0])
+        speeds = np.array([1.0, 2.0, 4.0, 8.0])
+        table = ResistanceTable(draughts, speeds, 3.0 + 2.0 * draughts[:, np.newaxis] * speeds - speeds)
+
+        np.testing.assert_allclose(table.resistance(draughts[:, np.newaxis], speeds), table.values)
+        T = np.random.default_rng(0).uniform(8.0, 11.0, 1000)
+        V = np.random.default_rng(1).uniform(1.0, 8.0, 1000)
+        np.testing.assert_allclose(table.resistance(T, V), 3.0 + 2.0 * T * V - V)
+        np.testing.assert_allclose(table.power(T, V), (3.0 + 2.0 * T * V - V) * V)
+        self.assertAlmostEqual(table.resistance(12.0, 10.0), table.values[-1, -1])
+
+        hull_table = self.hull.table(draughts, speeds)
+        np.testing.assert_allclose(hull_table.values, self.hull.resistance(draughts, speeds))
+
+        with self.assertRaises(ValueError):
+            ResistanceTable([8.0, 8.0], speeds, np.zeros((2, 4)))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the model cache."""
+
+import os
+import tempfile
+import unittest
+import numpy as np
+from pymarcyb.simulators import low_speed_simulator as lss
+from pymarcyb.util.caching.model_cache import ModelCache
+from pymarcyb.util.enumerations import CoefficientType, ThrusterType, WindSpectrumType
+from pymarcyb.util.thrusters import power_to_force as p2f
+from pymarcyb.util.wind import wind_coefficient_fit as wcf
+from pymarcyb.util.wind import wind_coefficients as wc
+from pymarcyb.util.wind import wind_spectrum as ws
+
+
+class TestModelCacheMethods(unittest.TestCase):
+    """Unit test class for the model cache methods."""
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_get_or_build(self):
+        """Unit test for get_or_build(). The table must only be built once, and be loaded
+        memory-mapped and read-only.
+        """
+
+        cache = ModelCache(self.directory)
+        builds = []
+
+        def build():
+            builds.append(1)
+            return {"values": np.arange(10.0)}
+
+        first = cache.get_or_build("table", {"n": 10}, build)
+        second = ModelCache(self.directory).get_or_build("table", {"n": 10}, build)
+
+        self.assertEqual(len(builds), 1)
+        np.testing.assert_array_equal(second["values"], np.arange(10.0))
+        self.assertIsInstance(first["values"], np.memmap)
+        self.assertFalse(second["values"].flags.writeable)
+
+    def test_keys(self):
+        """Unit test for key(). The key must change with the parameters, their types and the version,
+        and not with the order of dict keys.
+        """
+
+        cache = ModelCache(self.directory)
+        key = cache.key("table", {"a": 1.0, "b": np.arange(3.0), "c": CoefficientType.blendermann})
+
+        self.assertEqual(key, cache.key("table", {"c": CoefficientType.blendermann, "b": np.arange(3.0), "a": 1.0}))
+        self.assertEqual(key, cache.key("table", {"a": np.float64(1.0), "b": np.arange(3.0),
+                                                  "c": CoefficientType.blendermann}))
+        self.assertNotEqual(key, cache.key("table", {"a": 1.0, "b": np.arange(3.0), "c": CoefficientType.isherwood}))
+        self.assertNotEqual(key, cache.key("table", {"a": 1.0, "b": np.arange(3), "c": CoefficientType.blendermann}))
+        self.assertNotEqual(key, cache.key("table", {"a": "1.0", "b": np.arange(3.0),
+                                                     "c": CoefficientType.blendermann}))
+        self.assertNotEqual(key, ModelCache(self.directory, version="0.2").key(
+            "table", {"a": 1.0, "b": np.arange(3.0), "c": CoefficientType.blendermann}))
+
+        with self.assertRaises(ValueError):
+            cache.key("table", {"a": object()})
+
+    def test_eviction(self):
+        """Unit test for the eviction. The least recently used entries must be removed when the
+        cache is too large.
+        """
+
+        cache = ModelCache(self.directory, max_bytes=3 * 8200)
+        for i in range(3):
+            cache.put("table", {"i": i}, {"values": np.zeros(1000)})
+            os.utime(os.path.join(self.directory, cache.key("table", {"i": i})), (i, i))
+
+        # Use the oldest, so the second oldest is evicted
+        cache.get("table", {"i": 0})
+        cache.put("table", {"i": 3}, {"values": np.zeros(1000)})
+
+        self.assertIsNotNone(cache.get("table", {"i": 0}))
+        self.assertIsNone(cache.get("table", {"i": 1}))
+        self.assertIsNotNone(cache.get("table", {"i": 3}))
+        self.assertLessEqual(cache.size(), cache.max_bytes)
+
+        cache.clear()
+        self.assertEqual(cache.size(), 0)
+
+    def test_tables(self):
+        """Unit test for the wind coefficient, thruster limit and wind spectrum tables, compared with
+        the functions they are derived from.
+        """
+
+        cache = ModelCache(self.directory)
+
+        table = cache.wind_coefficient_table(CoefficientType.isherwood, 530.0, 1500.0, 107.5, 11.5,
+                                             superstructure_area=1500.0/9.0, breadth=35.0, S=107.5, masts=1,
+                                             n_angles=360)
+        expected = wc.isherwood(530.0, 1500.0, 1500.0/9.0, 107.5, 35.0, 107.5, 11.5, 1, table["angles"])
+        np.testing.assert_allclose([table["C_X"], table["C_Y"], table["C_N"]], expected)
+
+        types = [ThrusterType.tunnel, ThrusterType.azimuth]
+        table = cache.thruster_limits(types, [1000.0, 2000.0], [800.0, 1500.0])
+        expected = p2f.imca_p2f_batch(types, [1000.0, 2000.0], [800.0, 1500.0])
+        np.testing.assert_allclose(table["max_force_positive"], expected[0])
+        np.testing.assert_allclose(table["max_force_negative"], expected[1])
+
+        table = cache.wind_spectrum_table(WindSpectrumType.harris, [10.0, 20.0], 64, 0.5)
+        np.testing.assert_allclose(table["frequencies"], np.fft.rfftfreq(64, 0.5))
+        np.testing.assert_allclose(table["spectra"][1, 1:], ws.harris_batch(20.0, table["frequencies"][1:]))
+
+        with self.assertRaises(ValueError):
+            cache.wind_coefficient_table(CoefficientType.hughes, 530.0, 1500.0, 107.5, 11.5)
+
+    def test_simulator(self):
+        """Unit test for the wind table of LowSpeedSimulator from the cache."""
+
+        parameters = {"frontal_area": 530.0, "lateral_area": 1500.0, "Loa": 107.5, "s_L": 11.5,
+                      "vessel_type": "Offshore supply vessel"}
+        M, D = np.diag([6000.0, 8000.0, 5.4e6]), np.diag([60.0, 100.0, 5.4e4])
+        cache = ModelCache(self.directory)
+
+        expected = lss.LowSpeedSimulator(M, D, parameters).wind_table
+        lss.LowSpeedSimulator(M, D, parameters, cache=cache)
+        simulator = lss.LowSpeedSimulator(M, D, parameters, cache=cache)
+
+        self.assertIsInstance(simulator.wind_table, np.memmap)
+        np.testing.assert_allclose(simulator.wind_table, expected)
+
+    def test_simulator_coefficient_fit(self):
+        """Unit test for the wind table of LowSpeedSimulator from the cache, with a wind coefficient fit.
+        The fit must be keyed by its coefficients.
+        """
+
+        fit = wcf.WindCoefficientFit.from_blendermann("Offshore supply vessel", 530.0, 1500.0, 107.5, 11.5, order=8)
+        parameters = {"frontal_area": 530.0, "lateral_area": 1500.0, "Loa": 107.5, "s_L": 11.5,
+                      "coeffs": CoefficientType.fourier_fit, "coefficient_fit": fit}
+        M, D = np.diag([6000.0, 8000.0, 5.4e6]), np.diag([60.0, 100.0, 5.4e4])
+        cache = ModelCache(self.directory)
+
+        expected = lss.LowSpeedSimulator(M, D, parameters).wind_table
+        lss.LowSpeedSimulator(M, D, parameters, cache=cache)
+        copy = dict(parameters, coefficient_fit=wcf.WindCoefficientFit(fit.cosine_coefficients,
+                                                                       fit.sine_coefficients))
+        simulator = lss.LowSpeedSimulator(M, D, copy, cache=cache)
+
+        self.assertIsInstance(simulator.wind_table, np.memmap)
+        np.testing.assert_allclose(simulator.wind_table, expected)
+
+        other = wcf.WindCoefficientFit(2.0 * fit.cosine_coefficients, fit.sine_coefficients)
+        self.assertNotEqual(cache.key("table", {"fit": fit}), cache.key("table", {"fit": other}))
+        self.assertNotEqual(cache.key("table", {"fit": fit}),
+                            cache.key("table", {"fit": [fit.cosine_coefficients, fit.sine_coefficients]}))
+
+
+if __name__ == '__main__':
+    unittest.main()
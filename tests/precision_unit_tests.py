@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the float32 mode of the numerical kernels, compared with float64."""
+
+import unittest
+import numpy as np
+from pymarcyb.trajgens import minimum_jerk_trajectory as mjt
+from pymarcyb.util.enumerations import CoefficientType, WindSpectrumType
+from pymarcyb.util.filters import lowpass_filters as lpf
+from pymarcyb.util.kinematics import angle_transformation as at
+from pymarcyb.util.kinematics import referenceframe_transformation as rt
+from pymarcyb.util.waves import wave_spectrum as wvs
+from pymarcyb.util.wind import wind_coefficients as wc
+from pymarcyb.util.wind import wind_forces as wf
+from pymarcyb.util.wind import wind_spectrum as ws
+from pymarcyb.util.wind.wind_coefficient_fit import WindCoefficientFit
+
+
+class TestPrecisionMethods(unittest.TestCase):
+    """Unit test class for the float32 mode. The results must be float32, and within the
+    documented error bounds of float64.
+    """
+
+    def setUp(self):
+        """Setting up for the test."""
+
+        rng = np.random.default_rng(0)
+        self.speeds = rng.uniform(1.0, 30.0, 5000)
+        self.directions = rng.uniform(0.0, 2 * np.pi, 5000)
+        self.headings = rng.uniform(-np.pi, np.pi, 5000)
+        self.vessel = {'frontal_area': 530.0, 'lateral_area': 1500.0, 'Loa': 107.5, 's_L': 11.5}
+        self.isherwood = (530.0, 1500.0, 1500.0/9.0, 107.5, 35.0, 107.5, 11.5, 1)
+
+    def test_wind_forces(self):
+        """Unit test for wind_forces_and_moment_batch(...) with all coefficient types, with
+        float64 vessel parameters, which must not upcast.
+        """
+
+        fit = WindCoefficientFit.from_blendermann("Offshore supply vessel", 530.0, 1500.0, 107.5, 11.5)
+        parameters = [{'vessel_type': "Offshore supply vessel"},
+                      {'coeffs': CoefficientType.isherwood, 'superstructure_area': np.float64(1500.0/9.0),
+                       'breadth': np.float64(35.0), 'S': np.float64(107.5), 'masts': np.int64(1)},
+                      {'coeffs': CoefficientType.fourier_fit, 'coefficient_fit': fit}]
+
+        for coefficients in parameters:
+            arguments = dict(self.vessel, vessel_heading=self.headings, vessel_speed_surge=2.0, **coefficients)
+            expected = wf.wind_forces_and_moment_batch(self.speeds, self.directions, **arguments)
+            result = wf.wind_forces_and_moment_batch(self.speeds, self.directions, dtype=np.float32, **arguments)
+
+            self.assertEqual(result.dtype, np.float32)
+            np.testing.assert_array_less(np.abs(result - expected).max(axis=1), 1e-5 * np.abs(expected).max(axis=1))
+
+    def test_wind_coefficients(self):
+        """Unit test for blendermann(...) and isherwood(...)."""
+
+        expected = wc.blendermann("Offshore supply vessel", 530.0, 1500.0, 107.5, 11.5, self.directions)
+        result = wc.blendermann("Offshore supply vessel", 530.0, 1500.0, 107.5, 11.5, self.directions,
+                                dtype=np.float32)
+        self.assertTrue(all(C.dtype == np.float32 for C in result))
+        np.testing.assert_allclose(result, expected, rtol=0.0, atol=1e-6)
+
+        expected = wc.isherwood(*self.isherwood, self.directions)
+        result = wc.isherwood(*self.isherwood, self.directions, dtype=np.float32)
+        self.assertTrue(all(C.dtype == np.float32 for C in result))
+        np.testing.assert_allclose(result, expected, rtol=0.0, atol=1e-5)
+
+    def test_wind_spectra(self):
+        """Unit test for wind_spectrum_batch(...) with all spectrum types, and U10_to_Uz_batch(...)."""
+
+        frequencies = np.arange(0.01, 1.0, 0.01)
+        for spectrum_type in WindSpectrumType:
+            expected = ws.wind_spectrum_batch(spectrum_type, self.speeds[:, np.newaxis], frequencies)
+            result = ws.wind_spectrum_batch(spectrum_type, self.speeds[:, np.newaxis], frequencies, dtype=np.float32)
+
+            self.assertEqual(result.dtype, np.float32)
+            np.testing.assert_allclose(result, expected, rtol=2e-6)
+
+        result = ws.U10_to_Uz_batch(self.speeds, np.float64(0.0025), 40.0, dtype=np.float32)
+        self.assertEqual(result.dtype, np.float32)
+        np.testing.assert_allclose(result, ws.U10_to_Uz_batch(self.speeds, 0.0025, 40.0), rtol=1e-6)
+
+    def test_wave_spectra(self):
+        """Unit test for pierson_moskowitz_batch(...) and jonswap_batch(...), with and without fetch."""
+
+        omegas = np.arange(0.2, 3.0, 0.01)
+        U_10 = self.speeds[:, np.newaxis]
+        for function, parameters in [(wvs.pierson_moskowitz_batch, {}),
+                                     (wvs.pierson_moskowitz_batch, {'calc_alpha': True, 'calc_beta': True,
+                                                                    'H_s': 3.0, 'T_0': 8.0}),
+                                     (wvs.jonswap_batch, {}),
+                                     (wvs.jonswap_batch, {'fetch_dependent': True, 'fetch': 50000.0})]:
+            expected = function(U_10, omegas, **parameters)
+            result = function(U_10, omegas, dtype=np.float32, **parameters)
+
+            self.assertEqual(result.dtype, np.float32)
+            np.testing.assert_allclose(result, expected, rtol=1e-4, atol=2e-6 * np.abs(expected).max())
+
+    def test_kinematics(self):
+        """Unit test for transform_to_pipi_array(...) and the batch rotations."""
+
+        angles = 30.0 * self.directions - 90.0
+        expected, _ = at.transform_to_pipi_array(angles)
+        result, _ = at.transform_to_pipi_array(angles, dtype=np.float32)
+        self.assertEqual(result.dtype, np.float32)
+        np.testing.assert_allclose(result, expected, rtol=0.0, atol=1e-5)
+
+        coordinates = np.array([1000.0 * np.cos(self.directions), 1000.0 * np.sin(self.directions), self.headings])
+        for rotate in (rt.rotate_NED_to_BODY_batch, rt.rotate_BODY_to_NED_batch):
+            result = rotate(coordinates, dtype=np.float32)
+            self.assertEqual(result.dtype, np.float32)
+            np.testing.assert_allclose(result, rotate(coordinates), rtol=0.0, atol=1e-6 * 1000.0)
+
+    def test_rotations_batch(self):
+        """Unit test for the batch rotations, compared with the matrix versions."""
+
+        coordinates = np.array([[120.0, -35.0, 0.7], [-4.0, 18.0, -2.9]]).T
+        body = rt.rotate_NED_to_BODY_batch(coordinates)
+
+        for i in range(2):
+            column = np.matrix(coordinates[:, i]).T
+            np.testing.assert_allclose(body[:, i], np.asarray(rt.rotate_NED_to_BODY(column)).ravel())
+            np.testing.assert_allclose(rt.rotate_BODY_to_NED_batch(coordinates)[:, i],
+                                       np.asarray(rt.rotate_BODY_to_NED(column)).ravel())
+
+    def test_lowpass_filter_batch(self):
+        """Unit test for lowpass_filter_batch(...), compared with lowpass_filter(...) for each
+        channel, and in float32.
+        """
+
+        series = np.random.default_rng(1).normal(size=(3, 1000))
+        expected = [lpf.lowpass_filter(list(channel), 10.0) for channel in series]
+        np.testing.assert_allclose(lpf.lowpass_filter_batch(series, 10.0), expected, atol=1e-12)
+        np.testing.assert_allclose(lpf.lowpass_filter_batch(series[0], 0.8, block_size=7),
+                                   lpf.lowpass_filter(list(series[0]), 0.8), atol=1e-12)
+
+        result = lpf.lowpass_filter_batch(series, 10.0, dtype=np.float32)
+        self.assertEqual(result.dtype, np.float32)
+        np.testing.assert_allclose(result, expected, rtol=0.0, atol=1e-6 * np.abs(series).max())
+
+    def test_mjtg_array(self):
+        """Unit test for mjtg_array(...)."""
+
+        expected = mjt.mjtg_array([15.0, -3.0, 100.0], [27.0, 40.0, -200.0], 100.0, 60.0)
+        result = mjt.mjtg_array([15.0, -3.0, 100.0], [27.0, 40.0, -200.0], 100.0, 60.0, dtype=np.float32)
+
+        self.assertTrue(all(values.dtype == np.float32 for values in result))
+        np.testing.assert_allclose(result[0], expected[0], rtol=0.0, atol=1e-5 * 200.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
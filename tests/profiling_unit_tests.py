@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the profiling functions."""
+
+import json
+import unittest
+import numpy as np
+from pymarcyb.util.kinematics import angle_transformation as at
+from pymarcyb.util.profiling import profiler
+from pymarcyb.util.thrusters import thrust_allocation as ta
+
+
+class TestProfilerMethods(unittest.TestCase):
+    """Unit test class for the profiler methods."""
+
+    def setUp(self):
+        profiler.reset()
+
+    def tearDown(self):
+        profiler.disable()
+        profiler.reset()
+
+    def test_enable_disable(self):
+        """Unit test for enable() and disable(). The original functions must be back
+        after disable().
+        """
+
+        original_function = at.transform_to_pipi
+        original_method = ta.ThrustAllocator.allocate
+
+        profiler.enable()
+        self.assertTrue(profiler.is_enabled())
+        self.assertIsNot(at.transform_to_pipi, original_function)
+        self.assertIsNot(ta.ThrustAllocator.allocate, original_method)
+
+        profiler.disable()
+        self.assertFalse(profiler.is_enabled())
+        self.assertIs(at.transform_to_pipi, original_function)
+        self.assertIs(ta.ThrustAllocator.allocate, original_method)
+
+    def test_statistics(self):
+        """Unit test for statistics(), counting calls and array elements."""
+
+        with profiler.profiling(["pymarcyb.util.kinematics"]):
+            for angle in [1.0, 2.0, 4.0]:
+                at.transform_to_pipi(angle)
+            at.transform_to_pipi_array(np.zeros(100))
+        at.transform_to_pipi(1.0)
+
+        statistics = profiler.statistics()
+        scalar = statistics["pymarcyb.util.kinematics.angle_transformation.transform_to_pipi"]
+        array = statistics["pymarcyb.util.kinematics.angle_transformation.transform_to_pipi_array"]
+
+        self.assertEqual(scalar["calls"], 3)
+        self.assertEqual(array["calls"], 1)
+        self.assertEqual(array["elements"], 100)
+        self.assertGreaterEqual(scalar["p99_time"], scalar["p50_time"])
+        self.assertAlmostEqual(scalar["mean_time"] * 3, scalar["total_time"])
+
+    def test_report(self):
+        """Unit test for report(), as a table and as JSON."""
+
+        with profiler.profiling(["pymarcyb.util.kinematics"]):
+            at.transform_to_pipi(1.0)
+
+        self.assertIn("transform_to_pipi", profiler.report())
+        self.assertEqual(json.loads(profiler.report("json"))
+                         ["pymarcyb.util.kinematics.angle_transformation.transform_to_pipi"]["calls"], 1)
+        self.assertRaises(ValueError, profiler.report, "xml")
+
+
+if __name__ == '__main__':
+    unittest.main()
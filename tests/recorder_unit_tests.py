@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the recorder."""
+
+import os
+import tempfile
+import unittest
+import numpy as np
+from pymarcyb.util.filters import lowpass_filters as lf
+from pymarcyb.util.recording.recorder import Recorder
+
+
+class TestRecorderMethods(unittest.TestCase):
+    """Unit test class for the recorder methods."""
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._directory.name, "run.rec")
+        self.times = np.arange(1000) * 0.1
+        self.values = np.array([np.sin(self.times), np.cos(self.times), self.times])
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_recent(self):
+        """Unit test for recent() and channel(). Must be views of the last samples, also across
+        the wrap of the ring buffer.
+        """
+
+        recorder = Recorder(["a", "b", "c"], block_size=16, n_blocks=4)
+        for time, values in zip(self.times[:150], self.values[:, :150].T):
+            recorder.append(time, values)
+
+        times, values = recorder.recent(40)
+        np.testing.assert_array_equal(times, self.times[110:150])
+        np.testing.assert_array_equal(values, self.values[:, 110:150])
+        self.assertFalse(times.flags.owndata)
+        self.assertFalse(values.flags.owndata)
+        self.assertTrue(values[1].flags.c_contiguous)
+
+        np.testing.assert_array_equal(recorder.channel("b"), self.values[1, 86:150])
+        np.testing.assert_allclose(lf.lowpass_filter(recorder.channel("a", 40), 5.0),
+                                   lf.lowpass_filter(list(self.values[0, 110:150]), 5.0))
+
+        with self.assertRaises(ValueError):
+            recorder.recent(65)
+
+    def test_spill(self):
+        """Unit test for read() with a spill file. Must give the samples of any interval, from
+        the file and the ring buffer, the same with append() and extend().
+        """
+
+        appended = Recorder(["a", "b", "c"], block_size=64, n_blocks=2, dtype=np.float32, path=self.path)
+        for time, values in zip(self.times, self.values.T):
+            appended.append(time, values)
+        extended = Recorder(["a", "b", "c"], block_size=64, n_blocks=2, dtype=np.float32,
+                            path=self.path + ".2")
+        for start in range(0, 1000, 100):
+            extended.extend(self.times[start:start + 100], self.values[:, start:start + 100])
+
+        self.assertEqual(appended.n_spilled, 15)
+
+        for recorder in (appended, extended):
+            for start_time, end_time in ((0.0, 99.9), (10.05, 20.0), (95.0, 97.0), (6.4, 6.4)):
+                times, values = recorder.read(start_time, end_time)
+                inside = (self.times >= start_time) & (self.times <= end_time)
+                np.testing.assert_array_equal(times, self.times[inside])
+                np.testing.assert_array_equal(values, self.values[:, inside].astype(np.float32))
+            recorder.close()
+
+        self.assertEqual(os.path.getsize(self.path), 15 * 64 * (8 + 3 * 4))
+        times, _ = appended.read(0.0, 1.0)
+        np.testing.assert_array_equal(times, self.times[:11])
+
+    def test_overwrite(self):
+        """Unit test for read() without a spill file. Must raise ValueError for overwritten samples."""
+
+        recorder = Recorder(["a", "b", "c"], block_size=16, n_blocks=4)
+        recorder.extend(self.times, self.values)
+
+        times, values = recorder.read(95.0, 200.0)
+        np.testing.assert_array_equal(times, self.times[950:])
+        np.testing.assert_array_equal(values, self.values[:, 950:])
+
+        with self.assertRaises(ValueError):
+            recorder.read(0.0, 10.0)
+
+    def test_illegal_arguments(self):
+        """Unit test for illegal arguments. Must raise ValueError."""
+
+        with self.assertRaises(ValueError):
+            Recorder(["a"], block_size=0)
+        with self.assertRaises(ValueError):
+            Recorder(["a", "a"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the multi-rate scheduler."""
+
+import asyncio
+import math
+import unittest
+from pymarcyb.util.enumerations import ThrusterType
+from pymarcyb.util.filters.lowpass_filters import lowpass_filter
+from pymarcyb.util.scheduling.scheduler import RealClock, Scheduler, SimulatedClock
+from pymarcyb.util.thrusters.power_to_force import imca_p2f
+from pymarcyb.util.wind.wind_forces import wind_forces_and_moment
+
+
+class StandInWindSensor(object):
+    """Stand-in for the wind sensor, with a deterministic gusty wind."""
+
+    async def read(self, time):
+        await asyncio.sleep(0)
+        return 12.0 + 2.0 * math.sin(0.5 * time), math.radians(30.0)
+
+
+class TestSchedulerMethods(unittest.TestCase):
+    """Unit test class for the scheduler."""
+
+    def test_rates(self):
+        """Unit test for the number of runs and the release times of tasks with different periods
+        on a simulated clock. The release times must be whole periods from the start.
+        """
+
+        scheduler = Scheduler(SimulatedClock(start_time=100.0))
+        fast_times, slow_times = [], []
+        scheduler.add_task("fast", fast_times.append, period=0.1)
+        scheduler.add_task("slow", slow_times.append, period=1.0)
+
+        asyncio.run(scheduler.run(duration=10.0))
+
+        self.assertEqual(len(fast_times), 100)
+        self.assertEqual(len(slow_times), 10)
+        self.assertAlmostEqual(fast_times[-1], 109.9, places=9)
+        self.assertEqual(slow_times, [100.0 + i for i in range(10)])
+
+        statistics = scheduler.statistics()
+        self.assertEqual(statistics["fast"]["runs"], 100)
+        self.assertEqual(statistics["fast"]["overruns"], 0)
+        self.assertEqual(sum(statistics["fast"]["latency"]["counts"]), 100)
+        self.assertEqual(sum(statistics["fast"]["jitter"]["counts"]), 99)
+        self.assertLess(statistics["fast"]["jitter"]["maximum"], 1e-9)
+
+    def test_priority(self):
+        """Unit test for the order of tasks released at the same time. The lowest priority
+        number must run first, no matter the order they were added in.
+        """
+
+        scheduler = Scheduler(SimulatedClock())
+        order = []
+        scheduler.add_task("limits", lambda t: order.append("limits"), period=0.5, priority=2)
+        scheduler.add_task("filter", lambda t: order.append("filter"), period=0.25, priority=0)
+        scheduler.add_task("feed-forward", lambda t: order.append("feed-forward"), period=0.5, priority=1)
+
+        asyncio.run(scheduler.run(duration=0.5))
+
+        self.assertEqual(order, ["filter", "feed-forward", "limits", "filter"])
+
+    def test_overrun(self):
+        """Unit test for overrun detection. A task that runs longer than its period must have its
+        missed releases skipped, and the next releases must stay on the period grid.
+        """
+
+        clock = SimulatedClock()
+        scheduler = Scheduler(clock)
+        release_times, overruns = [], []
+
+        def slow_task(time):
+            release_times.append(time)
+            if len(release_times) == 3:
+                clock.advance(0.25)
+
+        scheduler.add_task("slow", slow_task, period=0.1, on_overrun=lambda task, missed: overruns.append(missed))
+        asyncio.run(scheduler.run(duration=1.0))
+
+        task_statistics = scheduler.statistics()["slow"]
+        self.assertEqual(task_statistics["overruns"], 1)
+        self.assertEqual(task_statistics["missed_releases"], 2)
+        self.assertEqual(overruns, [2])
+        self.assertAlmostEqual(release_times[3], 0.5, places=9)
+        self.assertEqual(len(release_times), 8)
+        for release_time in release_times:
+            self.assertAlmostEqual(release_time * 10.0, round(release_time * 10.0), places=9)
+
+    def test_delayed_task(self):
+        """Unit test for a task delayed by a task with a lower priority number. It must miss releases,
+        but not overrun, since its own execution is shorter than its period.
+        """
+
+        clock = SimulatedClock()
+        scheduler = Scheduler(clock)
+        scheduler.add_task("slow", lambda time: clock.advance(0.25), period=1.0, priority=0)
+        scheduler.add_task("fast", lambda time: None, period=0.1, priority=1)
+
+        asyncio.run(scheduler.run(duration=1.0))
+
+        statistics = scheduler.statistics()
+        self.assertEqual(statistics["slow"]["overruns"], 0)
+        self.assertEqual(statistics["fast"]["overruns"], 0)
+        self.assertEqual(statistics["fast"]["missed_releases"], 2)
+        self.assertEqual(statistics["fast"]["runs"], 8)
+        self.assertGreater(statistics["fast"]["latency"]["maximum"], 0.2)
+
+    def test_run_again(self):
+        """Unit test for a second run(). The releases must start over from the new start time."""
+
+        clock = SimulatedClock()
+        scheduler = Scheduler(clock)
+        times = []
+        scheduler.add_task("task", times.append, period=1.0)
+
+        asyncio.run(scheduler.run(duration=3.0))
+        clock.advance(10.0)
+        asyncio.run(scheduler.run(duration=3.0))
+
+        self.assertEqual(times, [0.0, 1.0, 2.0, 12.0, 13.0, 14.0])
+        self.assertEqual(scheduler.statistics()["task"]["runs"], 6)
+        self.assertEqual(scheduler.statistics()["task"]["missed_releases"], 0)
+
+    def test_stop(self):
+        """Unit test for stop(). The scheduler must stop after the running task."""
+
+        scheduler = Scheduler(SimulatedClock())
+        times = []
+
+        def task(time):
+            times.append(time)
+            if len(times) == 5:
+                scheduler.stop()
+
+        scheduler.add_task("task", task, period=1.0)
+        asyncio.run(scheduler.run())
+
+        self.assertEqual(len(times), 5)
+
+    def test_period(self):
+        """Unit test for an illegal period. Must raise ValueError."""
+
+        with self.assertRaises(ValueError):
+            Scheduler().add_task("task", print, period=0.0)
+
+    def test_control_loops(self):
+        """Unit test for the wind filter, wind feed-forward, trajectory and thrust limit loops
+        against the stand-in sensor, faster than real time.
+        """
+
+        sensor = StandInWindSensor()
+        state = {"wind_speeds": [], "filtered": [], "loads": [], "limits": []}
+
+        async def filter_wind(time):
+            speed, direction = await sensor.read(time)
+            state["wind_speeds"].append(speed)
+            state["direction"] = direction
+            state["filtered"].append(lowpass_filter(state["wind_speeds"][-20:], 10.0)[-1])
+
+        def wind_feed_forward(time):
+            state["loads"].append(wind_forces_and_moment(state["filtered"][-1], state["direction"], 530.0,
+                                                         1500.0, 107.5, 11.5,
+                                                         vessel_type="Offshore supply vessel"))
+
+        def thrust_limits(time):
+            state["limits"].append(imca_p2f(ThrusterType.azimuth, 2000.0, 1000.0))
+
+        scheduler = Scheduler(SimulatedClock())
+        scheduler.add_task("filter", filter_wind, period=0.1, priority=0)
+        scheduler.add_task("feed-forward", wind_feed_forward, period=0.5, priority=1)
+        scheduler.add_task("limits", thrust_limits, period=5.0, priority=2)
+
+        asyncio.run(scheduler.run(duration=60.0))
+
+        self.assertEqual(len(state["filtered"]), 600)
+        self.assertEqual(len(state["loads"]), 120)
+        self.assertEqual(len(state["limits"]), 12)
+        self.assertEqual(len(state["loads"][-1]), 3)
+        self.assertGreater(min(state["filtered"]), 9.0)
+
+    def test_real_clock(self):
+        """Unit test for the real clock. The tasks must run at their release times, give or take
+        the latency of the event loop.
+        """
+
+        scheduler = Scheduler(RealClock())
+        times = []
+        scheduler.add_task("task", times.append, period=0.02)
+
+        asyncio.run(scheduler.run(duration=0.2))
+
+        task_statistics = scheduler.statistics()["task"]
+        self.assertEqual(len(times) + task_statistics["missed_releases"], 10)
+        self.assertEqual(sum(task_statistics["latency"]["counts"]), len(times))
+        self.assertAlmostEqual(times[1] - times[0], 0.02, places=9)
+
+
+if __name__ == '__main__':
+    unittest.main()
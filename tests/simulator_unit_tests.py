@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the vessel simulator, the Monte Carlo runner and spectral realizations."""
+
+import unittest
+from math import radians
+import numpy as np
+from pymarcyb.simulators import low_speed_simulator as lss
+from pymarcyb.simulators import monte_carlo as mc
+from pymarcyb.util.enumerations import IntegrationMethod
+from pymarcyb.util.math import spectral_realization as sr
+from pymarcyb.util.wind import wind_forces as wf
+from pymarcyb.util.wind import wind_spectrum as ws
+
+
+M = np.diag([6000.0, 8000.0, 6000.0 * 30.0**2])
+D = np.diag([60.0, 100.0, 60.0 * 30.0**2])
+WIND_PARAMETERS = {"frontal_area": 530.0, "lateral_area": 1500.0, "Loa": 107.5, "s_L": 11.5,
+                   "vessel_type": "Offshore supply vessel"}
+
+
+class TestLowSpeedSimulatorMethods(unittest.TestCase):
+    """Unit test class for the low-speed simulator methods."""
+
+    def test_rk4_free_decay(self):
+        """Unit test for LowSpeedSimulator.simulate(...), compared with the analytical
+        decay of a surge speed, heading north.
+        """
+
+        simulator = lss.LowSpeedSimulator(M, D)
+        times, eta, nu = simulator.simulate(0.1, 1000, nu_0=(2.0, 0.0, 0.0))
+
+        decay = np.exp(-D[0, 0] / M[0, 0] * times)
+        np.testing.assert_allclose(nu[0], 2.0 * decay, rtol=1e-9)
+        np.testing.assert_allclose(eta[0], 2.0 * M[0, 0] / D[0, 0] * (1.0 - decay), rtol=1e-9)
+        np.testing.assert_allclose(eta[1:], 0.0)
+
+    def test_steady_state_thrust(self):
+        """Unit test for LowSpeedSimulator.simulate(...), with constant thrust. Both
+        integration methods must reach D nu = tau.
+        """
+
+        simulator = lss.LowSpeedSimulator(M, D)
+        n_steps = 20000
+        thrust = np.tile([[100.0], [-50.0], [0.0]], n_steps)
+
+        for method in IntegrationMethod:
+            _, _, nu = simulator.simulate(0.1, n_steps, thrust=thrust, method=method)
+            np.testing.assert_allclose(nu[:, -1], [100.0 / 60.0, -0.5, 0.0], atol=1e-6)
+
+    def test_wind_loads(self):
+        """Unit test for LowSpeedSimulator.simulate(...). The first step from rest must
+        use the loads from wind_forces_and_moment().
+        """
+
+        simulator = lss.LowSpeedSimulator(M, D, WIND_PARAMETERS)
+        _, _, nu = simulator.simulate(0.1, 1, wind_speed=15.0, wind_direction=radians(30.0),
+                                      method=IntegrationMethod.semi_implicit_euler)
+
+        loads = wf.wind_forces_and_moment(15.0, radians(30.0), **WIND_PARAMETERS)
+        np.testing.assert_allclose(nu[:, 1], 0.1 * np.linalg.solve(M, np.asarray(loads).ravel()))
+
+    def test_illegal_method(self):
+        """Unit test for LowSpeedSimulator.simulate(...), with an illegal integration method."""
+
+        simulator = lss.LowSpeedSimulator(M, D)
+        self.assertRaises(ValueError, simulator.simulate, 0.1, 10, method="euler")
+
+    def test_out(self):
+        """Unit test for LowSpeedSimulator.simulate(...), with preallocated output arrays.
+        Arrays the time loop cannot write to in place must raise ValueError.
+        """
+
+        simulator = lss.LowSpeedSimulator(M, D)
+        eta, nu = np.empty((3, 11)), np.empty((3, 11))
+        _, eta_out, nu_out = simulator.simulate(0.1, 10, nu_0=(2.0, 0.0, 0.0), out=(eta, nu))
+
+        self.assertIs(eta_out, eta)
+        self.assertGreater(eta[0, -1], 0.0)
+        for illegal in (np.empty((11, 3)).T, np.empty((3, 11), dtype=np.float32), np.empty((3, 12))):
+            self.assertRaises(ValueError, simulator.simulate, 0.1, 10, out=(illegal, nu))
+
+
+class TestMonteCarloMethods(unittest.TestCase):
+    """Unit test class for the Monte Carlo runner methods."""
+
+    def test_running_statistics(self):
+        """Unit test for RunningStatistics.update(...), compared with numpy."""
+
+        samples = np.random.default_rng(0).normal(3.0, 2.0, (100, 2))
+        statistics = mc.RunningStatistics(2)
+        for sample in samples:
+            statistics.update(sample)
+
+        self.assertEqual(statistics.count, 100)
+        np.testing.assert_allclose(statistics.mean, samples.mean(axis=0))
+        np.testing.assert_allclose(statistics.std, samples.std(axis=0, ddof=1))
+        np.testing.assert_allclose(statistics.minimum, samples.min(axis=0))
+        np.testing.assert_allclose(statistics.maximum, samples.max(axis=0))
+
+    def test_reproducible(self):
+        """Unit test for MonteCarloRunner.run(...). The same seed must give the same
+        statistics in this process and in a process pool.
+        """
+
+        simulator = lss.LowSpeedSimulator(M, D, WIND_PARAMETERS)
+        omegas = np.linspace(0.1, 2.0, 50)
+        runner = mc.MonteCarloRunner(simulator, 0.5, 500, (5.0, 25.0),
+                                     wave_force_rao=np.vstack([10.0 * omegas, 20.0 * omegas, 100.0 * omegas]),
+                                     wave_rao_frequencies=omegas)
+        wind_speeds = np.linspace(5.0, 25.0, 6)
+
+        serial = runner.run(wind_speeds, radians(45.0), seed=3, processes=1)
+        parallel = runner.run(wind_speeds, radians(45.0), seed=3, processes=2, chunksize=1)
+        other = runner.run(wind_speeds, radians(45.0), seed=4, processes=1)
+
+        self.assertEqual(parallel.count, 6)
+        np.testing.assert_allclose(parallel.mean, serial.mean)
+        np.testing.assert_allclose(parallel.maximum, serial.maximum)
+        self.assertFalse(np.allclose(other.mean, serial.mean))
+
+    def test_shared_thrust(self):
+        """Unit test for MonteCarloRunner.run(...), with thrust. The thrust is shared with the workers,
+        and must give the same statistics as in this process.
+        """
+
+        simulator = lss.LowSpeedSimulator(M, D, WIND_PARAMETERS)
+        runner = mc.MonteCarloRunner(simulator, 0.5, 500, (5.0, 25.0), thrust=[[-100.0], [50.0], [0.0]])
+        wind_speeds = np.linspace(5.0, 25.0, 4)
+
+        serial = runner.run(wind_speeds, radians(45.0), seed=3, processes=1)
+        parallel = runner.run(wind_speeds, radians(45.0), seed=3, processes=2, chunksize=1)
+        unforced = mc.MonteCarloRunner(simulator, 0.5, 500, (5.0, 25.0)).run(wind_speeds, radians(45.0), seed=3,
+                                                                             processes=1)
+
+        self.assertEqual(runner.thrust.shape, (3, 500))
+        np.testing.assert_allclose(parallel.mean, serial.mean)
+        self.assertFalse(np.allclose(unforced.mean, serial.mean))
+
+    def test_illegal_spectrum(self):
+        """Unit test for MonteCarloRunner(...), with an illegal wind spectrum type."""
+
+        simulator = lss.LowSpeedSimulator(M, D)
+        self.assertRaises(ValueError, mc.MonteCarloRunner, simulator, 0.5, 100, (5.0, 25.0), wind_spectrum=None)
+
+
+class TestSpectralRealizationMethods(unittest.TestCase):
+    """Unit test class for the spectral realization methods."""
+
+    def test_variance(self):
+        """Unit test for realization(...). The variance must match the area of the spectrum."""
+
+        frequencies, spectrum = ws.harris(15.0)
+        series = sr.realization(frequencies, spectrum, 100000, 0.1, rng=1)
+
+        self.assertAlmostEqual(series.mean(), 0.0)
+        self.assertAlmostEqual(series.var(), np.sum(spectrum) * (frequencies[1] - frequencies[0]), delta=0.1)
+
+    def test_seed(self):
+        """Unit test for realization(...), which must repeat for the same seed."""
+
+        frequencies, spectrum = ws.davenport(10.0)
+        first = sr.realization(frequencies, spectrum, 1000, 0.5, rng=7)
+
+        np.testing.assert_array_equal(first, sr.realization(frequencies, spectrum, 1000, 0.5, rng=7))
+
+    def test_transfer(self):
+        """Unit test for realization(...), with a transfer function. The phases must be
+        the same as without it.
+        """
+
+        frequencies, spectrum = ws.davenport(10.0)
+        elevation = sr.realization(frequencies, spectrum, 1000, 0.5, rng=7)
+        loads = sr.realization(frequencies, spectrum, 1000, 0.5, rng=7,
+                               transfer=np.ones((3, len(frequencies))) * [[2.0], [-1.0], [0.0]])
+
+        self.assertEqual(loads.shape, (3, 1000))
+        np.testing.assert_allclose(loads[0], 2.0 * elevation)
+        np.testing.assert_allclose(loads[1], -elevation)
+        np.testing.assert_allclose(loads[2], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
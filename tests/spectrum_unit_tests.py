@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the wind and wave spectrum functions."""
+
+import unittest
+import numpy as np
+from pymarcyb.util.enumerations import WindSpectrumType
+from pymarcyb.util.waves import wave_spectrum as wvs
+from pymarcyb.util.wind import wind_spectrum as ws
+
+
+class TestSpectrumMethods(unittest.TestCase):
+    """Unit test class for the spectrum methods."""
+
+    def test_wind_spectrum_batch(self):
+        """Unit test for wind_spectrum_batch(...), compared with the list versions."""
+
+        spectra = [(WindSpectrumType.davenport, ws.davenport), (WindSpectrumType.harris, ws.harris),
+                   (WindSpectrumType.npd, ws.npd), (WindSpectrumType.api, ws.api)]
+
+        for spectrum_type, spectrum_function in spectra:
+            frequencies, spectrum = spectrum_function(12.0)
+            batch = ws.wind_spectrum_batch(spectrum_type, [[12.0], [15.0]], frequencies[1:])
+            np.testing.assert_allclose(batch[0], spectrum[1:])
+            np.testing.assert_allclose(batch[1], spectrum_function(15.0)[1][1:])
+
+    def test_ochi_shin_batch(self):
+        """Unit test for ochi_shin_batch(...), compared with ochi_shin(...)."""
+
+        frequencies, spectrum = ws.ochi_shin(12.0, step_size=0.01)
+        np.testing.assert_allclose(ws.ochi_shin_batch(12.0, frequencies), spectrum, rtol=1e-4)
+
+    def test_illegal_wind_spectrum(self):
+        """Unit test for wind_spectrum_batch(...), with an illegal spectrum type."""
+
+        self.assertRaises(ValueError, ws.wind_spectrum_batch, "harris", 12.0, 0.1)
+
+    def test_wave_spectrum_batch(self):
+        """Unit test for pierson_moskowitz_batch(...) and jonswap_batch(...), compared
+        with the list versions.
+        """
+
+        omegas, spectrum = wvs.pierson_moskowitz(12.0, calc_alpha=True, H_s=3.0, T_0=8.0)
+        np.testing.assert_allclose(wvs.pierson_moskowitz_batch(12.0, omegas, calc_alpha=True, H_s=3.0, T_0=8.0),
+                                   spectrum)
+
+        omegas, spectrum = wvs.jonswap(12.0)
+        np.testing.assert_allclose(wvs.jonswap_batch([[12.0], [15.0]], omegas), [spectrum, spectrum])
+
+        omegas, spectrum = wvs.jonswap(12.0, fetch_dependent=True, fetch=100000.0)
+        np.testing.assert_allclose(wvs.jonswap_batch(12.0, omegas, fetch_dependent=True, fetch=100000.0),
+                                   spectrum)
+
+
+if __name__ == '__main__':
+    unittest.main()
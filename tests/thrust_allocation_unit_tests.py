@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the thrust allocation."""
+
+import unittest
+from math import radians
+import numpy as np
+from pymarcyb.util.thrusters import thrust_allocation as ta
+from pymarcyb.util.enumerations import ThrusterType
+
+
+class TestThrustAllocationMethods(unittest.TestCase):
+    """Unit test class for the thrust allocation methods."""
+
+    def setUp(self):
+        """Setting up for the test."""
+
+        thruster_types = [ThrusterType.tunnel, ThrusterType.tunnel, ThrusterType.azimuth,
+                          ThrusterType.azimuth, ThrusterType.propeller, ThrusterType.propeller]
+        positions = [(40.0, 0.0), (35.0, 0.0), (-30.0, 6.0), (-30.0, -6.0), (-40.0, 5.0), (-40.0, -5.0)]
+        max_power = [880.0, 880.0, 2200.0, 2200.0, 5000.0, 5000.0]
+
+        self.allocator = ta.ThrustAllocator.from_power(thruster_types, positions, max_power, max_power,
+                                                       max_azimuth_rates=[np.inf, np.inf, radians(10.0),
+                                                                          radians(10.0), np.inf, np.inf])
+
+    def test_feasible_command(self):
+        """Unit test for allocate(...), with a command within the limits.
+        Checking that the command is achieved.
+        """
+
+        self.allocator.allocate([300.0, 100.0, 2000.0])
+
+        self.assertAlmostEqual(np.linalg.norm(self.allocator.residual), 0.0, 4)
+
+    def test_force_limits(self):
+        """Unit test for allocate(...), with a command above the limits.
+        Checking that no thruster exceeds its limits.
+        """
+
+        thrusts, _ = self.allocator.allocate([3000.0, 1000.0, 0.0])
+
+        self.assertTrue(np.all(thrusts <= self.allocator.max_forces_positive + 1e-9))
+        self.assertTrue(np.all(thrusts >= -self.allocator.max_forces_negative - 1e-9))
+        self.assertGreater(np.linalg.norm(self.allocator.residual), 0.0)
+
+    def test_azimuth_rate_limits(self):
+        """Unit test for allocate(...), with azimuth rate limits.
+        Checking that the azimuth thrusters turn no faster than allowed.
+        """
+
+        self.allocator.allocate([300.0, 0.0, 0.0])
+        previous_angles = self.allocator.azimuth_angles.copy()
+
+        _, angles = self.allocator.allocate([0.0, 300.0, 0.0], dt=0.1)
+        steps = (angles - previous_angles + np.pi) % (2 * np.pi) - np.pi
+
+        self.assertTrue(np.all(np.abs(steps[2:4]) <= radians(1.0) + 1e-9))
+
+    def test_warm_start(self):
+        """Unit test for allocate(...), after a saturated command.
+        Checking that the warm start does not keep stale saturations.
+        """
+
+        self.allocator.allocate([5000.0, 3000.0, 1000.0])
+        self.allocator.allocate([100.0, 50.0, 500.0])
+
+        self.assertAlmostEqual(np.linalg.norm(self.allocator.residual), 0.0, 4)
+
+    def test_saturated_azimuth(self):
+        """Unit test for allocate(...), with commands that saturate an azimuth thruster.
+        Checking that the commands are achieved by turning the saturated thruster.
+        """
+
+        thruster_types = [ThrusterType.tunnel, ThrusterType.tunnel, ThrusterType.azimuth,
+                          ThrusterType.azimuth, ThrusterType.propeller, ThrusterType.propeller]
+        positions = [(40.0, 0.0), (35.0, 0.0), (-30.0, 6.0), (-30.0, -6.0), (-40.0, 5.0), (-40.0, -5.0)]
+        max_power = [880.0, 880.0, 2200.0, 2200.0, 5000.0, 5000.0]
+
+        for tau in ([388.28, 304.65, -34339.18], [1255.69, -1010.35, 14218.53]):
+            allocator = ta.ThrustAllocator.from_power(thruster_types, positions, max_power, max_power)
+            thrusts, _ = allocator.allocate(tau)
+
+            self.assertTrue(np.all(np.abs(allocator.residual) <= 1e-6 * (1.0 + np.abs(tau))))
+            self.assertTrue(np.all(thrusts <= allocator.max_forces_positive + 1e-9))
+            self.assertTrue(np.all(thrusts >= -allocator.max_forces_negative - 1e-9))
+
+    def test_failed_azimuth(self):
+        """Unit test for allocate(...), with an azimuth thruster without thrust and a saturating command.
+        Checking that the failed thruster gives no thrust and the others stay within their limits.
+        """
+
+        max_forces_positive = self.allocator.max_forces_positive.copy()
+        max_forces_negative = self.allocator.max_forces_negative.copy()
+        max_forces_positive[2], max_forces_negative[2] = 0.0, 0.0
+        self.allocator.set_force_limits(max_forces_positive, max_forces_negative)
+
+        with np.errstate(all='raise'):
+            thrusts, _ = self.allocator.allocate([1255.69, -1010.35, 14218.53])
+
+        self.assertEqual(thrusts[2], 0.0)
+        self.assertTrue(np.all(thrusts <= max_forces_positive + 1e-9))
+        self.assertTrue(np.all(thrusts >= -max_forces_negative - 1e-9))
+
+    def test_illegal_thruster_type(self):
+        """Unit test for ThrustAllocator(...), with an unsupported thruster type.
+        Checking that an error is raised.
+        """
+
+        with self.assertRaises(ValueError):
+            ta.ThrustAllocator([ThrusterType.vsp], [(0.0, 0.0)], [100.0], [100.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
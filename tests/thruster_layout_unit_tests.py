@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the thruster layout interaction table."""
+
+import unittest
+from math import pi
+import numpy as np
+from pymarcyb.util.thrusters import thruster_layout as tl
+from pymarcyb.util.thrusters import thruster_thruster_interaction as tti
+from pymarcyb.util.thrusters import thruster_hull_interaction as thi
+
+
+class TestThrusterLayoutMethods(unittest.TestCase):
+    """Unit test class for the thruster layout methods."""
+
+    def setUp(self):
+        """Setting up for the test."""
+
+        self.layout = tl.ThrusterLayout([(0.0, 0.0), (10.0, 0.0), (0.0, 30.0)], [2.0, 2.0, 3.0],
+                                        under_hull=[False, False, True])
+
+    def test_wake_towards_other_thruster(self):
+        """Unit test for reduction(...), with the wake directed at another thruster."""
+
+        self.assertAlmostEqual(self.layout.reduction(1, 0.0), tti.abs_inline_tandem_condition(10.0, 2.0), 10)
+        self.assertAlmostEqual(self.layout.reduction(0, pi), tti.abs_inline_tandem_condition(10.0, 2.0), 10)
+        self.assertTrue(self.layout.is_forbidden([pi, 0.0, 0.0])[0])
+
+    def test_wake_away_from_other_thrusters(self):
+        """Unit test for reduction(...), with the wake directed away from the other thrusters."""
+
+        self.assertAlmostEqual(self.layout.reduction(1, pi), 1.0, 10)
+        self.assertAlmostEqual(self.layout.reduction(2, -pi / 2), thi.abs_coanda_effect(), 10)
+
+    def test_move_thruster(self):
+        """Unit test for move_thruster(...), compared with a layout built from scratch."""
+
+        self.layout.move_thruster(0, (10.0, 30.0))
+        rebuilt = tl.ThrusterLayout([(10.0, 30.0), (10.0, 0.0), (0.0, 30.0)], [2.0, 2.0, 3.0],
+                                    under_hull=[False, False, True])
+
+        np.testing.assert_allclose(self.layout.table, rebuilt.table)
+        self.assertAlmostEqual(self.layout.reduction(1, 0.0), 1.0, 10)
+        self.assertAlmostEqual(self.layout.reduction(2, pi), 0.97 * tti.abs_inline_tandem_condition(10.0, 3.0), 10)
+
+    def test_inactive_thruster(self):
+        """Unit test for set_active(...), stopping the thruster the wake is directed at."""
+
+        self.layout.set_active(0, False)
+
+        self.assertAlmostEqual(self.layout.reduction(1, 0.0), 1.0, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
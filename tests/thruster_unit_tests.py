@@ -2,6 +2,7 @@
 """Unit tests for the thruster functions."""
 
 import unittest
+import numpy as np
 from pymarcyb.util.thrusters import power_to_force as p2f
 from pymarcyb.util.enumerations import ThrusterType
 
@@ -63,5 +64,78 @@ class TestThrusterMethods(unittest.TestCase):
 
         self.assertAlmostEqual(self.min_force_propeller_imca, -608.52, 2)
 
+    def test_vsp_imca(self):
+        """Unit test for imca_p2f(...), for a Voith Schneider propeller.
+        Checking that an error is raised.
+        """
+
+        with self.assertRaises(ValueError):
+            p2f.imca_p2f(ThrusterType.vsp, 1000.0, 1000.0)
+
+    def test_batch_imca(self):
+        """Unit test for imca_p2f_batch(...), compared with imca_p2f(...).
+        Powers have one row per scenario.
+        """
+
+        thruster_types = [ThrusterType.tunnel, ThrusterType.azimuth,
+                          ThrusterType.propeller, ThrusterType.waterjet]
+        powers = np.array([[880.0, 2200.0, 5000.0, 1000.0],
+                           [440.0, 1100.0, 2500.0,  500.0]])
+
+        max_forces, min_forces = p2f.imca_p2f_batch(thruster_types, powers, powers)
+
+        self.assertEqual(max_forces.shape, (2, 4))
+        for i in range(2):
+            for j, thruster_type in enumerate(thruster_types):
+                max_force, min_force = p2f.imca_p2f(thruster_type, powers[i, j], powers[i, j])
+                self.assertAlmostEqual(max_forces[i, j], max_force, 10)
+                self.assertAlmostEqual(min_forces[i, j], min_force, 10)
+
+    def test_batch_imca_illegal_type(self):
+        """Unit test for imca_p2f_batch(...), with an illegal thruster type.
+        Checking that an error is raised.
+        """
+
+        with self.assertRaises(ValueError):
+            p2f.imca_p2f_batch([ThrusterType.tunnel, ThrusterType.vsp], [1.0, 1.0], [1.0, 1.0])
+
+        with self.assertRaises(ValueError):
+            p2f.imca_p2f_batch([1, 17], [1.0, 1.0], [1.0, 1.0])
+
+    def test_batch_abs(self):
+        """Unit test for abs_p2f_batch(...), compared with abs_p2f(...)."""
+
+        powers = [880.0, 2200.0, 5000.0]
+        diameters = [2.0, 3.0, 4.0]
+        ducted = [False, True, True]
+
+        max_forces, min_forces = p2f.abs_p2f_batch(powers, powers, diameters, ducted)
+
+        for i in range(3):
+            max_force, min_force = p2f.abs_p2f(powers[i], powers[i], diameters[i], ducted[i])
+            self.assertAlmostEqual(max_forces[i], max_force, 10)
+            self.assertAlmostEqual(min_forces[i], min_force, 10)
+
+    def test_imca_f2p_inverse(self):
+        """Unit test for imca_f2p(...), as inverse of imca_p2f(...)."""
+
+        power_positive, power_negative = p2f.imca_f2p(ThrusterType.azimuth, self.max_force_azimuth_imca,
+                                                      self.min_force_azimuth_imca)
+
+        self.assertAlmostEqual(power_positive, 2200.0, 6)
+        self.assertAlmostEqual(power_negative, 2200.0, 6)
+
+    def test_abs_f2p_inverse(self):
+        """Unit test for abs_f2p_batch(...), as inverse of abs_p2f_batch(...)."""
+
+        powers = np.array([880.0, 2200.0, 5000.0])
+        max_forces, min_forces = p2f.abs_p2f_batch(powers, powers, [2.0, 3.0, 4.0], [False, True, True])
+        power_positive, power_negative = p2f.abs_f2p_batch(max_forces, min_forces, [2.0, 3.0, 4.0],
+                                                           [False, True, True])
+
+        np.testing.assert_allclose(power_positive, powers)
+        np.testing.assert_allclose(power_negative, powers)
+
+
 if __name__ == '__main__':
     unittest.main()
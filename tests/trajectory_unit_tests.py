@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the trajectory generators."""
+
+import unittest
+import numpy as np
+from pymarcyb.trajgens import minimum_jerk_trajectory as mjt
+from pymarcyb.trajgens import quintic_trajectory as qt
+from pymarcyb.trajgens import waypoint_trajectory as wt
+
+
+class TestMinimumJerkTrajectoryMethods(unittest.TestCase):
+    """Unit test class for the minimum jerk trajectory methods."""
+
+    def test_array_matches_list(self):
+        """Unit test for mjtg_array(...), compared with mjtg(...).
+        Checking that the endpoints are included.
+        """
+
+        trajectory, trajectory_derivative = mjt.mjtg(15.0, 27.0, 100.0, 12.0)
+        position, velocity, acceleration = mjt.mjtg_array(15.0, 27.0, 100.0, 12.0)
+
+        np.testing.assert_allclose(position[1:-1], trajectory)
+        np.testing.assert_allclose(velocity[1:-1], trajectory_derivative, atol=1e-12)
+        self.assertEqual(position[0], 15.0)
+        self.assertEqual(position[-1], 27.0)
+        self.assertEqual(acceleration[-1], 0.0)
+
+    def test_several_axes(self):
+        """Unit test for mjtg_array(...), with three axes."""
+
+        position, _, _ = mjt.mjtg_array([0.0, 0.0, 0.0], [10.0, 5.0, 1.0], 10.0, 20.0)
+
+        self.assertEqual(position.shape, (3, 201))
+        np.testing.assert_allclose(position[:, 100], [5.0, 2.5, 0.5])
+
+    def test_evaluate(self):
+        """Unit test for MinimumJerkTrajectory.evaluate(...), compared with mjtg_array(...)."""
+
+        trajectory = mjt.MinimumJerkTrajectory([0.0, 0.0], [10.0, 5.0], 20.0, start_time=5.0)
+        position, velocity, acceleration = mjt.mjtg_array([0.0, 0.0], [10.0, 5.0], 10.0, 20.0)
+
+        times = 5.0 + np.arange(201) / 10.0
+        evaluated = trajectory.evaluate(times)
+
+        np.testing.assert_allclose(evaluated[0], position)
+        np.testing.assert_allclose(evaluated[1], velocity, atol=1e-12)
+        np.testing.assert_allclose(evaluated[2], acceleration, atol=1e-12)
+        np.testing.assert_allclose(trajectory.evaluate(100.0)[0], [10.0, 5.0])
+
+    def test_evaluate_scalar_current(self):
+        """Unit test for MinimumJerkTrajectory.evaluate(...), with one current for several axes."""
+
+        trajectory = mjt.MinimumJerkTrajectory(0.0, [10.0, 20.0, 1.0], 30.0)
+
+        np.testing.assert_allclose(trajectory.evaluate(15.0)[0], [5.0, 10.0, 0.5])
+        self.assertEqual(trajectory.evaluate([0.0, 15.0])[0].shape, (3, 2))
+
+    def test_too_short_move(self):
+        """Unit test for mjtg_array(...), with a move shorter than one sample."""
+
+        with self.assertRaises(ValueError):
+            mjt.mjtg_array(0.0, 10.0, 10.0, 0.05)
+
+
+class TestQuinticTrajectoryMethods(unittest.TestCase):
+    """Unit test class for the quintic trajectory methods."""
+
+    def test_from_rest_matches_minimum_jerk(self):
+        """Unit test for QuinticTrajectory.plan(...), which is minimum jerk when starting
+        and ending at rest.
+        """
+
+        trajectory = qt.QuinticTrajectory([0.0, 0.0])
+        trajectory.plan([10.0, 5.0], 20.0, start_time=0.0)
+        reference = mjt.MinimumJerkTrajectory([0.0, 0.0], [10.0, 5.0], 20.0)
+
+        for time in [0.0, 3.0, 10.0, 17.5, 20.0]:
+            for actual, expected in zip(trajectory.evaluate(time), reference.evaluate(time)):
+                np.testing.assert_allclose(actual, expected, atol=1e-9)
+
+    def test_boundary_conditions(self):
+        """Unit test for QuinticTrajectory.plan(...), with velocity and acceleration at both ends."""
+
+        trajectory = qt.QuinticTrajectory(2.0, velocity=1.0, acceleration=-0.5, start_time=3.0)
+        trajectory.plan(12.0, 8.0, final_velocity=0.5, final_acceleration=0.1, start_time=3.0)
+
+        np.testing.assert_allclose(trajectory.evaluate(3.0), [2.0, 1.0, -0.5])
+        np.testing.assert_allclose(trajectory.evaluate(11.0), [12.0, 0.5, 0.1])
+        np.testing.assert_allclose(trajectory.evaluate(12.0), [12.0 + 0.5 + 0.05, 0.6, 0.1])
+
+    def test_initial_state(self):
+        """Unit test for QuinticTrajectory(...) before the first plan. The initial state must
+        be extrapolated with constant acceleration from the start time.
+        """
+
+        trajectory = qt.QuinticTrajectory(2.0, velocity=1.0, start_time=3.0)
+
+        np.testing.assert_allclose(trajectory.evaluate(0.0), [2.0, 1.0, 0.0])
+        np.testing.assert_allclose(trajectory.evaluate(5.0), [4.0, 1.0, 0.0])
+
+        trajectory = qt.QuinticTrajectory(2.0, velocity=1.0, acceleration=-0.5, start_time=3.0)
+        np.testing.assert_allclose(trajectory.evaluate(5.0), [3.0, 0.0, -0.5])
+
+        trajectory.plan(0.0, 4.0)
+        np.testing.assert_allclose(trajectory.evaluate(3.0), [2.0, 1.0, -0.5])
+
+    def test_replan_is_continuous(self):
+        """Unit test for QuinticTrajectory.replan(...). The state must be continuous
+        across a setpoint change mid-move.
+        """
+
+        trajectory = qt.QuinticTrajectory(0.0)
+        trajectory.plan(10.0, 10.0, start_time=0.0)
+        before = np.array(trajectory.evaluate(4.0))
+
+        trajectory.replan(4.0, -3.0, 6.0)
+
+        np.testing.assert_allclose(trajectory.evaluate(4.0), before, atol=1e-9)
+        np.testing.assert_allclose(trajectory.evaluate(10.0), [-3.0, 0.0, 0.0], atol=1e-9)
+
+    def test_stream(self):
+        """Unit test for QuinticTrajectory.stream(...). The same buffer is yielded every
+        sample, and replanning takes effect from the next sample.
+        """
+
+        trajectory = qt.QuinticTrajectory([0.0, 1.0])
+        trajectory.plan([1.0, 2.0], 1.0, start_time=0.0)
+        samples = trajectory.stream(10.0)
+
+        first = next(samples)
+        self.assertIs(next(samples), first)
+        np.testing.assert_allclose(first, np.array(trajectory.evaluate(0.1)))
+
+        trajectory.replan(0.1, [0.0, 0.0], 2.0)
+        np.testing.assert_allclose(next(samples), np.array(trajectory.evaluate(0.2)))
+
+
+class TestWaypointTrajectoryMethods(unittest.TestCase):
+    """Unit test class for the waypoint trajectory methods."""
+
+    def test_passes_waypoints(self):
+        """Unit test for WaypointTrajectory.evaluate(...), at the waypoints and
+        halfway along a segment.
+        """
+
+        waypoints = [[0.0, 0.0, 0.0], [10.0, 0.0, 0.5], [10.0, 20.0, -0.5]]
+        trajectory = wt.WaypointTrajectory(waypoints, durations=[10.0, 20.0], start_time=5.0)
+
+        position, velocity, _ = trajectory.evaluate(trajectory.segment_times)
+
+        np.testing.assert_allclose(position.T, waypoints, atol=1e-12)
+        np.testing.assert_allclose(velocity, 0.0, atol=1e-12)
+        np.testing.assert_allclose(trajectory.evaluate(10.0)[0], [5.0, 0.0, 0.25])
+        np.testing.assert_allclose(trajectory.evaluate(100.0)[0], waypoints[-1])
+
+    def test_heading_shortest_way(self):
+        """Unit test for WaypointTrajectory.evaluate(...), turning across +-pi."""
+
+        trajectory = wt.WaypointTrajectory([[0.0, 0.0, 3.0], [0.0, 0.0, -3.0]], durations=10.0)
+
+        position, velocity, _ = trajectory.evaluate(np.linspace(0.0, 10.0, 11))
+
+        self.assertTrue(np.all(velocity[2] >= 0.0))
+        self.assertTrue(np.all(np.abs(position[2]) >= 3.0 - 1e-12))
+        self.assertAlmostEqual(position[2, 5], np.pi)
+
+    def test_limits(self):
+        """Unit test for WaypointTrajectory(...), with speed and acceleration limits."""
+
+        trajectory = wt.WaypointTrajectory([[0.0, 0.0, 0.0], [30.0, 40.0, 0.0], [30.0, 41.0, 0.0]],
+                                           max_speed=2.0, max_acceleration=1.0)
+
+        _, velocity, acceleration = trajectory.evaluate(np.linspace(0.0, trajectory.end_time, 10001))
+
+        self.assertAlmostEqual(trajectory.durations[0], 1.875 * 50.0 / 2.0)
+        self.assertLessEqual(np.hypot(velocity[0], velocity[1]).max(), 2.0 + 1e-9)
+        self.assertLessEqual(np.hypot(acceleration[0], acceleration[1]).max(), 1.0 + 1e-9)
+
+    def test_no_duration(self):
+        """Unit test for WaypointTrajectory(...), with neither durations nor limits."""
+
+        self.assertRaises(ValueError, wt.WaypointTrajectory, [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]])
+
+
+if __name__ == '__main__':
+    unittest.main()
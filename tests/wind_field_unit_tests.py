@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the coherent wind field."""
+
+import unittest
+import numpy as np
+from pymarcyb.util.enumerations import WindSpectrumType
+from pymarcyb.util.wind import wind_spectrum as ws
+from pymarcyb.util.wind.wind_field import WindField
+
+
+class TestWindFieldMethods(unittest.TestCase):
+    """Unit test class for the wind field methods."""
+
+    def setUp(self):
+        self.points = np.array([[0.0, 0.0, 20.0], [150.0, 0.0, 20.0], [0.0, 30.0, 40.0]])
+
+    def test_variance(self):
+        """Unit test for generate(). The variance at each point must match the point spectrum."""
+
+        field = WindField(self.points, 15.0, 2**14, 0.25)
+        gusts = field.generate(1)
+        expected = np.sum(ws.harris_batch(15.0, field.frequencies[1:-1])) * field.frequencies[1]
+
+        self.assertEqual(gusts.shape, (3, 2**14))
+        np.testing.assert_allclose(gusts.mean(axis=1), 0.0, atol=1e-9)
+        np.testing.assert_allclose(gusts.var(axis=1), expected, rtol=0.1)
+
+    def test_coherence(self):
+        """Unit test for the coherence between two points, estimated over many realizations,
+        compared with Davenport's coherence.
+        """
+
+        for method in ("cholesky", "eigen"):
+            field = WindField(self.points[:2], 15.0, 256, 0.5, spectrum_type=WindSpectrumType.davenport,
+                              method=method)
+            spectra = np.array([np.fft.rfft(field.generate(seed)) for seed in range(400)])
+
+            k = np.arange(1, 6)
+            cross = np.abs((spectra[:, 0, k] * spectra[:, 1, k].conj()).mean(axis=0))
+            auto = np.sqrt((np.abs(spectra[:, 0, k])**2).mean(axis=0) * (np.abs(spectra[:, 1, k])**2).mean(axis=0))
+            expected = np.exp(-field.frequencies[k] * 3.0 * 150.0 / 15.0)
+
+            np.testing.assert_allclose(cross / auto, expected, atol=0.07)
+
+    def test_reproducible(self):
+        """Unit test for generate() with the same seed. The series must be the same, and differ
+        with another seed.
+        """
+
+        field = WindField(self.points, 10.0, 512, 0.5)
+
+        np.testing.assert_array_equal(field.generate(7), field.generate(7))
+        self.assertFalse(np.allclose(field.generate(7), field.generate(8)))
+
+    def test_stream(self):
+        """Unit test for stream(). The chunks must add up to the record length, and the crossfades
+        must keep the variance.
+        """
+
+        field = WindField(self.points, 15.0, 1024, 0.5)
+        chunks = list(field.stream(20000, rng=3))
+        record = np.concatenate(chunks, axis=1)
+
+        self.assertEqual(record.shape, (3, 20000))
+        self.assertTrue(all(chunk.shape[1] == 1024 - 128 for chunk in chunks[:-1]))
+
+        blocks = np.concatenate([field.generate(seed) for seed in range(20)], axis=1)
+        np.testing.assert_allclose(record.var(axis=1), blocks.var(axis=1), rtol=0.2)
+
+    def test_stream_overlap(self):
+        """Unit test for stream(), with no overlap, the chunk lengths for legal overlaps, and illegal overlaps."""
+
+        field = WindField(self.points, 15.0, 256, 0.5)
+        record = np.concatenate(list(field.stream(1000, rng=3, n_overlap=0)), axis=1)
+
+        np.testing.assert_array_equal(record[:, :256], field.generate(np.random.default_rng(3)))
+        for n_overlap in (0, 32, 100, 128):
+            n_step = 256 - n_overlap
+            lengths = [chunk.shape[1] for chunk in field.stream(1000, rng=3, n_overlap=n_overlap)]
+            self.assertEqual(lengths, [n_step] * (1000 // n_step) + [1000 % n_step] * (1000 % n_step > 0))
+        for n_overlap in (-1, 129, 200, 256, 300):
+            self.assertRaises(ValueError, field.stream, 1000, n_overlap=n_overlap)
+
+    def test_coincident_points(self):
+        """Unit test for coincident points. Must raise ValueError with Cholesky, and give identical
+        series with the eigen decomposition.
+        """
+
+        points = np.array([[0.0, 0.0, 20.0], [0.0, 0.0, 20.0]])
+
+        with self.assertRaises(ValueError):
+            WindField(points, 15.0, 256, 0.5)
+        with self.assertRaises(ValueError):
+            WindField(points, 15.0, 256, 0.5, method="svd")
+
+        gusts = WindField(points, 15.0, 256, 0.5, method="eigen").generate(0)
+        np.testing.assert_allclose(gusts[0], gusts[1], atol=1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the wind functions."""
+
+import os
+import tempfile
+import unittest
+import numpy as np
+from pymarcyb.util.wind import wind_coefficients as wc
+from pymarcyb.util.wind import wind_forces as wf
+from pymarcyb.util.wind import wind_load_derivatives as wld
+from pymarcyb.util.wind import wind_spectrum as ws
+from pymarcyb.util.wind.strip_wind_loads import StripWindLoads
+from pymarcyb.util.wind.wind_coefficient_fit import WindCoefficientFit
+from pymarcyb.util.enumerations import CoefficientType
+
+
+class TestWindMethods(unittest.TestCase):
+    """Unit test class for the wind methods."""
+
+    def setUp(self):
+        """Setting up for the test."""
+
+        self.blendermann_parameters = {'frontal_area': 530.0, 'lateral_area': 1500.0, 'Loa': 107.5,
+                                       's_L': 11.5, 'vessel_type': "Offshore supply vessel"}
+        self.isherwood_parameters = {'frontal_area': 530.0, 'lateral_area': 1500.0, 'Loa': 107.5,
+                                     's_L': 11.5, 'coeffs': CoefficientType.isherwood,
+                                     'superstructure_area': 1500.0/9.0, 'breadth': 35.0,
+                                     'S': 107.5, 'masts': 1}
+        self.directions = np.linspace(0.0, 2 * np.pi, 37)
+
+    def test_batch_blendermann(self):
+        """Unit test for wind_forces_and_moment_batch(...) with Blendermann,
+        compared with wind_forces_and_moment(...).
+        """
+
+        forces = wf.wind_forces_and_moment_batch(10.0, self.directions, vessel_heading=0.3,
+                                                 **self.blendermann_parameters)
+
+        for i, direction in enumerate(self.directions):
+            expected = wf.wind_forces_and_moment(10.0, direction, vessel_heading=0.3,
+                                                 **self.blendermann_parameters)
+            np.testing.assert_allclose(forces[:, i], np.asarray(expected).ravel(), atol=1e-9)
+
+    def test_batch_isherwood(self):
+        """Unit test for wind_forces_and_moment_batch(...) with Isherwood,
+        compared with wind_forces_and_moment(...).
+        """
+
+        forces = wf.wind_forces_and_moment_batch(10.0, self.directions, **self.isherwood_parameters)
+
+        for i, direction in enumerate(self.directions):
+            expected = wf.wind_forces_and_moment(10.0, direction, **self.isherwood_parameters)
+            np.testing.assert_allclose(forces[:, i], np.asarray(expected).ravel(), atol=1e-9)
+
+    def test_batch_missing_parameters(self):
+        """Unit test for wind_forces_and_moment_batch(...) without a vessel type.
+        Checking that an error is raised.
+        """
+
+        with self.assertRaises(ValueError):
+            wf.wind_forces_and_moment_batch(10.0, self.directions, 530.0, 1500.0, 107.5, 11.5)
+
+
+class TestWindCoefficientFitMethods(unittest.TestCase):
+    """Unit test class for the Fourier series fits of the wind coefficients."""
+
+    def setUp(self):
+        """Setting up for the test."""
+
+        self.blendermann_vessel = ("Offshore supply vessel", 530.0, 1500.0, 107.5, 11.5)
+        self.isherwood_vessel = (530.0, 1500.0, 1500.0/9.0, 107.5, 35.0, 107.5, 11.5, 1)
+        self.angles = np.linspace(0.0, 2 * np.pi, 73)
+
+    def test_exact_series(self):
+        """Unit test for from_samples(...) with samples of a series of the same order. The series
+        must be recovered, with exact derivatives.
+        """
+
+        angles = np.linspace(0.0, 2 * np.pi, 40, endpoint=False)
+        C_X = 0.1 + 0.5 * np.cos(angles) - 0.05 * np.cos(3 * angles)
+        C_Y = -0.8 * np.sin(angles) + 0.1 * np.sin(2 * angles)
+        C_N = -0.1 * np.sin(2 * angles) + 0.02 * np.cos(angles)
+
+        fit = WindCoefficientFit.from_samples(angles, C_X, C_Y, C_N, order=3)
+
+        np.testing.assert_allclose(fit.max_error, 0.0, atol=1e-12)
+        np.testing.assert_allclose(fit.cosine_coefficients[0], [0.1, 0.5, 0.0, -0.05], atol=1e-12)
+        np.testing.assert_allclose(fit.sine_coefficients[1], [0.0, -0.8, 0.1, 0.0], atol=1e-12)
+
+        dC_X, dC_Y, dC_N = fit.derivatives(self.angles)
+        np.testing.assert_allclose(dC_X, -0.5 * np.sin(self.angles) + 0.15 * np.sin(3 * self.angles), atol=1e-12)
+        np.testing.assert_allclose(dC_Y, -0.8 * np.cos(self.angles) + 0.2 * np.cos(2 * self.angles), atol=1e-12)
+        np.testing.assert_allclose(dC_N, -0.2 * np.cos(2 * self.angles) - 0.02 * np.sin(self.angles), atol=1e-12)
+
+    def test_isherwood(self):
+        """Unit test for from_isherwood(...). The fit must be close to the tabulated coefficients,
+        better with a higher order, and mirrored to the port side.
+        """
+
+        low = WindCoefficientFit.from_isherwood(*self.isherwood_vessel, order=4)
+        high = WindCoefficientFit.from_isherwood(*self.isherwood_vessel, order=16)
+
+        self.assertTrue(np.all(high.rms_error < low.rms_error))
+        self.assertLess(high.max_error.max(), 0.1)
+
+        angles = np.radians(np.arange(0.0, 181.0, 10.0))
+        np.testing.assert_allclose(high.evaluate(angles), wc.isherwood(*self.isherwood_vessel, angles), atol=0.1)
+
+        C_X, C_Y, C_N = high.evaluate(angles)
+        C_X_port, C_Y_port, C_N_port = high.evaluate(-angles)
+        np.testing.assert_allclose(C_X_port, C_X, atol=1e-12)
+        np.testing.assert_allclose(C_Y_port, -C_Y, atol=1e-12)
+        np.testing.assert_allclose(C_N_port, -C_N, atol=1e-12)
+
+    def test_derivatives(self):
+        """Unit test for derivatives(...), compared with central differences of evaluate(...)."""
+
+        fit = WindCoefficientFit.from_blendermann(*self.blendermann_vessel)
+        h = 1e-6
+
+        expected = (np.array(fit.evaluate(self.angles + h)) - np.array(fit.evaluate(self.angles - h))) / (2 * h)
+        np.testing.assert_allclose(fit.derivatives(self.angles), expected, atol=1e-6)
+
+    def test_table(self):
+        """Unit test for from_table(...) with a CSV file from 0 to 180 degrees, which must be mirrored."""
+
+        angles = np.arange(0.0, 181.0, 15.0)
+        table = np.column_stack(wc.isherwood(*self.isherwood_vessel, np.radians(angles)))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "coefficients.csv")
+            np.savetxt(path, np.column_stack((angles, table)), delimiter=",", header="angle,C_X,C_Y,C_N",
+                       comments="")
+            fit = WindCoefficientFit.from_table(path, order=6)
+
+        self.assertEqual(fit.order, 6)
+        self.assertEqual(fit.rms_error.shape, (3,))
+        np.testing.assert_allclose(fit.evaluate(np.radians(-90.0))[1], -fit.evaluate(np.radians(90.0))[1])
+
+        with self.assertRaises(ValueError):
+            WindCoefficientFit.from_table(np.column_stack((angles, table)), order=13)
+
+    def test_wind_forces(self):
+        """Unit test for wind_forces_and_moment_batch(...) with a Fourier fit, compared with Isherwood."""
+
+        fit = WindCoefficientFit.from_isherwood(*self.isherwood_vessel, order=16)
+        directions = np.linspace(0.0, np.pi, 19)
+
+        parameters = {'frontal_area': 530.0, 'lateral_area': 1500.0, 'Loa': 107.5, 's_L': 11.5}
+        forces = wf.wind_forces_and_moment_batch(10.0, directions, coeffs=CoefficientType.fourier_fit,
+                                                 coefficient_fit=fit, **parameters)
+        expected = wf.wind_forces_and_moment_batch(10.0, directions, coeffs=CoefficientType.isherwood,
+                                                   superstructure_area=1500.0/9.0, breadth=35.0, S=107.5, masts=1,
+                                                   **parameters)
+
+        np.testing.assert_allclose(forces, expected, atol=0.1 * np.abs(expected).max())
+
+        with self.assertRaises(ValueError):
+            wf.wind_forces_and_moment_batch(10.0, directions, coeffs=CoefficientType.fourier_fit, **parameters)
+
+
+class TestWindLoadDerivativeMethods(unittest.TestCase):
+    """Unit test class for the wind load derivatives and the optimal heading."""
+
+    def setUp(self):
+        """Setting up for the test."""
+
+        self.blendermann_parameters = {'frontal_area': 530.0, 'lateral_area': 1500.0, 'Loa': 107.5,
+                                       's_L': 11.5, 'vessel_type': "Offshore supply vessel"}
+        self.isherwood_parameters = {'frontal_area': 530.0, 'lateral_area': 1500.0, 'Loa': 107.5,
+                                     's_L': 11.5, 'coeffs': CoefficientType.isherwood,
+                                     'superstructure_area': 1500.0/9.0, 'breadth': 35.0,
+                                     'S': 107.5, 'masts': 1}
+        # Away from the jumps of the coefficients at every 10 and 90 degrees
+        self.headings = np.radians(np.arange(-175.0, 180.0, 10.0) + 2.5)
+
+    def test_coefficient_derivatives(self):
+        """Unit test for blendermann_derivatives(...) and isherwood_derivatives(...), compared with
+        central differences.
+        """
+
+        angles = np.radians(np.arange(0.0, 360.0, 10.0) + 2.5)
+        h = 1e-7
+        vessels = [(wc.blendermann, wc.blendermann_derivatives, ("Offshore supply vessel", 530.0, 1500.0, 107.5, 11.5)),
+                   (wc.isherwood, wc.isherwood_derivatives, (530.0, 1500.0, 1500.0/9.0, 107.5, 35.0, 107.5, 11.5, 1))]
+
+        for coefficients, derivatives, vessel in vessels:
+            expected = (np.array(coefficients(*vessel, angles + h)) - np.array(coefficients(*vessel, angles - h))) / \
+                (2 * h)
+            np.testing.assert_allclose(derivatives(*vessel, angles), expected, atol=1e-6)
+
+    def test_load_derivatives(self):
+        """Unit test for wind_load_derivatives(...). The loads must match wind_forces_and_moment_batch(...),
+        and the derivatives central differences, also with a moving vessel.
+        """
+
+        h = 1e-6
+        for parameters in (self.blendermann_parameters, self.isherwood_parameters):
+            conditions = {'wind_direction': 0.4, 'vessel_speed_surge': 0.5, 'vessel_speed_sway': -0.2, **parameters}
+            loads, d_heading, d_wind_speed = wld.wind_load_derivatives(12.0, vessel_heading=self.headings,
+                                                                       **conditions)
+
+            expected = wf.wind_forces_and_moment_batch(12.0, vessel_heading=self.headings, **conditions)
+            np.testing.assert_allclose(loads, expected, atol=1e-9)
+
+            expected = (wf.wind_forces_and_moment_batch(12.0, vessel_heading=self.headings + h, **conditions) -
+                        wf.wind_forces_and_moment_batch(12.0, vessel_heading=self.headings - h, **conditions)) / (2 * h)
+            np.testing.assert_allclose(d_heading, expected, atol=1e-4 * np.abs(expected).max())
+
+            expected = (wf.wind_forces_and_moment_batch(12.0 + h, vessel_heading=self.headings, **conditions) -
+                        wf.wind_forces_and_moment_batch(12.0 - h, vessel_heading=self.headings, **conditions)) / (2 * h)
+            np.testing.assert_allclose(d_wind_speed, expected, atol=1e-4 * np.abs(expected).max())
+
+    def test_optimal_heading_thrust(self):
+        """Unit test for optimal_heading(...) with the thrust objective. The thrust measure must be
+        at least as low as the lowest over headings every 0.1 degree.
+        """
+
+        wind_speeds = np.array([5.0, 12.0, 20.0, 25.0])
+        wind_directions = np.array([-2.0, 0.3, 1.2, 3.0])
+        headings = np.linspace(-np.pi, np.pi, 3600, endpoint=False)
+        weights = np.array([1.0, 1.0, 1.0 / 107.5**2])
+
+        for parameters in (self.blendermann_parameters, self.isherwood_parameters):
+            optimal_headings, loads = wld.optimal_heading(wind_speeds, wind_directions, **parameters)
+
+            self.assertEqual(optimal_headings.shape, (4,))
+            self.assertTrue(np.all(np.abs(optimal_headings) <= np.pi))
+            np.testing.assert_allclose(loads, wf.wind_forces_and_moment_batch(
+                wind_speeds, wind_directions, vessel_heading=optimal_headings, **parameters), atol=1e-9)
+
+            brute_force = wf.wind_forces_and_moment_batch(wind_speeds[:, np.newaxis],
+                                                          wind_directions[:, np.newaxis],
+                                                          vessel_heading=headings, **parameters)
+            expected = np.einsum('i,ijk->jk', weights, brute_force**2).min(axis=1)
+            self.assertTrue(np.all(weights @ loads**2 <= expected * (1.0 + 1e-9)))
+
+    def test_optimal_heading_yaw_moment(self):
+        """Unit test for optimal_heading(...) with the yaw moment objective. The yaw moment must be zero,
+        and the equilibrium stable.
+        """
+
+        wind_directions = np.linspace(-3.0, 3.0, 7)
+        optimal_headings, loads = wld.optimal_heading(15.0, wind_directions, objective="yaw_moment",
+                                                      **self.blendermann_parameters)
+
+        np.testing.assert_allclose(loads[2], 0.0, atol=1e-6)
+        _, d_heading, _ = wld.wind_load_derivatives(15.0, wind_directions, vessel_heading=optimal_headings,
+                                                    **self.blendermann_parameters)
+        self.assertTrue(np.all(d_heading[2] < 0.0))
+
+        with self.assertRaises(ValueError):
+            wld.optimal_heading(15.0, wind_directions, objective="roll", **self.blendermann_parameters)
+
+
+class TestStripWindLoadMethods(unittest.TestCase):
+    """Unit test class for the wind loads with height bands."""
+
+    def setUp(self):
+        """Setting up for the test."""
+
+        self.model = StripWindLoads([4.0, 12.0, 22.0], [200.0, 230.0, 100.0],
+                                    [3.0, 9.0, 18.0, 30.0], [600.0, 500.0, 300.0, 100.0])
+        self.parameters = {'Loa': 107.5, 's_L': 11.5, 'vessel_type': "Offshore supply vessel"}
+        self.directions = np.linspace(0.0, 2 * np.pi, 37)
+
+    def test_U10_to_Uz_batch(self):
+        """Unit test for U10_to_Uz_batch(...), compared with U10_to_Uz(...)."""
+
+        speeds = np.array([2.0, 10.0, 25.0])
+        heights = np.array([3.0, 10.0, 40.0])
+        result = ws.U10_to_Uz_batch(speeds[:, np.newaxis], 0.0025, heights)
+        expected = [[ws.U10_to_Uz(U_10, 0.0025, z) for z in heights] for U_10 in speeds]
+
+        np.testing.assert_allclose(result, expected)
+
+    def test_strip_sum(self):
+        """Unit test for wind_forces_and_moment_batch(...), compared with the sum over the bands
+        of the loads with the wind speed at the height of each band.
+        """
+
+        speeds = np.array([5.0, 15.0, 30.0])
+        result = self.model.wind_forces_and_moment_batch(speeds[:, np.newaxis], self.directions, **self.parameters)
+
+        lumped = wf.wind_forces_and_moment_batch(speeds[:, np.newaxis], self.directions, self.model.frontal_area,
+                                                 self.model.lateral_area, **self.parameters)
+        frontal_speeds, lateral_speeds = self.model.band_wind_speeds(speeds)
+        frontal_factor = (self.model.frontal_areas * frontal_speeds**2).sum(axis=-1) / \
+            (self.model.frontal_area * speeds**2)
+        lateral_factor = (self.model.lateral_areas * lateral_speeds**2).sum(axis=-1) / \
+            (self.model.lateral_area * speeds**2)
+
+        np.testing.assert_allclose(result[0], lumped[0] * frontal_factor[:, np.newaxis])
+        np.testing.assert_allclose(result[1:], lumped[1:] * lateral_factor[:, np.newaxis])
+
+    def test_single_band(self):
+        """Unit test for a single band at 10 m. Must be the same as the lumped model."""
+
+        model = StripWindLoads([10.0], [530.0], [10.0], [1500.0])
+        result = model.wind_forces_and_moment_batch(15.0, self.directions, **self.parameters)
+        expected = wf.wind_forces_and_moment_batch(15.0, self.directions, 530.0, 1500.0, **self.parameters)
+
+        np.testing.assert_allclose(result, expected)
+
+    def test_illegal_height(self):
+        """Unit test for bands at or below the water line. Must raise ValueError."""
+
+        with self.assertRaises(ValueError):
+            StripWindLoads([0.0, 10.0], [100.0, 100.0], [10.0], [1500.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the sliding-window statistics."""
+
+import unittest
+import numpy as np
+from pymarcyb.util.filters.window_statistics import WindowStatistics, window_statistics_batch
+
+
+def brute_force(speeds, directions, i, n_samples):
+    """Statistics of the trailing window ending at sample i, calculated directly."""
+
+    window = slice(max(0, i - n_samples + 1), i + 1)
+    return {"mean": speeds[window].mean(), "std": speeds[window].std(),
+            "direction": np.arctan2(np.sin(directions[window]).sum(), np.cos(directions[window]).sum()),
+            "maximum": speeds[window].max(), "minimum": speeds[window].min()}
+
+
+class TestWindowStatisticsMethods(unittest.TestCase):
+    """Unit test class for the sliding-window statistics."""
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.sample_rate = 2.0
+        self.speeds = 12.0 + rng.normal(0.0, 1.5, 1000)
+        # Around north, so the circular mean has to handle the wrap at +-pi
+        self.directions = np.pi + rng.normal(0.0, 0.3, 1000)
+
+    def test_streaming(self):
+        """Unit test for WindowStatistics. Must match the statistics calculated directly over
+        each window, also past several wraps of the ring buffers.
+        """
+
+        statistics = WindowStatistics(window_lengths=(3.0, 60.0, 100.0), sample_rate=self.sample_rate)
+
+        for i, (speed, direction) in enumerate(zip(self.speeds, self.directions)):
+            statistics.update(speed, direction)
+            if i % 37 == 0 or i == len(self.speeds) - 1:
+                for window_length in statistics.window_lengths:
+                    n_samples = int(window_length * self.sample_rate)
+                    expected = brute_force(self.speeds, self.directions, i, n_samples)
+                    result = statistics.statistics(window_length)
+                    for name in ("mean", "std", "maximum", "minimum"):
+                        self.assertAlmostEqual(result[name], expected[name], places=9)
+                    self.assertAlmostEqual(np.cos(result["direction"] - expected["direction"]), 1.0, places=9)
+
+    def test_batch(self):
+        """Unit test for window_statistics_batch(). Must match the streaming statistics at every sample."""
+
+        for window_length in (0.5, 3.0, 60.0):
+            statistics = WindowStatistics(window_lengths=(window_length,), sample_rate=self.sample_rate)
+            results = window_statistics_batch(self.speeds, self.directions, window_length, self.sample_rate)
+
+            for i, (speed, direction) in enumerate(zip(self.speeds, self.directions)):
+                statistics.update(speed, direction)
+                expected = statistics.statistics(window_length)
+                for name in ("mean", "std", "maximum", "minimum", "direction"):
+                    self.assertAlmostEqual(results[name][i], expected[name], places=8)
+
+    def test_batch_empty(self):
+        """Unit test for window_statistics_batch(), with an empty log. Must return empty statistics."""
+
+        for window_length in (0.5, 3.0):
+            results = window_statistics_batch([], [], window_length, self.sample_rate)
+
+            for name in ("mean", "std", "maximum", "minimum", "direction"):
+                self.assertEqual(results[name].shape, (0,))
+
+    def test_illegal(self):
+        """Unit test for illegal windows and statistics without samples. Must raise ValueError."""
+
+        with self.assertRaises(ValueError):
+            WindowStatistics(window_lengths=(0.1,), sample_rate=1.0)
+
+        statistics = WindowStatistics(window_lengths=(3.0,), sample_rate=1.0)
+        with self.assertRaises(ValueError):
+            statistics.mean(3.0)
+
+        statistics.update(10.0, 0.0)
+        with self.assertRaises(ValueError):
+            statistics.mean(60.0)
+
+        with self.assertRaises(ValueError):
+            window_statistics_batch(self.speeds, self.directions, 0.1, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
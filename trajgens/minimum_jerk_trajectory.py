@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 """Minimum jerk trajectory generator."""
 
+import numpy as np
+
 
 def mjtg(current, setpoint, frequency, move_time):
     """Minumum jerk trajectory generator.
@@ -39,3 +41,116 @@ def mjtg(current, setpoint, frequency, move_time):
              + 30.0 * (time)**4.0 * (1.0/timefreq)**5))
 
     return trajectory, trajectory_derivative
+
+
+def mjtg_array(current, setpoint, frequency, move_time, dtype=np.float64):
+    """Minimum jerk trajectory generator, returning arrays.
+
+    Unlike mjtg(), the first and the final sample are included, and the
+    acceleration is returned as well. Several axes (e.g. surge, sway and
+    heading) can be generated at once by giving arrays for current and
+    setpoint.
+
+    Args:
+        current (float or array of floats)  -- the current value of each axis
+        setpoint (float or array of floats) -- the wanted value of each axis
+        frequency (float)                   -- the frequency of the system
+        move_time (float)                   -- how much time to use to get from
+                                               current to setpoint
+        dtype (np.dtype)                    -- float32 or float64, the precision of the
+                                               calculation. With float32 the trajectory is
+                                               within 1e-5 of float64, relative to the largest
+                                               of current and setpoint (default: float64)
+
+    Returns:
+        position (np.ndarray)               -- the trajectory, shape (..., n_samples)
+        velocity (np.ndarray)               -- the derivative of the trajectory
+        acceleration (np.ndarray)           -- the second derivative of the trajectory
+
+    Raises:
+        ValueError                          -- if move_time * frequency is less than one sample
+    """
+
+    timefreq = int(move_time * frequency)
+    if timefreq < 1:
+        raise ValueError("Illegal move time and frequency, less than one sample: {0}".format(move_time * frequency))
+
+    duration = np.dtype(dtype).type(timefreq / frequency)
+
+    current = np.asarray(current, dtype=dtype)[..., np.newaxis]
+    distance = np.asarray(setpoint, dtype=dtype)[..., np.newaxis] - current
+
+    s, ds, dds = minimum_jerk_profile(np.arange(timefreq + 1, dtype=dtype) / timefreq)
+
+    return current + distance * s, distance * ds / duration, distance * dds / duration**2
+
+
+def minimum_jerk_profile(tau):
+    """Return the normalized minimum jerk profile and its derivatives,
+    evaluated in Horner form.
+
+    Args:
+        tau (array of floats)   -- normalized time, from 0 to 1
+
+    Returns:
+        s (np.ndarray)          -- normalized position, from 0 to 1
+        ds (np.ndarray)         -- derivative of s with respect to tau
+        dds (np.ndarray)        -- second derivative of s with respect to tau
+    """
+
+    s = tau**3 * (10.0 + tau * (-15.0 + 6.0 * tau))
+    ds = tau**2 * (30.0 + tau * (-60.0 + 30.0 * tau))
+    dds = tau * (60.0 + tau * (-180.0 + 120.0 * tau))
+
+    return s, ds, dds
+
+
+class MinimumJerkTrajectory(object):
+    """Minimum jerk trajectory that can be evaluated at any time,
+    without generating the whole series.
+    """
+
+    def __init__(self, current, setpoint, move_time, start_time=0.0):
+        """Set up the trajectory.
+
+        Args:
+            current (float or array of floats)  -- the current value of each axis
+            setpoint (float or array of floats) -- the wanted value of each axis
+            move_time (float)                   -- how much time to use to get from
+                                                   current to setpoint
+            start_time (float)                  -- time the move starts (default: 0.0)
+        """
+
+        # A scalar current or setpoint applies to all axes
+        self.current, self.setpoint = (np.array(values) for values in np.broadcast_arrays(
+            np.asarray(current, dtype=float), np.asarray(setpoint, dtype=float)))
+        self.move_time = float(move_time)
+        self.start_time = float(start_time)
+        self._distance = self.setpoint - self.current
+
+    @property
+    def end_time(self):
+        """Time the move ends."""
+
+        return self.start_time + self.move_time
+
+    def evaluate(self, time):
+        """Return the trajectory at one or more times. Before the start the
+        trajectory is at current, and after the end it is at setpoint.
+
+        Args:
+            time (float or array of floats)     -- the times to evaluate at
+
+        Returns:
+            position (np.ndarray)               -- position, shape axes + time shape
+            velocity (np.ndarray)               -- velocity
+            acceleration (np.ndarray)           -- acceleration
+        """
+
+        tau = np.clip((np.asarray(time, dtype=float) - self.start_time) / self.move_time, 0.0, 1.0)
+        s, ds, dds = minimum_jerk_profile(tau)
+
+        distance = self._distance.reshape(self._distance.shape + (1,) * tau.ndim)
+        current = self.current.reshape(distance.shape)
+
+        return current + distance * s, distance * ds / self.move_time, distance * dds / self.move_time**2
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""Quintic trajectory generator, with position, velocity and acceleration given at
+both ends of the move.
+
+Used for replanning a move that is already underway, e.g. when the setpoint is
+changed before the vessel has reached the previous one.
+"""
+
+from functools import lru_cache
+import numpy as np
+
+
+@lru_cache(maxsize=256)
+def boundary_inverse(duration):
+    """Return the matrix that maps boundary conditions to polynomial coefficients,
+    for a given move duration. Cached, so each duration is only inverted once.
+
+    The coefficients c of p(t) = c_0 + c_1 t + ... + c_5 t^5 are given by
+    c = K [p_0, v_0, a_0, p_f, v_f, a_f].
+
+    Args:
+        duration (float)    -- duration of the move in s
+
+    Returns:
+        K (np.ndarray)      -- the 6x6 matrix, read-only
+    """
+
+    T = float(duration)
+    boundary = np.array([[1.0, 0.0,   0.0,    0.0,       0.0,       0.0],
+                         [0.0, 1.0,   0.0,    0.0,       0.0,       0.0],
+                         [0.0, 0.0,   2.0,    0.0,       0.0,       0.0],
+                         [1.0,   T,  T**2,   T**3,      T**4,      T**5],
+                         [0.0, 1.0, 2 * T, 3 * T**2,  4 * T**3,  5 * T**4],
+                         [0.0, 0.0,   2.0,  6 * T,   12 * T**2, 20 * T**3]])
+
+    K = np.linalg.inv(boundary)
+    K.setflags(write=False)
+
+    return K
+
+
+class QuinticTrajectory(object):
+    """Quintic trajectory for one or more axes that can be replanned at any time."""
+
+    def __init__(self, position, velocity=0.0, acceleration=0.0, start_time=0.0):
+        """Set up the trajectory. Until the first plan, the given state is extrapolated with
+        constant acceleration, as after the end of a move, so with the default zero acceleration
+        the axes keep their velocity. Before start_time the state is held.
+
+        Args:
+            position (float or array of floats)     -- the current position of each axis
+            velocity (float or array of floats)     -- the current velocity of each axis (default: 0.0)
+            acceleration (float or array of floats) -- the current acceleration of each axis (default: 0.0)
+            start_time (float)                      -- the current time (default: 0.0)
+        """
+
+        position = np.asarray(position, dtype=float)
+        self._shape = position.shape
+        n_axes = position.size
+
+        self._boundary = np.zeros((6, n_axes))
+        self._coefficients = np.zeros((6, n_axes))
+        self._state = np.zeros((3, n_axes))
+        self._basis = np.zeros((3, 6))
+        self._basis[0, 0] = self._basis[1, 1] = 1.0
+        self._basis[2, 2] = 2.0
+
+        # Boundary conditions per axis, in the shape of the axes, sharing memory with _boundary
+        self._boundary_axes = self._boundary.reshape((6,) + self._shape)
+        self._boundary_axes[0] = position
+        self._boundary_axes[1] = velocity
+        self._boundary_axes[2] = acceleration
+
+        # A move of no duration, which evaluate_into() extrapolates from start_time
+        self._coefficients[:3] = self._boundary[:3]
+        self._coefficients[2] *= 0.5
+        self.start_time = float(start_time)
+        self.duration = 0.0
+
+    @property
+    def end_time(self):
+        """Time the current move ends."""
+
+        return self.start_time + self.duration
+
+    def plan(self, setpoint, duration, final_velocity=0.0, final_acceleration=0.0, start_time=None):
+        """Plan a move from the state at start_time to a new setpoint.
+
+        Args:
+            setpoint (float or array of floats)             -- the wanted position of each axis
+            duration (float)                                -- how much time to use for the move
+            final_velocity (float or array of floats)       -- the wanted final velocity (default: 0.0)
+            final_acceleration (float or array of floats)   -- the wanted final acceleration (default: 0.0)
+            start_time (float)                              -- time the move starts, the state of the
+                                                               current plan at that time is used as
+                                                               start state (default: None, the end of
+                                                               the current move)
+        """
+
+        if start_time is None:
+            start_time = self.end_time
+
+        self.evaluate_into(start_time, self._state)
+        self._boundary[:3] = self._state
+        self._boundary_axes[3] = setpoint
+        self._boundary_axes[4] = final_velocity
+        self._boundary_axes[5] = final_acceleration
+
+        self.start_time = float(start_time)
+        self.duration = float(duration)
+        self._solve()
+
+    def replan(self, time, setpoint, duration, final_velocity=0.0, final_acceleration=0.0):
+        """Plan a new move from the current state, e.g. when the setpoint changes mid-move.
+
+        Args:
+            time (float)                                    -- the current time
+            setpoint (float or array of floats)             -- the wanted position of each axis
+            duration (float)                                -- how much time to use for the move
+            final_velocity (float or array of floats)       -- the wanted final velocity (default: 0.0)
+            final_acceleration (float or array of floats)   -- the wanted final acceleration (default: 0.0)
+        """
+
+        self.plan(setpoint, duration, final_velocity=final_velocity, final_acceleration=final_acceleration,
+                  start_time=time)
+
+    def evaluate(self, time):
+        """Return the trajectory at a time. After the end of the move, the final
+        state is extrapolated with constant acceleration.
+
+        Args:
+            time (float)                -- the time to evaluate at
+
+        Returns:
+            position (np.ndarray)       -- position of each axis
+            velocity (np.ndarray)       -- velocity of each axis
+            acceleration (np.ndarray)   -- acceleration of each axis
+        """
+
+        state = np.empty((3, self._coefficients.shape[1]))
+        self.evaluate_into(time, state)
+
+        return state[0].reshape(self._shape), state[1].reshape(self._shape), state[2].reshape(self._shape)
+
+    def evaluate_into(self, time, out):
+        """Evaluate the trajectory at a time into a preallocated array, without allocating arrays.
+        The polynomial and its derivatives are evaluated as one product of a basis of powers
+        of time and the coefficients.
+
+        Args:
+            time (float)            -- the time to evaluate at
+            out (np.ndarray)        -- output array for position, velocity and acceleration,
+                                       shape (3, n_axes)
+        """
+
+        t = min(max(time - self.start_time, 0.0), self.duration)
+        overrun = max(time - self.start_time - self.duration, 0.0)
+        t2 = t * t
+        t3 = t2 * t
+
+        basis = self._basis
+        basis[0, 1], basis[0, 2], basis[0, 3], basis[0, 4], basis[0, 5] = t, t2, t3, t3 * t, t3 * t2
+        basis[1, 2], basis[1, 3], basis[1, 4], basis[1, 5] = 2.0 * t, 3.0 * t2, 4.0 * t3, 5.0 * t3 * t
+        basis[2, 3], basis[2, 4], basis[2, 5] = 6.0 * t, 12.0 * t2, 20.0 * t3
+
+        if overrun > 0.0:
+            half_overrun_squared = 0.5 * overrun**2
+            for k in range(1, 6):
+                basis[0, k] += overrun * basis[1, k] + half_overrun_squared * basis[2, k]
+                basis[1, k] += overrun * basis[2, k]
+
+        np.matmul(basis, self._coefficients, out=out)
+
+    def stream(self, frequency, start_time=None, out=None):
+        """Yield samples of the trajectory at a fixed rate, forever.
+
+        The same output array is updated in place and yielded for every sample, and
+        replanning between samples takes effect from the next sample.
+
+        Args:
+            frequency (float)           -- the sample rate in Hz
+            start_time (float)          -- time of the first sample (default: None, start of the move)
+            out (np.ndarray)            -- output array, shape (3, n_axes) (default: None, allocated once)
+
+        Yields:
+            state (np.ndarray)          -- position, velocity and acceleration of each axis, shape (3, n_axes)
+        """
+
+        if out is None:
+            out = np.empty((3, self._coefficients.shape[1]))
+        if start_time is None:
+            start_time = self.start_time
+
+        period = 1.0 / frequency
+        sample = 0
+
+        while True:
+            self.evaluate_into(start_time + sample * period, out)
+            yield out
+            sample += 1
+
+    def _solve(self):
+        """Solve for the polynomial coefficients from the boundary conditions."""
+
+        np.matmul(boundary_inverse(self.duration), self._boundary, out=self._coefficients)
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""Trajectory generator through several waypoints in north, east and heading.
+
+Each segment between two waypoints is a minimum jerk move, starting and stopping
+at the waypoints. The heading takes the shortest way around between the waypoints.
+"""
+
+from math import sqrt
+from pymarcyb.trajgens import minimum_jerk_trajectory as mjt
+from pymarcyb.util.kinematics import angle_transformation as at
+import numpy as np
+
+# Peak velocity and peak acceleration of a minimum jerk move, relative to
+# distance / move_time and distance / move_time^2.
+PEAK_VELOCITY_FACTOR = 1.875
+PEAK_ACCELERATION_FACTOR = 10.0 / sqrt(3.0)
+
+
+class WaypointTrajectory(object):
+    """Minimum jerk trajectory through waypoints in (north, east, heading)."""
+
+    def __init__(self, waypoints, durations=None, max_speed=None, max_acceleration=None,
+                 max_yaw_rate=None, max_yaw_acceleration=None, start_time=0.0):
+        """Set up the trajectory.
+
+        The duration of each segment is the longest of the given duration and the
+        durations needed to stay within the given limits.
+
+        Args:
+            waypoints (array of floats)     -- north and east in m and heading in radians of
+                                               each waypoint, shape (n_waypoints, 3)
+            durations (float or array)      -- duration of each segment in s (default: None)
+            max_speed (float)               -- maximum speed in m/s (default: None, no limit)
+            max_acceleration (float)        -- maximum acceleration in m/s^2 (default: None, no limit)
+            max_yaw_rate (float)            -- maximum yaw rate in rad/s (default: None, no limit)
+            max_yaw_acceleration (float)    -- maximum yaw acceleration in rad/s^2 (default: None, no limit)
+            start_time (float)              -- time the first segment starts (default: 0.0)
+        """
+
+        waypoints = np.array(waypoints, dtype=float).reshape(-1, 3)
+        if len(waypoints) < 2:
+            raise ValueError("At least two waypoints are needed.")
+
+        heading_change, _ = at.transform_to_pipi_array(np.diff(waypoints[:, 2]))
+
+        self.waypoints = waypoints
+        self._start = waypoints[:-1].copy()
+        self._distance = np.diff(waypoints, axis=0)
+        self._distance[:, 2] = heading_change
+
+        self.durations = self._segment_durations(durations, max_speed, max_acceleration,
+                                                 max_yaw_rate, max_yaw_acceleration)
+        self.start_time = float(start_time)
+        self.segment_times = self.start_time + np.concatenate(([0.0], np.cumsum(self.durations)))
+
+    @property
+    def n_segments(self):
+        """Number of segments."""
+
+        return len(self.durations)
+
+    @property
+    def end_time(self):
+        """Time the last segment ends."""
+
+        return self.segment_times[-1]
+
+    def evaluate(self, time):
+        """Return the trajectory at one or more times. Before the start the
+        trajectory is at the first waypoint, and after the end it is at the last.
+
+        Args:
+            time (float or array of floats)     -- the times to evaluate at
+
+        Returns:
+            position (np.ndarray)               -- north, east and heading in (-pi, pi],
+                                                   shape (3,) + time shape
+            velocity (np.ndarray)               -- the derivative of position
+            acceleration (np.ndarray)           -- the second derivative of position
+        """
+
+        time = np.asarray(time, dtype=float)
+        segment = np.clip(np.searchsorted(self.segment_times, time, side='right') - 1, 0, self.n_segments - 1)
+
+        duration = self.durations[segment]
+        tau = np.clip((time - self.segment_times[segment]) / duration, 0.0, 1.0)
+        s, ds, dds = mjt.minimum_jerk_profile(tau)
+
+        distance = np.moveaxis(self._distance[segment], -1, 0)
+        position = np.moveaxis(self._start[segment], -1, 0) + distance * s
+        position[2], _ = at.transform_to_pipi_array(position[2])
+
+        return position, distance * ds / duration, distance * dds / duration**2
+
+    def _segment_durations(self, durations, max_speed, max_acceleration, max_yaw_rate, max_yaw_acceleration):
+        """Return the duration of each segment, from the given durations and limits."""
+
+        n_segments = len(self._distance)
+        segment_durations = np.zeros(n_segments) if durations is None \
+            else np.broadcast_to(np.asarray(durations, dtype=float), (n_segments,)).copy()
+
+        length = np.hypot(self._distance[:, 0], self._distance[:, 1])
+        turn = np.abs(self._distance[:, 2])
+
+        if max_speed is not None:
+            segment_durations = np.maximum(segment_durations, PEAK_VELOCITY_FACTOR * length / max_speed)
+        if max_acceleration is not None:
+            segment_durations = np.maximum(segment_durations,
+                                           np.sqrt(PEAK_ACCELERATION_FACTOR * length / max_acceleration))
+        if max_yaw_rate is not None:
+            segment_durations = np.maximum(segment_durations, PEAK_VELOCITY_FACTOR * turn / max_yaw_rate)
+        if max_yaw_acceleration is not None:
+            segment_durations = np.maximum(segment_durations,
+                                           np.sqrt(PEAK_ACCELERATION_FACTOR * turn / max_yaw_acceleration))
+
+        if np.any(segment_durations <= 0.0):
+            raise ValueError("Every segment must have a duration, from durations or the limits.")
+
+        return segment_durations
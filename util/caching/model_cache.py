@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""On-disk cache of derived vessel model tables.
+
+Tables that are derived from the vessel parameters, like tabulated wind
+coefficients, thruster limits and spectra over a frequency grid, are the same
+every time a process starts. The cache stores them as .npy files, in one
+directory per entry, named by a hash of the table name, the parameters and the
+package version. Changing a parameter or upgrading the package gives a new key,
+so stale tables are never loaded.
+
+The tables are loaded memory-mapped and read-only, so the worker processes of a
+pool share the pages of the same files instead of building a copy each. An
+entry is written to a temporary directory and renamed into place, so readers
+never see half-written entries, and two processes building the same entry at
+once is harmless.
+
+When the cache grows past its size limit, the least recently used entries are
+removed.
+
+Example:
+    cache = ModelCache()
+    table = cache.wind_coefficient_table(CoefficientType.blendermann, 530.0, 1500.0, 107.5, 11.5,
+                                         vessel_type="Offshore supply vessel")
+"""
+
+from enum import Enum
+import hashlib
+import os
+import shutil
+import tempfile
+from pymarcyb import __version__
+from pymarcyb.util.enumerations import CoefficientType
+from pymarcyb.util.thrusters import power_to_force as p2f
+from pymarcyb.util.wind import wind_coefficient_fit as wcf
+from pymarcyb.util.wind import wind_coefficients as wc
+from pymarcyb.util.wind import wind_spectrum as ws
+import numpy as np
+
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "pymarcyb")
+DEFAULT_MAX_BYTES = 1024**3
+
+
+class ModelCache(object):
+    """Cache of named tables of arrays, keyed by their parameters."""
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES, version=__version__):
+        """Set up the cache.
+
+        Args:
+            directory (string)      -- the cache directory (default: None, the PYMARCYB_CACHE environment
+                                       variable if set, otherwise DEFAULT_DIRECTORY)
+            max_bytes (int)         -- the size limit of the cache in bytes (default: DEFAULT_MAX_BYTES)
+            version (string)        -- version that is part of every key (default: the package version)
+        """
+
+        if directory is None:
+            directory = os.environ.get("PYMARCYB_CACHE", DEFAULT_DIRECTORY)
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = version
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, name, parameters):
+        """Return the key of a table.
+
+        Args:
+            name (string)           -- the name of the table
+            parameters (dict)       -- the parameters the table is derived from: numbers, strings,
+                                       enums, arrays, wind coefficient fits, or lists and dicts of those
+
+        Returns:
+            key (string)            -- the name of the table and a hash of the version and parameters
+        """
+
+        digest = hashlib.sha256()
+        _hash(digest, (self.version, name, parameters))
+
+        return "{0}-{1}".format(name, digest.hexdigest()[:32])
+
+    def get(self, name, parameters):
+        """Return a table from the cache.
+
+        Args:
+            name (string)           -- the name of the table
+            parameters (dict)       -- the parameters the table is derived from
+
+        Returns:
+            table (dict)            -- the arrays of the table, memory-mapped and read-only, or None
+                                       if the table is not in the cache
+        """
+
+        path = os.path.join(self.directory, self.key(name, parameters))
+        try:
+            table = {filename[:-4]: np.load(os.path.join(path, filename), mmap_mode="r")
+                     for filename in os.listdir(path) if filename.endswith(".npy")}
+            # Mark the entry as recently used
+            os.utime(path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+        return table
+
+    def put(self, name, parameters, table):
+        """Store a table in the cache, and evict old entries if the cache is too large.
+
+        Args:
+            name (string)           -- the name of the table
+            parameters (dict)       -- the parameters the table is derived from
+            table (dict)            -- the arrays of the table, keyed by name
+
+        Returns:
+            table (dict)            -- the stored arrays, memory-mapped and read-only
+        """
+
+        key = self.key(name, parameters)
+        path = os.path.join(self.directory, key)
+
+        temporary = tempfile.mkdtemp(prefix=".tmp-", dir=self.directory)
+        try:
+            for array_name, array in table.items():
+                np.save(os.path.join(temporary, array_name + ".npy"), np.asarray(array))
+            try:
+                os.rename(temporary, path)
+            except OSError:
+                # Another process stored the same entry first
+                pass
+        finally:
+            shutil.rmtree(temporary, ignore_errors=True)
+
+        self.evict(keep=key)
+
+        return self.get(name, parameters)
+
+    def get_or_build(self, name, parameters, build):
+        """Return a table from the cache, building and storing it first if it is not there.
+
+        Args:
+            name (string)           -- the name of the table
+            parameters (dict)       -- the parameters the table is derived from
+            build (function)        -- function of no arguments that returns the table as a dict of arrays
+
+        Returns:
+            table (dict)            -- the arrays of the table, memory-mapped and read-only
+        """
+
+        table = self.get(name, parameters)
+        if table is None:
+            table = self.put(name, parameters, build())
+
+        return table
+
+    def size(self):
+        """Return the size of the cache in bytes."""
+
+        return sum(size for _, _, size in self._entries())
+
+    def evict(self, keep=None):
+        """Remove the least recently used entries until the cache is within its size limit.
+
+        Args:
+            keep (string)           -- key of an entry that is not removed (default: None)
+        """
+
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+
+        for key, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(os.path.join(self.directory, key), ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """Remove all the entries."""
+
+        for key, _, _ in self._entries():
+            shutil.rmtree(os.path.join(self.directory, key), ignore_errors=True)
+
+    def wind_coefficient_table(self, coeffs, frontal_area, lateral_area, Loa, s_L, vessel_type=None,
+                               superstructure_area=None, breadth=None, S=None, masts=None, n_angles=3600):
+        """Return the wind coefficients tabulated over the angle of attack.
+
+        See wind_coefficients.blendermann() and wind_coefficients.isherwood() for the vessel arguments.
+
+        Args:
+            coeffs (CoefficientType)    -- blendermann or isherwood
+            n_angles (int)              -- number of angles of attack from 0 to 2 pi (default: 3600)
+
+        Returns:
+            table (dict)                -- arrays angles, C_X, C_Y and C_N
+
+        Raises:
+            ValueError                  -- if the coefficient type is not blendermann or isherwood
+        """
+
+        if coeffs is CoefficientType.blendermann:
+            vessel = (vessel_type, frontal_area, lateral_area, Loa, s_L)
+            coefficients = wc.blendermann
+        elif coeffs is CoefficientType.isherwood:
+            vessel = (frontal_area, lateral_area, superstructure_area, Loa, breadth, S, s_L, masts)
+            coefficients = wc.isherwood
+        else:
+            raise ValueError("Illegal coefficient type for wind coefficient table: {0}".format(coeffs))
+
+        def build():
+            angles = np.linspace(0.0, 2 * np.pi, n_angles, endpoint=False)
+            C_X, C_Y, C_N = (np.broadcast_to(C, angles.shape) for C in coefficients(*vessel, angles))
+            return {"angles": angles, "C_X": C_X, "C_Y": C_Y, "C_N": C_N}
+
+        return self.get_or_build("wind_coefficients", {"coeffs": coeffs, "vessel": vessel, "n_angles": n_angles},
+                                 build)
+
+    def thruster_limits(self, thruster_types, max_power_positive, max_power_negative):
+        """Return the IMCA maximum thruster forces. See power_to_force.imca_p2f_batch() for the arguments.
+
+        Returns:
+            table (dict)                -- arrays max_force_positive and max_force_negative in kN
+        """
+
+        thruster_types = p2f.thruster_type_values(thruster_types)
+        max_power_positive = np.asarray(max_power_positive, dtype=float)
+        max_power_negative = np.asarray(max_power_negative, dtype=float)
+
+        def build():
+            forces = p2f.imca_p2f_batch(thruster_types, max_power_positive, max_power_negative)
+            return {"max_force_positive": forces[0], "max_force_negative": forces[1]}
+
+        return self.get_or_build("thruster_limits", {"thruster_types": thruster_types,
+                                                     "max_power_positive": max_power_positive,
+                                                     "max_power_negative": max_power_negative}, build)
+
+    def wind_spectrum_table(self, spectrum_type, U_10, n_samples, dt, **parameters):
+        """Return wind spectra on the frequency grid of a real FFT, for several mean wind speeds.
+
+        Args:
+            spectrum_type (WindSpectrumType)    -- the type of spectrum
+            U_10 (array of floats)              -- mean wind speeds at 10 m altitude [m/s]
+            n_samples (int)                     -- number of samples of the time series
+            dt (float)                          -- time step of the time series [s]
+            parameters                          -- the spectrum parameters, e.g. kappa and L
+
+        Returns:
+            table (dict)                        -- arrays U_10, frequencies [Hz] and spectra, with shape
+                                                   (n_speeds, n_frequencies)
+        """
+
+        U_10 = np.atleast_1d(np.asarray(U_10, dtype=float))
+
+        def build():
+            frequencies = np.fft.rfftfreq(n_samples, dt)
+            # The spectra are not defined at zero frequency
+            spectra = np.zeros((len(U_10), len(frequencies)))
+            spectra[:, 1:] = ws.wind_spectrum_batch(spectrum_type, U_10[:, np.newaxis], frequencies[1:],
+                                                    **parameters)
+            return {"U_10": U_10, "frequencies": frequencies, "spectra": spectra}
+
+        return self.get_or_build("wind_spectra", {"spectrum_type": spectrum_type, "U_10": U_10,
+                                                  "n_samples": n_samples, "dt": dt, "parameters": parameters}, build)
+
+    def _entries(self):
+        """Return the key, last use time and size in bytes of each entry."""
+
+        entries = []
+        for key in os.listdir(self.directory):
+            path = os.path.join(self.directory, key)
+            if key.startswith(".tmp-") or not os.path.isdir(path):
+                continue
+            try:
+                size = sum(os.path.getsize(os.path.join(path, filename)) for filename in os.listdir(path))
+                entries.append((key, os.path.getmtime(path), size))
+            except FileNotFoundError:
+                continue
+
+        return entries
+
+
+def _hash(digest, value):
+    """Add a value to a hash, with its type, so e.g. 1 and "1" differ."""
+
+    if isinstance(value, (np.number, np.bool_)):
+        value = value.item()
+
+    if isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value)
+        digest.update("array:{0}:{1}:".format(value.dtype.str, value.shape).encode())
+        digest.update(value.tobytes())
+    elif isinstance(value, Enum):
+        digest.update("enum:{0}.{1};".format(type(value).__name__, value.name).encode())
+    elif isinstance(value, wcf.WindCoefficientFit):
+        # A fit is defined by its coefficients
+        digest.update(b"fit:")
+        _hash(digest, value.cosine_coefficients)
+        _hash(digest, value.sine_coefficients)
+    elif isinstance(value, dict):
+        digest.update("dict:{0}:".format(len(value)).encode())
+        for item_key in sorted(value, key=str):
+            _hash(digest, item_key)
+            _hash(digest, value[item_key])
+    elif isinstance(value, (list, tuple)):
+        digest.update("list:{0}:".format(len(value)).encode())
+        for item in value:
+            _hash(digest, item)
+    elif isinstance(value, (bool, int, float, str)) or value is None:
+        digest.update("{0}:{1!r};".format(type(value).__name__, value).encode())
+    else:
+        raise ValueError("Illegal cache parameter type: {0}".format(type(value).__name__))
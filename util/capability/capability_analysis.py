@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""Functions related to DP capability analysis.
+
+Finds the maximum wind speed the thrusters can hold the vessel against, for a set
+of environmental directions and thruster failure cases. The result is a polar
+capability envelope per failure case.
+
+The wind loads are calculated for all directions at once, at a wind speed of 1 m/s.
+Since the vessel is stationary, the loads scale with the wind speed squared, so the
+maximum wind speed is found by bisection on the allocation feasibility only. Each
+failure case is split into chunks of directions, so there are at least as many
+tasks as worker processes, also for the intact case alone. The tasks are spread
+over a process pool.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from functools import partial
+from math import pi
+import os
+from pymarcyb.util.wind import wind_forces as wf
+import numpy as np
+
+
+def capability_directions(step=pi / 18):
+    """Return the environmental directions of a capability plot.
+
+    Args:
+        step (float)                -- step between the directions in radians (default: 10 degrees)
+
+    Returns:
+        directions (np.ndarray)     -- the directions in radians, from 0 up to but excluding 2 pi
+    """
+
+    return np.arange(0.0, 2 * pi - 1e-9, step)
+
+
+def wind_capability(allocator, directions, wind_parameters, failure_cases=None, additional_loads=None,
+                    max_wind_speed=60.0, tolerance=0.01, processes=None):
+    """Return the maximum wind speed the thrusters can hold, for each direction and failure case.
+
+    The current, wave drift and other loads in additional_loads are added to the wind
+    loads for each direction, but not scaled with the wind speed.
+
+    Args:
+        allocator (ThrustAllocator)         -- thrust allocator for the intact thruster layout
+        directions (array of floats)        -- environmental directions in radians
+        wind_parameters (dict)              -- keyword arguments for wind_forces_and_moment_batch(),
+                                               except wind_speed and wind_direction
+        failure_cases (list)                -- list of arrays of indices of failed thrusters, one per
+                                               failure case (default: None, only the intact case)
+        additional_loads (array of floats)  -- loads in kN/kNm that come in addition to the wind,
+                                               shape (3, n_directions) (default: None)
+        max_wind_speed (float)              -- upper limit of the wind speed search in m/s (default: 60.0)
+        tolerance (float)                   -- resolution of the wind speed in m/s (default: 0.01)
+        processes (int)                     -- number of worker processes, 1 to calculate in this
+                                               process (default: None, one per CPU)
+
+    Returns:
+        wind_speeds (np.ndarray)            -- the maximum wind speed in m/s, shape (n_cases, n_directions)
+    """
+
+    directions = np.asarray(directions, dtype=float)
+    unit_loads = wf.wind_forces_and_moment_batch(1.0, directions, **wind_parameters)
+
+    if additional_loads is None:
+        additional_loads = np.zeros_like(unit_loads)
+
+    if failure_cases is None:
+        failure_cases = [[]]
+
+    case_capability = partial(_case_capability, allocator, unit_loads, np.asarray(additional_loads, dtype=float),
+                              max_wind_speed, tolerance)
+
+    n_processes = processes or os.cpu_count() or 1
+    n_directions = len(directions)
+    n_chunks = max(1, min(n_directions, -(-n_processes // len(failure_cases))))
+    chunks = np.array_split(np.arange(n_directions), n_chunks)
+    failed_cases = [failed for failed in failure_cases for _ in chunks]
+    direction_chunks = chunks * len(failure_cases)
+
+    if n_processes == 1:
+        wind_speeds = list(map(case_capability, failed_cases, direction_chunks))
+    else:
+        with ProcessPoolExecutor(max_workers=n_processes) as executor:
+            wind_speeds = list(executor.map(case_capability, failed_cases, direction_chunks))
+
+    return np.concatenate(wind_speeds).reshape(len(failure_cases), n_directions)
+
+
+def is_feasible(allocator, tau):
+    """Return whether the allocator can produce a force and moment within its limits.
+
+    The allocator falls back to solving its quadratic program when the active set does not
+    reproduce the command, so the result does not depend on the previous allocations.
+
+    Args:
+        allocator (ThrustAllocator)     -- the thrust allocator
+        tau (array of floats)           -- wanted surge force, sway force and yaw moment, in kN and kNm
+
+    Returns:
+        feasible (bool)                 -- true if the force and moment can be produced
+    """
+
+    tau = np.asarray(tau, dtype=float)
+    allocator.allocate(tau)
+
+    return bool(np.all(np.abs(allocator.residual) <= 1e-6 * (1.0 + np.abs(tau))))
+
+
+def _case_capability(allocator, unit_loads, additional_loads, max_wind_speed, tolerance, failed, indices):
+    """Return the maximum wind speed for the directions with the given indices, for one failure case."""
+
+    allocator = deepcopy(allocator)
+    max_forces_positive = allocator.max_forces_positive.copy()
+    max_forces_negative = allocator.max_forces_negative.copy()
+    max_forces_positive[np.asarray(failed, dtype=int)] = 0.0
+    max_forces_negative[np.asarray(failed, dtype=int)] = 0.0
+    allocator.set_force_limits(max_forces_positive, max_forces_negative)
+
+    wind_speeds = np.zeros(len(indices))
+
+    for i, direction in enumerate(indices):
+        unit_load, additional_load = unit_loads[:, direction], additional_loads[:, direction]
+
+        # The thrusters have to counteract the environmental loads.
+        if not is_feasible(allocator, -additional_load):
+            continue
+
+        if is_feasible(allocator, -(max_wind_speed**2 * unit_load + additional_load)):
+            wind_speeds[i] = max_wind_speed
+            continue
+
+        lower, upper = 0.0, max_wind_speed
+        while upper - lower > tolerance:
+            wind_speed = 0.5 * (lower + upper)
+            if is_feasible(allocator, -(wind_speed**2 * unit_load + additional_load)):
+                lower = wind_speed
+            else:
+                upper = wind_speed
+
+        wind_speeds[i] = lower
+
+    return wind_speeds
@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+"""Functions related to worst case failure analysis.
+
+Thrusters and generators are connected to switchboard groups. A failure is a set of
+failed thrusters and generators, e.g. a single thruster, a single generator or a
+whole switchboard group. The available power in each switchboard group is shared
+between its working thrusters, in proportion to their rated power.
+
+Failed sets are represented by bitmasks, with bit i set for failed thruster i and
+bit n_thrusters + j set for failed generator j. The force limits are cached by
+bitmask. The thrust allocations are cached by the force limits and the required
+load, so failures that leave the same thrust available share the allocation, e.g.
+a generator failure that leaves enough power in its group. Both caches are
+bounded, and drop the least recently used entries first.
+"""
+
+from collections import OrderedDict
+from pymarcyb.util.thrusters import power_to_force as p2f
+from pymarcyb.util.thrusters import thrust_allocation as ta
+import numpy as np
+
+
+class PowerSystem(object):
+    """Thrusters and generators connected to switchboard groups."""
+
+    def __init__(self, thruster_types, thruster_groups, thruster_power_positive, thruster_power_negative,
+                 generator_groups, generator_power, diameters=None, ducted=None):
+        """Set up the power system.
+
+        The IMCA power-to-force relationship is used, unless diameters are given,
+        in which case the ABS relationship is used.
+
+        Args:
+            thruster_types (array of ThrusterType)      -- type of each thruster
+            thruster_groups (array of ints)             -- switchboard group of each thruster
+            thruster_power_positive (array of floats)   -- rated power, positive direction, in kW
+            thruster_power_negative (array of floats)   -- rated power, negative direction, in kW
+            generator_groups (array of ints)            -- switchboard group of each generator
+            generator_power (array of floats)           -- rated power of each generator, in kW
+            diameters (array of floats)                 -- diameter of each thruster in m (default: None)
+            ducted (array of bools)                     -- true for ducted thrusters, for ABS (default: None)
+        """
+
+        self.thruster_types = p2f.thruster_type_values(thruster_types).ravel()
+        self.thruster_groups = np.asarray(thruster_groups, dtype=int)
+        self.thruster_power_positive = np.asarray(thruster_power_positive, dtype=float)
+        self.thruster_power_negative = np.asarray(thruster_power_negative, dtype=float)
+        self.generator_groups = np.asarray(generator_groups, dtype=int)
+        self.generator_power = np.asarray(generator_power, dtype=float)
+        self.diameters = None if diameters is None else np.asarray(diameters, dtype=float)
+        self.ducted = np.zeros(len(self.thruster_types), dtype=bool) if ducted is None \
+            else np.asarray(ducted, dtype=bool)
+
+        self.n_groups = int(max(self.thruster_groups.max(initial=-1), self.generator_groups.max(initial=-1))) + 1
+        self._thruster_in_group = self.thruster_groups[:, np.newaxis] == np.arange(self.n_groups)
+        self._generator_in_group = self.generator_groups[:, np.newaxis] == np.arange(self.n_groups)
+
+    @property
+    def n_thrusters(self):
+        """Number of thrusters."""
+
+        return len(self.thruster_types)
+
+    @property
+    def n_generators(self):
+        """Number of generators."""
+
+        return len(self.generator_power)
+
+    def failed_mask(self, thrusters=(), generators=()):
+        """Return the bitmask of a set of failed thrusters and generators.
+
+        Args:
+            thrusters (list of ints)    -- indices of the failed thrusters (default: none)
+            generators (list of ints)   -- indices of the failed generators (default: none)
+
+        Returns:
+            mask (int)                  -- the bitmask
+        """
+
+        mask = 0
+        for thruster in thrusters:
+            mask |= 1 << int(thruster)
+        for generator in generators:
+            mask |= 1 << (self.n_thrusters + int(generator))
+
+        return mask
+
+    def group_mask(self, group):
+        """Return the bitmask of a failed switchboard group.
+
+        Args:
+            group (int)                 -- index of the switchboard group
+
+        Returns:
+            mask (int)                  -- the bitmask
+        """
+
+        return self.failed_mask(np.flatnonzero(self.thruster_groups == group),
+                                 np.flatnonzero(self.generator_groups == group))
+
+    def available_power(self, masks):
+        """Return the power available to each thruster, for several failed sets at once.
+
+        Args:
+            masks (list of ints)                -- bitmasks of the failed sets
+
+        Returns:
+            power_positive (np.ndarray)         -- available power, positive direction, in kW,
+                                                   shape (n_masks, n_thrusters)
+            power_negative (np.ndarray)         -- available power, negative direction, in kW,
+                                                   shape (n_masks, n_thrusters)
+        """
+
+        failed = self._unpack(masks)
+        thruster_working = ~failed[:, :self.n_thrusters]
+        generator_working = ~failed[:, self.n_thrusters:]
+
+        generated = (generator_working * self.generator_power) @ self._generator_in_group
+        demanded = (thruster_working * self.thruster_power_positive) @ self._thruster_in_group
+        share = np.minimum(1.0, generated / np.where(demanded > 0.0, demanded, 1.0))[:, self.thruster_groups]
+
+        power_positive = thruster_working * self.thruster_power_positive * share
+        power_negative = thruster_working * self.thruster_power_negative * share
+
+        return power_positive, power_negative
+
+    def force_limits(self, masks):
+        """Return the force limits of each thruster, for several failed sets at once.
+
+        Args:
+            masks (list of ints)                -- bitmasks of the failed sets
+
+        Returns:
+            max_forces_positive (np.ndarray)    -- maximum force, positive direction, in kN,
+                                                   shape (n_masks, n_thrusters)
+            max_forces_negative (np.ndarray)    -- maximum force, negative direction, in kN,
+                                                   shape (n_masks, n_thrusters)
+        """
+
+        power_positive, power_negative = self.available_power(masks)
+
+        if self.diameters is None:
+            return p2f.imca_p2f_batch(self.thruster_types, power_positive, power_negative)
+
+        return p2f.abs_p2f_batch(power_positive, power_negative, self.diameters, self.ducted)
+
+    def thruster_power(self, thrusts):
+        """Return the power each thruster needs to deliver a thrust.
+
+        Args:
+            thrusts (array of floats)   -- thrust of each thruster in kN, negative for the
+                                           negative direction
+
+        Returns:
+            power (np.ndarray)          -- power of each thruster in kW
+        """
+
+        thrusts = np.asarray(thrusts, dtype=float)
+        positive = np.maximum(thrusts, 0.0)
+        negative = np.minimum(thrusts, 0.0)
+
+        if self.diameters is None:
+            power_positive, power_negative = p2f.imca_f2p_batch(self.thruster_types, positive, negative)
+        else:
+            power_positive, power_negative = p2f.abs_f2p_batch(positive, negative, self.diameters, self.ducted)
+
+        return power_positive + power_negative
+
+    def _unpack(self, masks):
+        """Return the failed sets as a boolean array, shape (n_masks, n_thrusters + n_generators)."""
+
+        n_items = self.n_thrusters + self.n_generators
+        masks = np.asarray([int(mask) for mask in masks], dtype=object)
+        bits = [(masks >> i) & 1 for i in range(n_items)]
+
+        return np.array(bits, dtype=bool).T.reshape(len(masks), n_items)
+
+
+class FailureAnalysis(object):
+    """Evaluation of the remaining thrust and required power for failure combinations."""
+
+    def __init__(self, power_system, positions, weights=None, cache_size=4096):
+        """Set up the failure analysis.
+
+        Args:
+            power_system (PowerSystem)      -- thrusters, generators and switchboard groups
+            positions (array of floats)     -- (x, y) position of each thruster in m, shape (n, 2)
+            weights (array of floats)       -- thrust allocation cost weight of each thruster
+                                               (default: None, all 1.0)
+            cache_size (int)                -- the most entries of each cache (default: 4096)
+
+        Raises:
+            ValueError                      -- if the cache size is less than one
+        """
+
+        if cache_size < 1:
+            raise ValueError("Illegal cache size: {0}".format(cache_size))
+
+        self.power_system = power_system
+        intact_positive, intact_negative = power_system.force_limits([0])
+        self.allocator = ta.ThrustAllocator(power_system.thruster_types, positions, intact_positive[0],
+                                            intact_negative[0], weights=weights)
+        self.cache_size = cache_size
+        self._limit_cache = OrderedDict()
+        self._allocation_cache = OrderedDict()
+
+    def failure_combinations(self, single_thrusters=True, single_generators=True, groups=True):
+        """Return the names and bitmasks of the failures to evaluate.
+
+        Args:
+            single_thrusters (bool)     -- include every single thruster failure (default: True)
+            single_generators (bool)    -- include every single generator failure (default: True)
+            groups (bool)               -- include every switchboard group failure (default: True)
+
+        Returns:
+            names (list of strings)     -- description of each failure
+            masks (list of ints)        -- bitmask of each failure
+        """
+
+        names, masks = ["Intact"], [0]
+
+        if single_thrusters:
+            for i in range(self.power_system.n_thrusters):
+                names.append("Thruster {0}".format(i))
+                masks.append(self.power_system.failed_mask(thrusters=[i]))
+
+        if single_generators:
+            for i in range(self.power_system.n_generators):
+                names.append("Generator {0}".format(i))
+                masks.append(self.power_system.failed_mask(generators=[i]))
+
+        if groups:
+            for i in range(self.power_system.n_groups):
+                names.append("Switchboard group {0}".format(i))
+                masks.append(self.power_system.group_mask(i))
+
+        return names, masks
+
+    def force_limits(self, masks):
+        """Return the force limits of each thruster for each failed set, using the cache.
+
+        The failed sets that are not cached are calculated together, in one batch.
+
+        Args:
+            masks (list of ints)                -- bitmasks of the failed sets
+
+        Returns:
+            max_forces_positive (np.ndarray)    -- maximum force, positive direction, in kN,
+                                                   shape (n_masks, n_thrusters)
+            max_forces_negative (np.ndarray)    -- maximum force, negative direction, in kN,
+                                                   shape (n_masks, n_thrusters)
+        """
+
+        limits = {}
+        for mask in masks:
+            if mask in self._limit_cache:
+                self._limit_cache.move_to_end(mask)
+                limits[mask] = self._limit_cache[mask]
+
+        missing = sorted(set(masks) - set(limits))
+        if missing:
+            max_forces_positive, max_forces_negative = self.power_system.force_limits(missing)
+            for i, mask in enumerate(missing):
+                limits[mask] = (max_forces_positive[i], max_forces_negative[i])
+                self._store(self._limit_cache, mask, limits[mask])
+
+        max_forces_positive = np.array([limits[mask][0] for mask in masks])
+        max_forces_negative = np.array([limits[mask][1] for mask in masks])
+
+        return max_forces_positive, max_forces_negative
+
+    def evaluate(self, masks, tau):
+        """Evaluate the failed sets for a required force and moment.
+
+        Args:
+            masks (list of ints)                -- bitmasks of the failed sets
+            tau (array of floats)               -- required surge force, sway force and yaw moment,
+                                                   in kN and kNm
+
+        Returns:
+            max_forces_positive (np.ndarray)    -- maximum force, positive direction, in kN,
+                                                   shape (n_masks, n_thrusters)
+            max_forces_negative (np.ndarray)    -- maximum force, negative direction, in kN,
+                                                   shape (n_masks, n_thrusters)
+            thruster_power (np.ndarray)         -- power each thruster needs in kW, shape (n_masks, n_thrusters)
+            feasible (np.ndarray)               -- true for the failed sets that can hold tau
+        """
+
+        tau = np.asarray(tau, dtype=float).reshape(3)
+        max_forces_positive, max_forces_negative = self.force_limits(masks)
+
+        thruster_power = np.zeros(max_forces_positive.shape)
+        feasible = np.zeros(len(masks), dtype=bool)
+
+        for i in range(len(masks)):
+            key = (max_forces_positive[i].tobytes(), max_forces_negative[i].tobytes(), tau.tobytes())
+            if key in self._allocation_cache:
+                self._allocation_cache.move_to_end(key)
+                allocation = self._allocation_cache[key]
+            else:
+                self.allocator.set_force_limits(max_forces_positive[i], max_forces_negative[i])
+                thrusts, _ = self.allocator.allocate(tau)
+                achieved = bool(np.all(np.abs(self.allocator.residual) <= 1e-6 * (1.0 + np.abs(tau))))
+                allocation = (self.power_system.thruster_power(thrusts), achieved)
+                self._store(self._allocation_cache, key, allocation)
+
+            thruster_power[i], feasible[i] = allocation
+
+        return max_forces_positive, max_forces_negative, thruster_power, feasible
+
+    def worst_case(self, tau, masks=None):
+        """Return the failure that needs the most power to hold a force and moment,
+        or the first failure that cannot hold it at all.
+
+        Args:
+            tau (array of floats)       -- required surge force, sway force and yaw moment, in kN and kNm
+            masks (list of ints)        -- bitmasks of the failed sets (default: None, all from
+                                           failure_combinations())
+
+        Returns:
+            index (int)                 -- index of the worst case in masks
+            total_power (np.ndarray)    -- total power needed for each failed set in kW, inf where
+                                           tau cannot be held
+        """
+
+        if masks is None:
+            _, masks = self.failure_combinations()
+
+        _, _, thruster_power, feasible = self.evaluate(masks, tau)
+        total_power = np.where(feasible, thruster_power.sum(axis=1), np.inf)
+
+        return int(np.argmax(total_power)), total_power
+
+    def _store(self, cache, key, value):
+        """Add an entry to a cache, and drop the least recently used entry if the cache is full."""
+
+        cache[key] = value
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
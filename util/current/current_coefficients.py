@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""Functions related to current coefficients.
+
+The coefficients are given as tabulated curves, e.g. from model tests or from the
+OCIMF curves for a similar vessel, and interpolated once onto a uniform grid of
+angles of attack, so that evaluating them is a direct index into the grid.
+"""
+
+from math import pi
+import numpy as np
+
+
+class CurrentCoefficients(object):
+    """Current coefficients in surge, sway and yaw, as function of angle of attack."""
+
+    def __init__(self, angles_of_attack, C_X, C_Y, C_N, resolution=np.radians(0.5)):
+        """Pre-interpolate tabulated current coefficients.
+
+        If the table only covers 0 to pi radians, the coefficients are mirrored to the
+        other side, assuming a vessel that is symmetric about the centre line.
+
+        Args:
+            angles_of_attack (array of floats)  -- angles of attack of the table, relative to the
+                                                   bow, in radians, increasing
+            C_X (array of floats)               -- current coefficient in surge
+            C_Y (array of floats)               -- current coefficient in sway
+            C_N (array of floats)               -- current coefficient in yaw
+            resolution (float)                  -- spacing of the interpolated grid in radians
+                                                   (default: 0.5 degrees)
+        """
+
+        angles_of_attack = np.asarray(angles_of_attack, dtype=float)
+        table = np.array([C_X, C_Y, C_N], dtype=float)
+
+        if angles_of_attack[-1] <= pi + 1e-9:
+            mirrored = 2 * pi - angles_of_attack[::-1]
+            angles_of_attack = np.concatenate((angles_of_attack, mirrored))
+            table = np.hstack((table, table[:, ::-1] * np.array([[1.0], [-1.0], [-1.0]])))
+
+        n_steps = int(round(2 * pi / resolution))
+        self.resolution = 2 * pi / n_steps
+        self.angles_of_attack = np.arange(n_steps + 1) * self.resolution
+
+        self.table = np.array([np.interp(self.angles_of_attack, angles_of_attack, row, period=2 * pi)
+                               for row in table])
+        self._slopes = np.diff(self.table, axis=1) / self.resolution
+
+    @classmethod
+    def from_parametric(cls, C_X_0, C_Y_max, C_N_max, resolution=np.radians(0.5)):
+        """Make simple parametric current coefficients, for when no tabulated curves exist.
+
+        C_X = -C_X_0 cos(gamma) |cos(gamma)|, C_Y = -C_Y_max sin(gamma) |sin(gamma)| and
+        C_N = -C_N_max sin(2 gamma), with the same sign convention as the wind coefficients.
+
+        Args:
+            C_X_0 (float)               -- current coefficient in surge for head current
+            C_Y_max (float)             -- current coefficient in sway for beam current
+            C_N_max (float)             -- largest current coefficient in yaw
+            resolution (float)          -- spacing of the interpolated grid in radians
+                                           (default: 0.5 degrees)
+
+        Returns:
+            coefficients (CurrentCoefficients)  -- the current coefficients
+        """
+
+        angles_of_attack = np.linspace(0.0, 2 * pi, 721)
+        cos, sin = np.cos(angles_of_attack), np.sin(angles_of_attack)
+
+        return cls(angles_of_attack, -C_X_0 * cos * np.abs(cos), -C_Y_max * sin * np.abs(sin),
+                   -C_N_max * np.sin(2 * angles_of_attack), resolution=resolution)
+
+    def __call__(self, angle_of_attack):
+        """Return the current coefficients for one or more angles of attack.
+
+        Args:
+            angle_of_attack (array of floats)   -- angle of attack relative to the bow in radians
+
+        Returns:
+            C_X (np.ndarray)                    -- current coefficient in surge
+            C_Y (np.ndarray)                    -- current coefficient in sway
+            C_N (np.ndarray)                    -- current coefficient in yaw
+        """
+
+        position = np.mod(angle_of_attack, 2 * pi) / self.resolution
+        index = np.minimum(position.astype(int), self._slopes.shape[1] - 1)
+        offset = (position - index) * self.resolution
+
+        C = self.table[:, index] + self._slopes[:, index] * offset
+
+        return C[0], C[1], C[2]
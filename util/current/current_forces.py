@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""Functions related to current forces."""
+
+from pymarcyb.util.loads import flow_loads as fl
+import numpy as np
+
+
+def current_forces_and_moment(current_speed, current_direction, coefficients, frontal_area, lateral_area, Lpp,
+                              rho_water=1025.0, vessel_heading=0.0, vessel_speed_surge=0.0,
+                              vessel_speed_sway=0.0):
+    """Return the current force (surge and sway) and moment (yaw) acting
+    on the vessel.
+
+    Uses the same relative velocity and angle of attack as the wind forces.
+
+    Args:
+        current_speed (float)                   -- current speed in m/s
+        current_direction (float)               -- direction the current is coming from, in radians
+        coefficients (CurrentCoefficients)      -- the current coefficients of the vessel
+        frontal_area (float)                    -- underwater frontal area (breadth * draught) in m^2
+        lateral_area (float)                    -- underwater lateral area (Lpp * draught) in m^2
+        Lpp (float)                             -- length between perpendiculars in m
+        rho_water (float)                       -- density of water in kg/m^3 (default: 1025.0)
+        vessel_heading (float)                  -- vessel heading in radians (default: 0.0)
+        vessel_speed_surge (float)              -- vessel speed in surge in m/s (default: 0.0)
+        vessel_speed_sway (float)               -- vessel speed in sway in m/s (default: 0.0)
+
+    Returns:
+        current_forces_and_moment (np.matrix)   -- the current forces and moment in kN/kNm
+    """
+
+    current_forces_and_moment = current_forces_and_moment_batch(
+        current_speed, current_direction, coefficients, frontal_area, lateral_area, Lpp, rho_water=rho_water,
+        vessel_heading=vessel_heading, vessel_speed_surge=vessel_speed_surge, vessel_speed_sway=vessel_speed_sway)
+
+    return np.matrix(current_forces_and_moment.reshape(3, 1))
+
+
+def current_forces_and_moment_batch(current_speed, current_direction, coefficients, frontal_area, lateral_area,
+                                    Lpp, rho_water=1025.0, vessel_heading=0.0, vessel_speed_surge=0.0,
+                                    vessel_speed_sway=0.0):
+    """Return the current force (surge and sway) and moment (yaw) acting
+    on the vessel, for arrays of current and vessel conditions.
+
+    Vectorized version of current_forces_and_moment(). The current speed, current
+    direction, vessel heading and vessel speeds are broadcast against each other.
+
+    Args:
+        current_speed (array of floats)         -- current speed in m/s
+        current_direction (array of floats)     -- direction the current is coming from, in radians
+        coefficients (CurrentCoefficients)      -- the current coefficients of the vessel
+        frontal_area (float)                    -- underwater frontal area (breadth * draught) in m^2
+        lateral_area (float)                    -- underwater lateral area (Lpp * draught) in m^2
+        Lpp (float)                             -- length between perpendiculars in m
+        rho_water (float)                       -- density of water in kg/m^3 (default: 1025.0)
+        vessel_heading (array of floats)        -- vessel heading in radians (default: 0.0)
+        vessel_speed_surge (array of floats)    -- vessel speed in surge in m/s (default: 0.0)
+        vessel_speed_sway (array of floats)     -- vessel speed in sway in m/s (default: 0.0)
+
+    Returns:
+        current_forces_and_moment (np.ndarray)  -- the current forces and moment in kN/kNm, shape (3, ...)
+    """
+
+    relative_current_speed, angle_of_attack = fl.relative_flow(current_speed, current_direction, vessel_heading,
+                                                               vessel_speed_surge, vessel_speed_sway)
+
+    C_X, C_Y, C_N = coefficients(angle_of_attack)
+
+    return fl.quadratic_loads(rho_water, relative_current_speed, C_X, C_Y, C_N, frontal_area, lateral_area, Lpp)
@@ -10,6 +10,7 @@ class CoefficientType(Enum):
     blendermann = 1
     hughes = 2
     isherwood = 3
+    fourier_fit = 4
 
 
 class DOF(IntEnum):
@@ -38,3 +39,10 @@ class WindSpectrumType(Enum):
     ochi_shin = 3
     npd = 4
     api = 5
+
+
+class IntegrationMethod(Enum):
+    """Fixed-step integration method."""
+
+    rk4 = 1
+    semi_implicit_euler = 2
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""Sliding-window statistics of wind speed and direction.
+
+WindowStatistics is updated one anemometer sample at a time, and keeps the mean,
+variance, circular mean of the direction, maximum and minimum for several window
+lengths at once. The samples are kept in ring buffers sized for the longest
+window, and each window keeps running sums and monotonic deques, so an update
+costs O(1) amortized per window no matter the window length. The running sums
+are recalculated from the buffers once every buffer length, so rounding errors
+do not build up.
+
+window_statistics_batch() calculates the same statistics over a whole log at
+once, from cumulative sums within blocks of one window length for the means and
+variance, and with the van Herk/Gil-Werman algorithm for the maximum and minimum.
+
+The windows are trailing, i.e. the statistics at a sample are of the window that
+ends at that sample. Until a window is full, the statistics are of the samples
+received so far.
+
+Example:
+    statistics = WindowStatistics(window_lengths=(3.0, 60.0, 600.0), sample_rate=4.0)
+    for speed, direction in anemometer:
+        statistics.update(speed, direction)
+        gust, mean_wind = statistics.mean(3.0), statistics.mean(600.0)
+"""
+
+from collections import deque
+import math
+import numpy as np
+
+
+class _Window(object):
+    """Running sums and monotonic deques of one window."""
+
+    def __init__(self, n_samples):
+        self.n_samples = n_samples
+        self.sum = 0.0
+        self.sum_of_squares = 0.0
+        self.sum_sin = 0.0
+        self.sum_cos = 0.0
+        self.maxima = deque()
+        self.minima = deque()
+
+
+class WindowStatistics(object):
+    """Sliding-window statistics of a stream of wind speeds and directions, for several window lengths."""
+
+    def __init__(self, window_lengths, sample_rate):
+        """Set up the ring buffers.
+
+        Args:
+            window_lengths (list of floats)     -- the window lengths in s
+            sample_rate (float)                 -- the sample rate of the stream in Hz
+
+        Raises:
+            ValueError                          -- if a window is shorter than one sample
+        """
+
+        self.sample_rate = sample_rate
+        self.count = 0
+        self._windows = {}
+
+        for window_length in window_lengths:
+            n_samples = int(round(window_length * sample_rate))
+            if n_samples < 1:
+                raise ValueError("Illegal window length: {0}".format(window_length))
+            self._windows[window_length] = _Window(n_samples)
+
+        self.capacity = max(window.n_samples for window in self._windows.values())
+        self._speeds = np.zeros(self.capacity)
+        self._sines = np.zeros(self.capacity)
+        self._cosines = np.zeros(self.capacity)
+        self._speed_buffer = memoryview(self._speeds)
+        self._sin_buffer = memoryview(self._sines)
+        self._cos_buffer = memoryview(self._cosines)
+
+        # The speeds are stored relative to the first speed, so the variance does not suffer
+        # from cancellation
+        self._shift = 0.0
+
+    @property
+    def window_lengths(self):
+        """The window lengths in s."""
+
+        return list(self._windows)
+
+    def update(self, speed, direction):
+        """Add a sample.
+
+        Args:
+            speed (float)       -- the wind speed
+            direction (float)   -- the wind direction in radians
+        """
+
+        if self.count == 0:
+            self._shift = speed
+
+        count = self.count
+        i = count % self.capacity
+        x = speed - self._shift
+        s = math.sin(direction)
+        c = math.cos(direction)
+
+        # Remove the samples leaving the windows before the buffers are overwritten
+        for window in self._windows.values():
+            if count >= window.n_samples:
+                j = (count - window.n_samples) % self.capacity
+                x_old = self._speed_buffer[j]
+                window.sum -= x_old
+                window.sum_of_squares -= x_old * x_old
+                window.sum_sin -= self._sin_buffer[j]
+                window.sum_cos -= self._cos_buffer[j]
+
+        self._speed_buffer[i] = x
+        self._sin_buffer[i] = s
+        self._cos_buffer[i] = c
+
+        for window in self._windows.values():
+            window.sum += x
+            window.sum_of_squares += x * x
+            window.sum_sin += s
+            window.sum_cos += c
+
+            oldest = count - window.n_samples
+            maxima, minima = window.maxima, window.minima
+            while maxima and maxima[-1][1] <= x:
+                maxima.pop()
+            maxima.append((count, x))
+            if maxima[0][0] <= oldest:
+                maxima.popleft()
+            while minima and minima[-1][1] >= x:
+                minima.pop()
+            minima.append((count, x))
+            if minima[0][0] <= oldest:
+                minima.popleft()
+
+        self.count = count + 1
+        if self.count % self.capacity == 0:
+            self._recalculate()
+
+    def mean(self, window_length):
+        """Return the mean wind speed over a window."""
+
+        window = self._window(window_length)
+
+        return self._shift + window.sum / self._n(window)
+
+    def variance(self, window_length):
+        """Return the variance of the wind speed over a window."""
+
+        window = self._window(window_length)
+        n = self._n(window)
+        mean = window.sum / n
+
+        return max(window.sum_of_squares / n - mean * mean, 0.0)
+
+    def std(self, window_length):
+        """Return the standard deviation of the wind speed over a window."""
+
+        return math.sqrt(self.variance(window_length))
+
+    def direction(self, window_length):
+        """Return the circular mean of the wind direction over a window, in radians in [-pi, pi]."""
+
+        window = self._window(window_length)
+
+        return math.atan2(window.sum_sin, window.sum_cos)
+
+    def maximum(self, window_length):
+        """Return the maximum wind speed over a window."""
+
+        return self._shift + self._window(window_length).maxima[0][1]
+
+    def minimum(self, window_length):
+        """Return the minimum wind speed over a window."""
+
+        return self._shift + self._window(window_length).minima[0][1]
+
+    def statistics(self, window_length):
+        """Return all the statistics of a window.
+
+        Args:
+            window_length (float)   -- the window length in s
+
+        Returns:
+            statistics (dict)       -- mean, std, direction, maximum and minimum
+        """
+
+        return {"mean": self.mean(window_length), "std": self.std(window_length),
+                "direction": self.direction(window_length), "maximum": self.maximum(window_length),
+                "minimum": self.minimum(window_length)}
+
+    def _window(self, window_length):
+        """Return a window, checking that it exists and has samples."""
+
+        if window_length not in self._windows:
+            raise ValueError("Illegal window length: {0}".format(window_length))
+        if self.count == 0:
+            raise ValueError("No samples.")
+
+        return self._windows[window_length]
+
+    def _n(self, window):
+        """Return the number of samples in a window."""
+
+        return min(self.count, window.n_samples)
+
+    def _recalculate(self):
+        """Recalculate the running sums from the buffers."""
+
+        for window in self._windows.values():
+            n = self._n(window)
+            indices = np.arange(self.count - n, self.count) % self.capacity
+            speeds = self._speeds[indices]
+            window.sum = float(speeds.sum())
+            window.sum_of_squares = float(np.dot(speeds, speeds))
+            window.sum_sin = float(self._sines[indices].sum())
+            window.sum_cos = float(self._cosines[indices].sum())
+
+
+def window_statistics_batch(speeds, directions, window_length, sample_rate):
+    """Return the sliding-window statistics at every sample of a log.
+
+    Args:
+        speeds (array of floats)        -- the wind speeds
+        directions (array of floats)    -- the wind directions in radians
+        window_length (float)           -- the window length in s
+        sample_rate (float)             -- the sample rate of the log in Hz
+
+    Returns:
+        statistics (dict)               -- arrays of mean, std, direction, maximum and minimum, one value
+                                           per sample, empty for an empty log
+
+    Raises:
+        ValueError                      -- if the window is shorter than one sample
+    """
+
+    n_samples = int(round(window_length * sample_rate))
+    if n_samples < 1:
+        raise ValueError("Illegal window length: {0}".format(window_length))
+
+    speeds = np.asarray(speeds, dtype=float)
+    directions = np.asarray(directions, dtype=float)
+    offset = speeds[0] if len(speeds) > 0 else 0.0
+    shifted = speeds - offset
+    counts = np.minimum(np.arange(1, len(speeds) + 1), n_samples)
+
+    mean = _window_sums(shifted, n_samples) / counts
+    variance = np.maximum(_window_sums(shifted * shifted, n_samples) / counts - mean * mean, 0.0)
+    direction = np.arctan2(_window_sums(np.sin(directions), n_samples),
+                           _window_sums(np.cos(directions), n_samples))
+
+    return {"mean": offset + mean, "std": np.sqrt(variance), "direction": direction,
+            "maximum": _window_maxima(speeds, n_samples), "minimum": -_window_maxima(-speeds, n_samples)}
+
+
+def _window_sums(values, n_samples):
+    """Return the sums over the trailing windows.
+
+    The cumulative sums restart at every block of n_samples, and each window is the
+    sum of a block suffix and a block prefix. The sums never span more than two
+    windows, so differences of large cumulative sums are avoided.
+    """
+
+    prefix, suffix = _block_scans(np.add, values, n_samples, 0.0)
+    n = len(values)
+    # A window that starts at a block boundary is the whole block, i.e. the suffix alone
+    starts_block = np.arange(n) % n_samples == 0
+
+    return suffix[:n] + np.where(starts_block, 0.0, prefix[n_samples - 1:n_samples - 1 + n])
+
+
+def _window_maxima(values, n_samples):
+    """Return the maxima over the trailing windows, with the van Herk/Gil-Werman algorithm."""
+
+    prefix, suffix = _block_scans(np.maximum, values, n_samples, -np.inf)
+    n = len(values)
+
+    return np.maximum(suffix[:n], prefix[n_samples - 1:n_samples - 1 + n])
+
+
+def _block_scans(ufunc, values, n_samples, identity):
+    """Return the prefix and suffix scans within blocks of n_samples, of the values padded in front
+    with n_samples - 1 identities, so window i covers padded samples i to i + n_samples - 1.
+    """
+
+    n = len(values)
+    n_blocks = -(-(n + n_samples - 1) // n_samples)
+    padded = np.full(n_blocks * n_samples, identity)
+    padded[n_samples - 1:n_samples - 1 + n] = values
+
+    blocks = padded.reshape(n_blocks, n_samples)
+    prefix = ufunc.accumulate(blocks, axis=1).ravel()
+    suffix = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+
+    return prefix, suffix
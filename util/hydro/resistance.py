@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""Calm water resistance and effective power by Holtrop and Mennen's method.
+
+    R_T = (1 + k_1) R_F + R_APP + R_W + R_B + R_TR + R_A
+
+Reference: Holtrop, J. and Mennen, G. G. J. (1982), An approximate power
+prediction method, International Shipbuilding Progress 29.
+
+The resistance is evaluated for a grid of draughts and speeds in one broadcast
+computation. The hull coefficients only depend on the draught. They are
+calculated once per set of draughts, with the block coefficient extrapolated
+from the design draught by coeffs.cb_extrapolation(), and the vessel is assumed
+on even keel, with the midship and waterplane coefficients, the longitudinal
+centre of buoyancy, the bulb and the transom of the design draught.
+
+The grid is returned as a ResistanceTable, which interpolates bilinearly in
+vectorized form, for voyage planners that query many points.
+
+Example:
+    hull = HoltropMennen(205.0, 32.0, 10.0, 0.5716, 0.98, 0.75, lcb=-0.75, A_BT=20.0, h_B=4.0, A_T=16.0,
+                         S_APP=50.0, C_stern=10.0)
+    table = hull.table(np.linspace(8.0, 12.0, 9), np.linspace(1.0, 13.0, 49))
+    power = table.power(draughts, speeds)
+"""
+
+from pymarcyb.util.hydro import coeffs as c
+import numpy as np
+
+GRAVITY = 9.81
+
+
+class HoltropMennen(object):
+    """Resistance of a hull by Holtrop and Mennen's method."""
+
+    def __init__(self, L, B, T_design, C_B_design, C_M, C_WP, lcb=0.0, A_BT=0.0, h_B=0.0, A_T=0.0, S_APP=0.0,
+                 k_2=1.5, C_stern=0.0, rho=1025.0, nu=1.1883e-6):
+        """Set up the hull.
+
+        Args:
+            L (float)               -- length in the waterline, in m
+            B (float)               -- breadth, in m
+            T_design (float)        -- design draught, in m
+            C_B_design (float)      -- block coefficient at design draught, unitless
+            C_M (float)             -- midship section coefficient, unitless
+            C_WP (float)            -- waterplane area coefficient, unitless
+            lcb (float)             -- longitudinal centre of buoyancy forward of 0.5 L, in % of L (default: 0.0)
+            A_BT (float)            -- transverse area of the bulbous bow, in m^2 (default: 0.0)
+            h_B (float)             -- height of the centre of A_BT above the keel, in m (default: 0.0)
+            A_T (float)             -- immersed transom area at rest, in m^2 (default: 0.0)
+            S_APP (float)           -- wetted area of the appendages, in m^2 (default: 0.0)
+            k_2 (float)             -- appendage form factor 1 + k_2 (default: 1.5)
+            C_stern (float)         -- afterbody form coefficient, -25 to 10 (default: 0.0)
+            rho (float)             -- water density, in kg/m^3 (default: 1025.0)
+            nu (float)              -- kinematic viscosity of the water, in m^2/s (default: 1.1883e-6)
+        """
+
+        self.L = L
+        self.B = B
+        self.T_design = T_design
+        self.C_B_design = C_B_design
+        self.C_M = C_M
+        self.C_WP = C_WP
+        self.lcb = lcb
+        self.A_BT = A_BT
+        self.h_B = h_B
+        self.A_T = A_T
+        self.S_APP = S_APP
+        self.k_2 = k_2
+        self.C_stern = C_stern
+        self.rho = rho
+        self.nu = nu
+
+        self._hull_coefficients = {}
+
+    def hull_coefficients(self, draughts):
+        """Return the draught-dependent hull coefficients. They are calculated once per set of draughts.
+
+        Args:
+            draughts (array of floats)  -- the draughts, in m
+
+        Returns:
+            coefficients (dict)         -- arrays with the shape of draughts: T, C_B, C_P, volume [m^3],
+                                           S [m^2], k_1 (the form factor 1 + k_1), and the speed-independent
+                                           factors of the wave, bulb and correlation resistance
+        """
+
+        T = np.asarray(draughts, dtype=float)
+        key = (T.shape, T.tobytes())
+        if key in self._hull_coefficients:
+            return self._hull_coefficients[key]
+
+        L, B, C_M, C_WP, lcb, A_BT, h_B = self.L, self.B, self.C_M, self.C_WP, self.lcb, self.A_BT, self.h_B
+
+        C_B = c.cb_extrapolation(self.C_B_design, self.T_design, T)
+        volume = C_B * L * B * T
+        C_P = C_B / C_M
+        L_R = L * (1.0 - C_P + 0.06 * C_P * lcb / (4.0 * C_P - 1.0))
+        # The fineness ratio with the displaced volume, as used by the method
+        slenderness = c.fineness_ratio(L, volume)
+
+        c_14 = 1.0 + 0.011 * self.C_stern
+        k_1 = 0.93 + 0.487118 * c_14 * (B / L)**1.06806 * (T / L)**0.46106 * (L / L_R)**0.121563 * \
+            slenderness**(3.0 * 0.36486) * (1.0 - C_P)**-0.604247
+        S = L * (2.0 * T + B) * np.sqrt(C_M) * (0.453 + 0.4425 * C_B - 0.2862 * C_M - 0.003467 * B / T +
+                                                0.3696 * C_WP) + 2.38 * A_BT / C_B
+
+        # Wave resistance
+        if B / L < 0.11:
+            c_7 = 0.229577 * (B / L)**(1.0 / 3.0)
+        elif B / L < 0.25:
+            c_7 = B / L
+        else:
+            c_7 = 0.5 - 0.0625 * L / B
+        i_E = 1.0 + 89.0 * np.exp(-(L / B)**0.80856 * (1.0 - C_WP)**0.30484 *
+                                  (1.0 - C_P - 0.0225 * lcb)**0.6367 * (L_R / B)**0.34574 *
+                                  (100.0 * volume / L**3)**0.16302)
+        c_1 = 2223105.0 * c_7**3.78613 * (T / B)**1.07961 * (90.0 - i_E)**-1.37565
+        c_3 = 0.56 * A_BT**1.5 / (B * T * (0.31 * np.sqrt(A_BT) + T - h_B))
+        c_2 = np.exp(-1.89 * np.sqrt(c_3))
+        c_5 = 1.0 - 0.8 * self.A_T / (B * T * C_M)
+        lambda_ = 1.446 * C_P - (0.03 * L / B if L / B < 12.0 else 0.36)
+        c_16 = np.where(C_P < 0.8, 8.07981 * C_P - 13.8673 * C_P**2 + 6.984388 * C_P**3, 1.73014 - 0.7067 * C_P)
+        m_1 = 0.0140407 * L / T - 1.75254 * volume**(1.0 / 3.0) / L - 4.79323 * B / L - c_16
+        c_15 = np.clip(-1.69385 + (slenderness - 8.0) / 2.36, -1.69385, 0.0)
+        c_17 = 6919.3 * C_M**-1.3346 * (volume / L**3)**2.00977 * (L / B - 2.0)**1.40692
+        m_3 = -7.2035 * (B / L)**0.326869 * (T / B)**0.605375
+
+        # Correlation allowance, with the forward draught equal to the draught
+        c_4 = np.minimum(T / L, 0.04)
+        C_A = 0.006 * (L + 100.0)**-0.16 - 0.00205 + 0.003 * np.sqrt(L / 7.5) * C_B**4 * c_2 * (0.04 - c_4)
+
+        coefficients = {"T": T, "C_B": C_B, "C_P": C_P, "volume": volume, "S": S, "k_1": k_1,
+                        "c_1": c_1, "c_2": c_2, "c_5": c_5, "c_15": c_15, "c_17": c_17, "lambda": lambda_,
+                        "m_1": m_1, "m_3": m_3, "C_A": C_A}
+        self._hull_coefficients[key] = coefficients
+
+        return coefficients
+
+    def resistance(self, draughts, speeds):
+        """Return the total resistance on the grid of draughts and speeds.
+
+        Args:
+            draughts (array of floats)  -- the draughts, in m, shape (n_draughts,)
+            speeds (array of floats)    -- the speeds, in m/s, shape (n_speeds,)
+
+        Returns:
+            R_T (np.ndarray)            -- the total resistance in kN, shape (n_draughts, n_speeds)
+        """
+
+        h = {name: np.asarray(value)[..., np.newaxis] for name, value in self.hull_coefficients(draughts).items()}
+        V = np.asarray(speeds, dtype=float)
+        L, B, rho, A_BT, A_T = self.L, self.B, self.rho, self.A_BT, self.A_T
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            dynamic_pressure = 0.5 * rho * V**2
+            Fn = V / np.sqrt(GRAVITY * L)
+
+            # Friction, ITTC 1957
+            C_F = 0.075 / (np.log10(V * L / self.nu) - 2.0)**2
+            R_F = dynamic_pressure * h["S"] * C_F
+            R_APP = dynamic_pressure * self.S_APP * self.k_2 * C_F
+
+            # Wave resistance, the low and high speed formulas blended for 0.4 < Fn < 0.55
+            def wave_resistance(Fn, c, m):
+                m_2 = h["c_15"] * h["C_P"]**2 * np.exp(-0.1 * Fn**-2)
+                return c * h["c_2"] * h["c_5"] * h["volume"] * rho * GRAVITY * \
+                    np.exp(m * Fn**-0.9 + m_2 * np.cos(h["lambda"] * Fn**-2))
+
+            R_W_low = wave_resistance(np.minimum(Fn, 0.4), h["c_1"], h["m_1"])
+            R_W_high = wave_resistance(np.maximum(Fn, 0.55), h["c_17"], h["m_3"])
+            blend = np.clip((10.0 * Fn - 4.0) / 1.5, 0.0, 1.0)
+            R_W = np.where(Fn <= 0.4, R_W_low, np.where(Fn >= 0.55, R_W_high, R_W_low + blend * (R_W_high - R_W_low)))
+
+            # Bulbous bow
+            if A_BT > 0.0:
+                P_B = 0.56 * np.sqrt(A_BT) / (h["T"] - 1.5 * self.h_B)
+                Fn_i = V / np.sqrt(GRAVITY * (h["T"] - self.h_B - 0.25 * np.sqrt(A_BT)) + 0.15 * V**2)
+                R_B = 0.11 * np.exp(-3.0 * P_B**-2) * Fn_i**3 * A_BT**1.5 * rho * GRAVITY / (1.0 + Fn_i**2)
+            else:
+                R_B = 0.0
+
+            # Immersed transom
+            if A_T > 0.0:
+                Fn_T = V / np.sqrt(2.0 * GRAVITY * A_T / (B + B * self.C_WP))
+                R_TR = dynamic_pressure * A_T * np.where(Fn_T < 5.0, 0.2 * (1.0 - 0.2 * Fn_T), 0.0)
+            else:
+                R_TR = 0.0
+
+            R_A = dynamic_pressure * h["S"] * h["C_A"]
+
+            R_T = h["k_1"] * R_F + R_APP + R_W + R_B + R_TR + R_A
+
+        return np.where(V > 0.0, R_T, 0.0) / 1000.0
+
+    def table(self, draughts, speeds):
+        """Return the resistance on the grid of draughts and speeds, as a lookup table.
+
+        Args:
+            draughts (array of floats)  -- the draughts, increasing, in m
+            speeds (array of floats)    -- the speeds, increasing, in m/s
+
+        Returns:
+            table (ResistanceTable)     -- the lookup table
+        """
+
+        return ResistanceTable(draughts, speeds, self.resistance(draughts, speeds))
+
+
+class ResistanceTable(object):
+    """Resistance tabulated over draught and speed, with bilinear interpolation."""
+
+    def __init__(self, draughts, speeds, resistance):
+        """Set up the table.
+
+        Args:
+            draughts (array of floats)      -- the draughts, increasing, in m
+            speeds (array of floats)        -- the speeds, increasing, in m/s
+            resistance (array of floats)    -- the resistance in kN, shape (n_draughts, n_speeds)
+
+        Raises:
+            ValueError                      -- if an axis has less than two points, or is not increasing
+        """
+
+        self.draughts = np.asarray(draughts, dtype=float)
+        self.speeds = np.asarray(speeds, dtype=float)
+        self.values = np.asarray(resistance, dtype=float)
+
+        for axis in (self.draughts, self.speeds):
+            if len(axis) < 2 or np.any(np.diff(axis) <= 0.0):
+                raise ValueError("Illegal table axis: {0}".format(axis.tolist()))
+
+    def resistance(self, draughts, speeds):
+        """Return the interpolated resistance. Points outside the table are clamped to its edges.
+
+        Args:
+            draughts (array of floats)  -- the draughts, in m
+            speeds (array of floats)    -- the speeds, in m/s, broadcast against draughts
+
+        Returns:
+            R_T (np.ndarray)            -- the total resistance in kN
+        """
+
+        i, s = _cell(self.draughts, draughts)
+        j, t = _cell(self.speeds, speeds)
+        values = self.values
+
+        lower = values[i, j] + t * (values[i, j + 1] - values[i, j])
+        upper = values[i + 1, j] + t * (values[i + 1, j + 1] - values[i + 1, j])
+
+        return lower + s * (upper - lower)
+
+    def power(self, draughts, speeds):
+        """Return the interpolated effective power, R_T V.
+
+        Args:
+            draughts (array of floats)  -- the draughts, in m
+            speeds (array of floats)    -- the speeds, in m/s, broadcast against draughts
+
+        Returns:
+            P_E (np.ndarray)            -- the effective power in kW
+        """
+
+        speeds = np.clip(speeds, self.speeds[0], self.speeds[-1])
+
+        return self.resistance(draughts, speeds) * speeds
+
+
+def _cell(axis, points):
+    """Return the index of the cell of each point on the axis, and the fraction into the cell."""
+
+    points = np.clip(np.asarray(points, dtype=float), axis[0], axis[-1])
+    indices = np.clip(np.searchsorted(axis, points, side='right') - 1, 0, len(axis) - 2)
+    fractions = (points - axis[indices]) / (axis[indices + 1] - axis[indices])
+
+    return indices, fractions
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""Fluid memory effects in the Cummins equation.
+
+    (M + A_inf) nu_dot + mu + D nu = tau,    mu(t) = int_0^t K(t - tau) nu(tau) dtau
+
+The retardation functions K(t) follow from the frequency-dependent potential
+damping B(omega):
+
+    K(t) = 2/pi int_0^inf (B(omega) - B_inf) cos(omega t) domega
+
+and the infinite-frequency added mass from the added mass A(omega) (Ogilvie):
+
+    A_inf = A(omega) + 1/omega int_0^inf K(t) sin(omega t) dt
+
+Evaluating the memory term mu as a convolution costs O(history) per time step.
+Instead each retardation function K_ij is realized as a low-order discrete
+state-space model with the eigensystem realization algorithm (ERA): an SVD of
+the Hankel matrix of the samples of K_ij, truncated to the given order. The
+models are diagonalized, so a time step is one complex multiply-add per state,
+O(order) for each DOF pair. The models are made for one time step, the sample
+interval of K.
+
+memory_force_batch() evaluates the convolution with FFTs, for offline
+verification of the state-space models.
+"""
+
+import numpy as np
+
+
+def retardation_functions(frequencies, damping, times, damping_inf=None):
+    """Return the retardation functions, from the potential damping.
+
+    Args:
+        frequencies (array of floats)   -- the frequencies of the damping table, increasing, in rad/s
+        damping (array of floats)       -- the potential damping B(omega), shape (n_frequencies, ...), e.g.
+                                           (n_frequencies, 6, 6)
+        times (array of floats)         -- the times to calculate the retardation functions at, in s
+        damping_inf (array of floats)   -- the damping at infinite frequency, shape (...) (default: None, zero)
+
+    Returns:
+        K (np.ndarray)                  -- the retardation functions, shape (n_times, ...)
+    """
+
+    frequencies = np.asarray(frequencies, dtype=float)
+    damping = np.asarray(damping, dtype=float)
+    times = np.asarray(times, dtype=float)
+    if damping_inf is not None:
+        damping = damping - np.asarray(damping_inf, dtype=float)
+
+    # The trapezoid rule as one matrix product for all times and DOF pairs
+    kernel = (2.0 / np.pi) * _trapezoid_weights(frequencies) * np.cos(np.outer(times, frequencies))
+
+    K = kernel @ damping.reshape(len(frequencies), -1)
+
+    return K.reshape((len(times),) + damping.shape[1:])
+
+
+def infinite_frequency_added_mass(frequencies, added_mass, times, K):
+    """Return the infinite-frequency added mass, from the added mass and the retardation functions.
+    Ogilvie's relation is evaluated at each frequency, and averaged.
+
+    Args:
+        frequencies (array of floats)   -- the frequencies of the added mass table, in rad/s, larger than zero
+        added_mass (array of floats)    -- the added mass A(omega), shape (n_frequencies, ...)
+        times (array of floats)         -- the times of the retardation functions, uniformly spaced from 0, in s
+        K (array of floats)             -- the retardation functions, shape (n_times, ...)
+
+    Returns:
+        A_inf (np.ndarray)              -- the infinite-frequency added mass, shape (...)
+    """
+
+    frequencies = np.asarray(frequencies, dtype=float)
+    added_mass = np.asarray(added_mass, dtype=float)
+    K = np.asarray(K, dtype=float)
+    times = np.asarray(times, dtype=float)
+
+    # The trapezoid rule as one matrix product for all frequencies and DOF pairs
+    kernel = _trapezoid_weights(times) * np.sin(np.outer(frequencies, times))
+    integrals = (kernel @ K.reshape(len(times), -1)).reshape((len(frequencies),) + K.shape[1:])
+    estimates = added_mass + integrals / frequencies.reshape((-1,) + (1,) * (K.ndim - 1))
+
+    return estimates.mean(axis=0)
+
+
+def memory_force_batch(K, velocities, dt):
+    """Return the fluid memory term mu of the Cummins equation for velocity time series, by FFT
+    convolution with the trapezoid rule. The vessel is at rest before the first sample.
+
+    Args:
+        K (array of floats)             -- the retardation functions at t = 0, dt, 2 dt, ..., shape
+                                           (n_times, n_dofs, n_dofs)
+        velocities (array of floats)    -- the velocities, shape (n_steps, n_dofs)
+        dt (float)                      -- the time step [s]
+
+    Returns:
+        mu (np.ndarray)                 -- the memory term, shape (n_steps, n_dofs)
+    """
+
+    K = np.asarray(K, dtype=float)
+    velocities = np.asarray(velocities, dtype=float)
+    n_steps = len(velocities)
+    n_fft = n_steps + len(K) - 1
+
+    weights = np.full(len(K), dt)
+    weights[0] = 0.5 * dt
+
+    K_spectra = np.fft.rfft(weights[:, np.newaxis, np.newaxis] * K, n_fft, axis=0)
+    velocity_spectra = np.fft.rfft(velocities, n_fft, axis=0)
+    mu = np.fft.irfft(np.einsum('fij,fj->fi', K_spectra, velocity_spectra), n_fft, axis=0)
+
+    return mu[:n_steps]
+
+
+class RetardationStateSpace(object):
+    """State-space approximation of the fluid memory term, one discrete model per DOF pair."""
+
+    def __init__(self, K, dt, order=6, tolerance=1e-4):
+        """Fit the state-space models.
+
+        Args:
+            K (array of floats)         -- the retardation functions at t = 0, dt, 2 dt, ..., shape
+                                           (n_times, n_dofs, n_dofs)
+            dt (float)                  -- the time step, both of K and the simulation [s]
+            order (int)                 -- the highest order of the model of a DOF pair (default: 6)
+            tolerance (float)           -- Hankel singular values below tolerance times the largest are
+                                           dropped, and DOF pairs with all of K_ij below tolerance times
+                                           the largest of K are left out (default: 1e-4)
+
+        Raises:
+            ValueError                  -- if the order is not positive, or K is too short for the order
+        """
+
+        K = np.asarray(K, dtype=float)
+        if K.ndim == 1:
+            K = K[:, np.newaxis, np.newaxis]
+        if order < 1:
+            raise ValueError("Illegal state-space order: {0}".format(order))
+        if len(K) < 2 * order + 2:
+            raise ValueError("Illegal number of retardation function samples: {0}".format(len(K)))
+
+        self.dt = dt
+        self.n_dofs = K.shape[1]
+        # The direct term is the first sample of the trapezoid rule
+        self.feedthrough = 0.5 * dt * K[0]
+
+        poles, gains, inputs, outputs = [], [], [], []
+        threshold = tolerance * np.abs(K).max()
+        for i in range(self.n_dofs):
+            for j in range(self.n_dofs):
+                if np.abs(K[:, i, j]).max() <= threshold:
+                    continue
+                pair_poles, pair_gains = _era(dt * K[1:, i, j], order, tolerance)
+                poles.append(pair_poles)
+                gains.append(pair_gains)
+                inputs.append(np.full(len(pair_poles), j))
+                outputs.append(np.full(len(pair_poles), i))
+
+        self.poles = np.concatenate(poles) if poles else np.zeros(0, dtype=complex)
+        self.gains = np.concatenate(gains) if gains else np.zeros(0, dtype=complex)
+        self.inputs = np.concatenate(inputs) if inputs else np.zeros(0, dtype=int)
+        self.outputs = np.concatenate(outputs) if outputs else np.zeros(0, dtype=int)
+        self.states = np.zeros(len(self.poles), dtype=complex)
+
+    @classmethod
+    def from_hydrodynamics(cls, frequencies, added_mass, damping, dt, duration, order=6, tolerance=1e-4,
+                           damping_inf=None):
+        """Return the state-space models and the infinite-frequency added mass, from frequency-dependent
+        added mass and damping tables.
+
+        Args:
+            frequencies (array of floats)   -- the frequencies of the tables, increasing, in rad/s
+            added_mass (array of floats)    -- the added mass A(omega), shape (n_frequencies, n_dofs, n_dofs)
+            damping (array of floats)       -- the potential damping B(omega), shape (n_frequencies, n_dofs, n_dofs)
+            dt (float)                      -- the time step of the simulation [s]
+            duration (float)                -- the length of the retardation functions [s]
+            order (int)                     -- the highest order of the model of a DOF pair (default: 6)
+            tolerance (float)               -- see __init__() (default: 1e-4)
+            damping_inf (array of floats)   -- the damping at infinite frequency (default: None, zero)
+
+        Returns:
+            model (RetardationStateSpace)   -- the state-space models
+            A_inf (np.ndarray)              -- the infinite-frequency added mass, shape (n_dofs, n_dofs)
+        """
+
+        times = np.arange(int(round(duration / dt)) + 1) * dt
+        K = retardation_functions(frequencies, damping, times, damping_inf)
+        positive = np.asarray(frequencies) > 0.0
+        A_inf = infinite_frequency_added_mass(np.asarray(frequencies)[positive], np.asarray(added_mass)[positive],
+                                              times, K)
+
+        return cls(K, dt, order, tolerance), A_inf
+
+    @property
+    def order(self):
+        """Total number of states."""
+
+        return len(self.poles)
+
+    def reset(self):
+        """Set the states to zero, a vessel that has been at rest."""
+
+        self.states[:] = 0.0
+
+    def step(self, velocity):
+        """Return the memory term at the current time step, and advance the states one time step.
+
+        Args:
+            velocity (array of floats)  -- the velocity at the current time step, shape (n_dofs,)
+
+        Returns:
+            mu (np.ndarray)             -- the memory term, shape (n_dofs,)
+        """
+
+        velocity = np.asarray(velocity, dtype=float)
+        mu = np.bincount(self.outputs, (self.gains * self.states).real, minlength=self.n_dofs)
+        mu += self.feedthrough @ velocity
+        self.states *= self.poles
+        self.states += velocity[self.inputs]
+
+        return mu
+
+    def retardation(self, n_times):
+        """Return the retardation functions of the state-space models.
+
+        Args:
+            n_times (int)               -- number of samples, at t = 0, dt, 2 dt, ...
+
+        Returns:
+            K (np.ndarray)              -- the retardation functions, shape (n_times, n_dofs, n_dofs)
+        """
+
+        K = np.zeros((n_times, self.n_dofs, self.n_dofs))
+        K[0] = 2.0 * self.feedthrough / self.dt
+        powers = self.poles[np.newaxis, :] ** np.arange(n_times - 1)[:, np.newaxis]
+        responses = (self.gains * powers).real / self.dt
+        np.add.at(K, (slice(1, None), self.outputs, self.inputs), responses)
+
+        return K
+
+
+def _era(markov, order, tolerance):
+    """Return the poles and gains of a diagonal discrete state-space model whose impulse response
+    h_k = sum(gains * poles^(k - 1)) fits the Markov parameters h_1, h_2, ..., by the eigensystem
+    realization algorithm.
+    """
+
+    n_rows = (len(markov) - 1) // 2
+    indices = np.arange(n_rows)[:, np.newaxis] + np.arange(n_rows)
+    U, s, Vt = np.linalg.svd(markov[indices])
+    rank = max(1, min(order, int(np.sum(s > tolerance * s[0]))))
+
+    U, s, Vt = U[:, :rank], s[:rank], Vt[:rank]
+    root = np.sqrt(s)
+    A = (U.T @ markov[indices + 1] @ Vt.T) / np.outer(root, root)
+    B = root * Vt[:, 0]
+    C = U[0] * root
+
+    poles, vectors = np.linalg.eig(A)
+    # Truncated retardation functions can give slightly unstable poles, which are reflected into the unit circle
+    unstable = np.abs(poles) >= 1.0
+    poles[unstable] = 1.0 / poles[unstable].conj()
+    gains = (C @ vectors) * np.linalg.solve(vectors, B)
+
+    return poles, gains
+
+
+def _trapezoid_weights(x):
+    """Return the weights of the trapezoid rule on the points x."""
+
+    weights = np.zeros(len(x))
+    steps = np.diff(x)
+    weights[:-1] += 0.5 * steps
+    weights[1:] += 0.5 * steps
+
+    return weights
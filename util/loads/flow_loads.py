@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""Functions related to loads from a flow around the vessel.
+
+Shared by the wind and current loads. Both are quadratic in the relative flow
+speed, with coefficients that depend on the angle of attack of the relative flow.
+"""
+
+from math import pi
+import numpy as np
+
+
+def relative_flow(flow_speed, flow_direction, vessel_heading=0.0, vessel_speed_surge=0.0,
+                  vessel_speed_sway=0.0, dtype=np.float64):
+    """Return the speed and angle of attack of a flow relative to the vessel.
+
+    All arguments are broadcast against each other.
+
+    Args:
+        flow_speed (array of floats)            -- flow speed in m/s
+        flow_direction (array of floats)        -- direction the flow is coming from, in radians
+        vessel_heading (array of floats)        -- vessel heading in radians (default: 0.0)
+        vessel_speed_surge (array of floats)    -- vessel speed in surge in m/s (default: 0.0)
+        vessel_speed_sway (array of floats)     -- vessel speed in sway in m/s (default: 0.0)
+        dtype (np.dtype)                        -- float32 or float64, the precision of the calculation
+                                                   (default: float64)
+
+    Returns:
+        relative_speed (np.ndarray)             -- speed of the relative flow in m/s
+        angle_of_attack (np.ndarray)            -- angle of attack of the relative flow, relative to
+                                                   the bow, between 0 and 2 pi radians
+    """
+
+    flow_speed, flow_direction, vessel_heading, vessel_speed_surge, vessel_speed_sway = (
+        np.asarray(value, dtype=dtype)
+        for value in (flow_speed, flow_direction, vessel_heading, vessel_speed_surge, vessel_speed_sway))
+
+    flow_speed_surge = flow_speed * np.cos(flow_direction - vessel_heading)
+    flow_speed_sway  = flow_speed * np.sin(flow_direction - vessel_heading)
+    relative_velocity_surge = vessel_speed_surge - flow_speed_surge
+    relative_velocity_sway  = vessel_speed_sway  - flow_speed_sway
+    relative_speed = np.sqrt(relative_velocity_surge**2 + relative_velocity_sway**2)
+
+    # The flow is coming from the angle of attack
+    angle_of_attack = np.arctan2(relative_velocity_sway, relative_velocity_surge) + pi
+
+    return relative_speed, angle_of_attack
+
+
+def quadratic_loads(density, relative_speed, C_X, C_Y, C_N, frontal_area, lateral_area, length, dtype=np.float64):
+    """Return the forces (surge and sway) and moment (yaw) from a flow, given its coefficients.
+
+    Args:
+        density (array of floats)           -- density of the fluid in kg/m^3
+        relative_speed (array of floats)    -- speed of the relative flow in m/s
+        C_X (array of floats)               -- coefficient in surge
+        C_Y (array of floats)               -- coefficient in sway
+        C_N (array of floats)               -- coefficient in yaw
+        frontal_area (float)                -- frontal area in m^2
+        lateral_area (float)                -- lateral area in m^2
+        length (float)                      -- length used with the yaw coefficient in m
+        dtype (np.dtype)                    -- float32 or float64, the precision of the calculation
+                                               (default: float64)
+
+    Returns:
+        loads (np.ndarray)                  -- the forces and moment in kN/kNm, shape (3, ...)
+    """
+
+    density, relative_speed, C_X, C_Y, C_N, frontal_area, lateral_area, length = (
+        np.asarray(value, dtype=dtype)
+        for value in (density, relative_speed, C_X, C_Y, C_N, frontal_area, lateral_area, length))
+
+    q = 0.5 * density * relative_speed**2
+    force_surge = 10**-3 * q * C_X * frontal_area
+    force_sway  = 10**-3 * q * C_Y * lateral_area
+    moment_yaw  = 10**-3 * q * C_N * lateral_area * length
+
+    return np.stack(np.broadcast_arrays(force_surge, force_sway, moment_yaw))
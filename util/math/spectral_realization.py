@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Functions related to time series realizations of spectra.
+
+A realization is a sum of harmonic components with random phases, with the
+amplitude of each component given by the spectrum. The components are placed on
+the frequency grid of the FFT, so the whole series is made with one inverse FFT.
+"""
+
+import numpy as np
+
+
+def realization(frequencies, spectrum, n_samples, dt, rng=None, transfer=None):
+    """Returns a time series realization of a one-sided spectrum.
+
+    The spectrum is linearly interpolated onto the frequencies k / (n_samples * dt),
+    and is zero outside the given frequencies. The realization is periodic with
+    the length of the series, and has zero mean.
+
+    A transfer function, e.g. the force RAOs of a vessel, turns a realization of the
+    wave elevation into realizations of the loads, with the same phases.
+
+    Args:
+        frequencies (array of floats)   -- the frequencies of the spectrum [Hz]
+        spectrum (array of floats)      -- the spectrum, shape (..., n_frequencies)
+        n_samples (int)                 -- number of samples in the series
+        dt (float)                      -- time step [s]
+        rng (np.random.Generator)       -- random generator or seed for the phases
+                                           (default: None, fresh entropy)
+        transfer (array of floats)      -- transfer function at the frequencies of the spectrum,
+                                           shape (..., n_frequencies), can be complex
+                                           (default: None)
+
+    Returns:
+        series (np.ndarray)             -- the realization, shape (..., n_samples), where ... is
+                                           the shape of the spectrum and the transfer function
+                                           broadcast against each other
+    """
+
+    rng = np.random.default_rng(rng)
+    spectrum = np.asarray(spectrum, dtype=float)
+
+    grid = np.fft.rfftfreq(n_samples, dt)
+    df = grid[1] - grid[0]
+
+    interpolated = _interpolate(grid, frequencies, spectrum)
+
+    amplitudes = np.sqrt(2.0 * np.maximum(interpolated, 0.0) * df)
+    amplitudes[..., 0] = 0.0
+    if n_samples % 2 == 0:
+        amplitudes[..., -1] = 0.0
+
+    phases = rng.uniform(0.0, 2 * np.pi, amplitudes.shape)
+
+    components = 0.5 * n_samples * amplitudes * np.exp(1j * phases)
+
+    if transfer is not None:
+        transfer = np.asarray(transfer)
+        components = components * (_interpolate(grid, frequencies, transfer.real)
+                                   + 1j * _interpolate(grid, frequencies, np.imag(transfer)))
+
+    return np.fft.irfft(components, n_samples)
+
+
+def _interpolate(grid, frequencies, values):
+    """Interpolate values along the last axis onto the grid, zero outside the frequencies."""
+
+    rows = values.reshape(-1, values.shape[-1])
+    interpolated = np.array([np.interp(grid, frequencies, row, left=0.0, right=0.0) for row in rows])
+
+    return interpolated.reshape(values.shape[:-1] + grid.shape)
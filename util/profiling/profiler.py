@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""Opt-in profiling of the public functions in the util packages.
+
+enable() replaces the public functions and methods of every module in the given
+packages with wrappers that count the calls, time them and count the array
+elements passed in. disable() puts the original functions back, so there is no
+cost at all when profiling is off.
+
+The functions are replaced on the modules, so calls through the module, like
+wf.wind_forces_and_moment(...), and calls within the module are profiled. Names
+imported directly with "from module import function" before enable() keep
+pointing at the original function.
+
+The times are inclusive, i.e. the time of a function includes the time of the
+profiled functions it calls.
+
+Example:
+    from pymarcyb.util.profiling import profiler
+
+    with profiler.profiling():
+        run_simulation()
+    print(profiler.report())
+"""
+
+from contextlib import contextmanager
+from functools import wraps
+import importlib
+import inspect
+import json
+import pkgutil
+import random
+from time import perf_counter
+import numpy as np
+
+DEFAULT_PACKAGES = ("pymarcyb.util.wind", "pymarcyb.util.waves", "pymarcyb.util.filters",
+                    "pymarcyb.util.kinematics", "pymarcyb.util.thrusters")
+
+# Number of call durations kept per function for the percentiles
+RESERVOIR_SIZE = 4096
+
+_statistics = {}
+_patched = []
+
+
+class FunctionStatistics(object):
+    """Call count, times and array sizes of one function."""
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.elements = 0
+        self.max_elements = 0
+        self._durations = []
+
+    def add(self, duration, elements):
+        """Add a call.
+
+        Args:
+            duration (float)    -- duration of the call in s
+            elements (int)      -- number of array or list elements in the arguments
+        """
+
+        self.calls += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        self.elements += elements
+        self.max_elements = max(self.max_elements, elements)
+
+        # Reservoir sampling, so the percentiles are representative of all the calls
+        if len(self._durations) < RESERVOIR_SIZE:
+            self._durations.append(duration)
+        else:
+            i = random.randrange(self.calls)
+            if i < RESERVOIR_SIZE:
+                self._durations[i] = duration
+
+    def percentiles(self, q=(50, 90, 99)):
+        """Return percentiles of the call durations in s.
+
+        Args:
+            q (list of floats)      -- the percentiles, between 0 and 100 (default: 50, 90 and 99)
+
+        Returns:
+            percentiles (list)      -- the durations at the percentiles
+        """
+
+        if not self._durations:
+            return [0.0 for _ in q]
+
+        return np.percentile(self._durations, q).tolist()
+
+    def as_dict(self):
+        """Return the statistics as a dict."""
+
+        p50, p90, p99 = self.percentiles()
+
+        return {"calls": self.calls, "total_time": self.total_time, "mean_time": self.total_time / self.calls,
+                "p50_time": p50, "p90_time": p90, "p99_time": p99, "max_time": self.max_time,
+                "elements": self.elements, "max_elements": self.max_elements}
+
+
+def enable(packages=DEFAULT_PACKAGES):
+    """Start profiling the public functions and methods of all modules in some packages.
+
+    Modules that cannot be imported, e.g. because an optional dependency is
+    missing, are skipped.
+
+    Args:
+        packages (list of strings)  -- names of the packages (default: DEFAULT_PACKAGES)
+    """
+
+    if _patched:
+        disable()
+
+    for module in _modules(packages):
+        for name, function in list(vars(module).items()):
+            if _is_public_function(function, module):
+                _patch(module, name, function, "{0}.{1}".format(module.__name__, name))
+            elif inspect.isclass(function) and function.__module__ == module.__name__ and not name.startswith("_"):
+                for method_name, method in list(vars(function).items()):
+                    if inspect.isfunction(method) and not method_name.startswith("_"):
+                        _patch(function, method_name, method,
+                               "{0}.{1}.{2}".format(module.__name__, name, method_name))
+
+
+def disable():
+    """Stop profiling and put the original functions back. The statistics are kept."""
+
+    while _patched:
+        owner, name, original = _patched.pop()
+        setattr(owner, name, original)
+
+
+def is_enabled():
+    """Return whether profiling is on."""
+
+    return bool(_patched)
+
+
+def reset():
+    """Clear the statistics."""
+
+    _statistics.clear()
+
+
+@contextmanager
+def profiling(packages=DEFAULT_PACKAGES):
+    """Context manager that profiles the packages within the block.
+
+    Args:
+        packages (list of strings)  -- names of the packages (default: DEFAULT_PACKAGES)
+    """
+
+    enable(packages)
+    try:
+        yield _statistics
+    finally:
+        disable()
+
+
+def statistics():
+    """Return the statistics of the functions that have been called.
+
+    Returns:
+        statistics (dict)       -- dict of statistics, see FunctionStatistics.as_dict(), keyed by
+                                   the full name of the function
+    """
+
+    return {name: function_statistics.as_dict() for name, function_statistics in _statistics.items()
+            if function_statistics.calls > 0}
+
+
+def report(output_format="table", sort_by="total_time"):
+    """Return the statistics as a table or as JSON.
+
+    Args:
+        output_format (string)  -- "table" or "json" (default: "table")
+        sort_by (string)        -- statistic to sort the table by, largest first (default: "total_time")
+
+    Returns:
+        report (string)         -- the report
+
+    Raises:
+        ValueError              -- if the output format is unknown
+    """
+
+    results = statistics()
+
+    if output_format == "json":
+        return json.dumps(results, indent=2, sort_keys=True)
+    if output_format != "table":
+        raise ValueError("Illegal output format: {0}".format(output_format))
+
+    lines = ["{0:<70} {1:>9} {2:>11} {3:>11} {4:>11} {5:>11} {6:>12}".format(
+        "function", "calls", "total [s]", "p50 [s]", "p90 [s]", "p99 [s]", "elements")]
+    for name, result in sorted(results.items(), key=lambda item: -item[1][sort_by]):
+        lines.append("{0:<70} {1:>9} {2:>11.3e} {3:>11.3e} {4:>11.3e} {5:>11.3e} {6:>12}".format(
+            name, result["calls"], result["total_time"], result["p50_time"], result["p90_time"], result["p99_time"],
+            result["elements"]))
+
+    return "\n".join(lines)
+
+
+def _modules(packages):
+    """Yield the modules of the packages."""
+
+    for package_name in packages:
+        package = importlib.import_module(package_name)
+        for module_info in pkgutil.iter_modules(package.__path__, package_name + "."):
+            try:
+                yield importlib.import_module(module_info.name)
+            except ImportError:
+                continue
+
+
+def _is_public_function(function, module):
+    """Return whether an attribute of a module is a public function defined in the module."""
+
+    return inspect.isfunction(function) and function.__module__ == module.__name__ \
+        and not function.__name__.startswith("_")
+
+
+def _patch(owner, name, function, full_name):
+    """Replace a function on a module or class with a profiling wrapper."""
+
+    function_statistics = _statistics.setdefault(full_name, FunctionStatistics())
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            function_statistics.add(perf_counter() - start, _elements(args, kwargs))
+
+    _patched.append((owner, name, function))
+    setattr(owner, name, wrapper)
+
+
+def _elements(args, kwargs):
+    """Return the number of array and list elements in the arguments."""
+
+    elements = 0
+    for value in args + tuple(kwargs.values()):
+        if isinstance(value, np.ndarray):
+            elements += value.size
+        elif isinstance(value, (list, tuple)):
+            elements += len(value)
+
+    return elements
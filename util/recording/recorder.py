@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""Recorder of time series of several channels, e.g. simulator outputs and live signals.
+
+The samples are written to a preallocated, channel-major ring buffer of a fixed
+dtype, so appending a sample is a column assignment with no allocation, and the
+memory use does not grow with the length of the run. The ring buffer holds a
+number of blocks. Each sample is written twice, once in each half of a buffer
+of twice the capacity, so any window of recent samples is a contiguous slice,
+and recent() returns views instead of copies. A channel of a view is a
+contiguous row, which can be passed to the filters as is.
+
+With a path, every full block is also spilled to a file, which is read back
+memory-mapped. The file is a sequence of records of one block each, with the
+times and the values of the block. The first time of each block is kept in a
+small index, so read() finds the blocks of a time interval by binary search,
+without scanning the file. Without a path, the oldest samples are overwritten.
+
+Example:
+    recorder = Recorder(["north", "east", "heading"], path="run.rec")
+    for t, eta in zip(times, positions):
+        recorder.append(t, eta)
+    times, values = recorder.recent(600)
+    times, values = recorder.read(100.0, 200.0)
+    recorder.close()
+"""
+
+import numpy as np
+
+
+class Recorder(object):
+    """Ring buffer recorder of several channels, with optional spill to a memory-mapped file."""
+
+    def __init__(self, channels, block_size=4096, n_blocks=4, dtype=np.float64, path=None):
+        """Set up the buffers, and create the spill file.
+
+        Args:
+            channels (list of strings)  -- the names of the channels
+            block_size (int)            -- number of samples per block (default: 4096)
+            n_blocks (int)              -- number of blocks in the ring buffer (default: 4)
+            dtype (np.dtype)            -- the dtype of the values, the times are float64 (default: float64)
+            path (string)               -- the spill file, overwritten if it exists (default: None, no spill)
+
+        Raises:
+            ValueError                  -- if the block size or number of blocks is less than one, or
+                                           a channel name is repeated
+        """
+
+        if block_size < 1:
+            raise ValueError("Illegal block size: {0}".format(block_size))
+        if n_blocks < 1:
+            raise ValueError("Illegal number of blocks: {0}".format(n_blocks))
+        if len(set(channels)) != len(channels):
+            raise ValueError("Illegal channel names: {0}".format(channels))
+
+        self.channels = list(channels)
+        self.channel_indices = {name: i for i, name in enumerate(self.channels)}
+        self.block_size = block_size
+        self.capacity = block_size * n_blocks
+        self.dtype = np.dtype(dtype)
+        self.path = path
+        self.count = 0
+
+        # Twice the capacity, so any window of recent samples is contiguous
+        self._times = np.zeros(2 * self.capacity)
+        self._values = np.zeros((len(self.channels), 2 * self.capacity), dtype=self.dtype)
+
+        self._record = np.dtype([("times", np.float64, (block_size,)),
+                                 ("values", self.dtype, (len(self.channels), block_size))])
+        self._block_times = []
+        self._blocks = None
+        self._file = None if path is None else open(path, "wb")
+
+    @property
+    def n_channels(self):
+        """Number of channels."""
+
+        return len(self.channels)
+
+    @property
+    def n_spilled(self):
+        """Number of blocks in the spill file."""
+
+        return len(self._block_times)
+
+    def append(self, time, values):
+        """Record one sample.
+
+        Args:
+            time (float)                -- the time of the sample, not earlier than the previous [s]
+            values (array of floats)    -- the values of the channels, shape (n_channels,)
+        """
+
+        position = self.count % self.capacity
+        self._times[position] = self._times[position + self.capacity] = time
+        self._values[:, position] = self._values[:, position + self.capacity] = values
+        self.count += 1
+
+        if self.count % self.block_size == 0:
+            self._spill()
+
+    def extend(self, times, values):
+        """Record several samples.
+
+        Args:
+            times (array of floats)     -- the times of the samples, increasing [s]
+            values (array of floats)    -- the values, shape (n_channels, n_samples)
+        """
+
+        times = np.asarray(times, dtype=float)
+        values = np.asarray(values).reshape(self.n_channels, len(times))
+
+        # Copy up to the end of the current block at a time, so each full block is spilled
+        start = 0
+        while start < len(times):
+            position = self.count % self.capacity
+            n = min(len(times) - start, self.block_size - self.count % self.block_size)
+            for offset in (position, position + self.capacity):
+                self._times[offset:offset + n] = times[start:start + n]
+                self._values[:, offset:offset + n] = values[:, start:start + n]
+            self.count += n
+            start += n
+
+            if self.count % self.block_size == 0:
+                self._spill()
+
+    def recent(self, n_samples=None):
+        """Return views of the most recent samples. They are valid until the samples are overwritten,
+        i.e. until another capacity minus n_samples samples are recorded.
+
+        Args:
+            n_samples (int)             -- number of samples (default: None, all in the ring buffer)
+
+        Returns:
+            times (np.ndarray)          -- the times, shape (n_samples,)
+            values (np.ndarray)         -- the values, shape (n_channels, n_samples)
+
+        Raises:
+            ValueError                  -- if more samples are asked for than the ring buffer holds
+        """
+
+        available = min(self.count, self.capacity)
+        n_samples = available if n_samples is None else n_samples
+        if n_samples > available:
+            raise ValueError("Illegal number of recent samples: {0}".format(n_samples))
+
+        end = self.count % self.capacity
+        if end < n_samples:
+            end += self.capacity
+
+        return self._times[end - n_samples:end], self._values[:, end - n_samples:end]
+
+    def channel(self, name, n_samples=None):
+        """Return a view of the most recent samples of one channel.
+
+        Args:
+            name (string)               -- the name of the channel
+            n_samples (int)             -- number of samples (default: None, all in the ring buffer)
+
+        Returns:
+            values (np.ndarray)         -- the values, shape (n_samples,)
+        """
+
+        return self.recent(n_samples)[1][self.channel_indices[name]]
+
+    def read(self, start_time, end_time):
+        """Return the samples of a time interval, from the spill file and the ring buffer.
+
+        Args:
+            start_time (float)          -- the start of the interval [s]
+            end_time (float)            -- the end of the interval, inclusive [s]
+
+        Returns:
+            times (np.ndarray)          -- the times, shape (n_samples,)
+            values (np.ndarray)         -- the values, shape (n_channels, n_samples)
+
+        Raises:
+            ValueError                  -- if there is no spill file, and the interval starts before the
+                                           oldest sample in the ring buffer
+        """
+
+        n_spilled = self.n_spilled
+        # The samples after the last spilled block, or all in the ring buffer without a spill file
+        n_buffered = self.count - n_spilled * self.block_size if self._file is not None else \
+            min(self.count, self.capacity)
+        times, values = self.recent(n_buffered)
+        parts = [(times, values)]
+
+        if self._file is None:
+            if self.count > self.capacity and start_time < times[0]:
+                raise ValueError("Illegal start time, the samples are overwritten: {0}".format(start_time))
+        elif n_spilled > 0:
+            blocks = self._spilled_blocks()
+            first = max(0, np.searchsorted(self._block_times, start_time, side='right') - 1)
+            last = np.searchsorted(self._block_times, end_time, side='right')
+            parts = [(block["times"], block["values"]) for block in blocks[first:last]] + parts
+
+        times = np.concatenate([part[0] for part in parts])
+        values = np.concatenate([part[1] for part in parts], axis=1)
+        inside = slice(np.searchsorted(times, start_time, side='left'),
+                       np.searchsorted(times, end_time, side='right'))
+
+        return times[inside], values[:, inside]
+
+    def close(self):
+        """Close the spill file. The spilled blocks can still be read."""
+
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+
+    def _spill(self):
+        """Write the block that was just filled to the spill file."""
+
+        if self._file is None:
+            return
+
+        end = (self.count - 1) % self.capacity + 1
+        block = slice(end - self.block_size, end)
+        self._file.write(self._times[block].tobytes())
+        self._file.write(np.ascontiguousarray(self._values[:, block]).tobytes())
+        self._block_times.append(self._times[block.start])
+
+    def _spilled_blocks(self):
+        """Return the spilled blocks, memory-mapped, mapping the file again if it has grown."""
+
+        if self._blocks is None or len(self._blocks) != self.n_spilled:
+            if not self._file.closed:
+                self._file.flush()
+            self._blocks = np.memmap(self.path, dtype=self._record, mode="r", shape=(self.n_spilled,))
+
+        return self._blocks
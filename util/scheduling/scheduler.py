@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""Multi-rate scheduler for control loops, based on asyncio.
+
+Components are registered as tasks with a period and a priority, and are run one
+at a time, in the order of their release times. Tasks released at the same time
+run in order of priority, lowest number first. The release times are calculated
+from the start time and the number of periods, so they do not drift.
+
+For each task the latency (start time - release time), jitter (deviation of the
+time between two starts from the period) and execution time are collected in
+histograms. A task whose execution takes longer than its period has overrun. A
+task that starts late, e.g. delayed by the tasks before it, shows in the latency.
+Releases that have passed when a task finishes are missed, whatever the cause,
+and are skipped.
+
+With a SimulatedClock the scheduler runs as fast as possible, jumping from one
+release time to the next, e.g. to test the loops against a stand-in sensor.
+
+Example:
+    scheduler = Scheduler(SimulatedClock())
+    scheduler.add_task("filter", filter_wind, period=0.1, priority=0)
+    scheduler.add_task("feed-forward", wind_feed_forward, period=1.0, priority=1)
+    asyncio.run(scheduler.run(duration=3600.0))
+"""
+
+import asyncio
+from bisect import bisect_right
+import heapq
+import inspect
+import math
+import time
+
+# Upper bin edges of the latency, jitter and execution time histograms in s.
+# The last bin counts everything above the last edge.
+HISTOGRAM_EDGES = [1e-6, 1e-5, 1e-4, 1e-3, 2e-3, 5e-3, 1e-2, 2e-2, 5e-2, 1e-1, 2e-1, 5e-1, 1.0]
+
+
+class RealClock(object):
+    """Monotonic wall clock."""
+
+    def time(self):
+        """Return the current time in s."""
+
+        return time.monotonic()
+
+    async def sleep_until(self, wake_time):
+        """Sleep until a time.
+
+        Args:
+            wake_time (float)   -- the time to wake up in s
+        """
+
+        delay = wake_time - self.time()
+        if delay > 0.0:
+            await asyncio.sleep(delay)
+
+
+class SimulatedClock(object):
+    """Clock that jumps to the wake-up time instead of sleeping."""
+
+    def __init__(self, start_time=0.0):
+        """Set up the clock.
+
+        Args:
+            start_time (float)  -- the time to start at in s (default: 0.0)
+        """
+
+        self._now = float(start_time)
+
+    def time(self):
+        """Return the current simulated time in s."""
+
+        return self._now
+
+    def advance(self, duration):
+        """Move the time forward, e.g. to simulate the execution time of a task.
+
+        Args:
+            duration (float)    -- the time to move forward in s
+        """
+
+        self._now += duration
+
+    async def sleep_until(self, wake_time):
+        """Jump to a time, and let the other coroutines run.
+
+        Args:
+            wake_time (float)   -- the time to wake up in s
+        """
+
+        self._now = max(self._now, wake_time)
+        await asyncio.sleep(0)
+
+
+class Histogram(object):
+    """Counts of durations, in the bins given by HISTOGRAM_EDGES."""
+
+    def __init__(self):
+        self.counts = [0] * (len(HISTOGRAM_EDGES) + 1)
+        self.maximum = 0.0
+
+    def add(self, duration):
+        """Add a duration in s."""
+
+        self.counts[bisect_right(HISTOGRAM_EDGES, abs(duration))] += 1
+        self.maximum = max(self.maximum, abs(duration))
+
+    def as_dict(self):
+        """Return the bin edges, counts and maximum as a dict."""
+
+        return {"edges": HISTOGRAM_EDGES, "counts": list(self.counts), "maximum": self.maximum}
+
+
+class Task(object):
+    """A periodic component of the scheduler."""
+
+    def __init__(self, name, function, period, priority=0, offset=0.0, on_overrun=None):
+        """Set up the task.
+
+        Args:
+            name (string)           -- name of the task
+            function (function)     -- function or coroutine function called with the release time
+            period (float)          -- the period in s
+            priority (int)          -- tasks released at the same time run in order of priority, lowest
+                                       first (default: 0)
+            offset (float)          -- time of the first release after the start in s (default: 0.0)
+            on_overrun (function)   -- called with the task and the number of missed releases when the
+                                       execution takes longer than the period (default: None)
+        """
+
+        if period <= 0.0:
+            raise ValueError("The period must be positive: {0}".format(period))
+
+        self.name = name
+        self.function = function
+        self.period = float(period)
+        self.priority = priority
+        self.offset = float(offset)
+        self.on_overrun = on_overrun
+        self._is_coroutine = inspect.iscoroutinefunction(function)
+
+        self.runs = 0
+        self.overruns = 0
+        self.missed_releases = 0
+        self.latency = Histogram()
+        self.jitter = Histogram()
+        self.execution_time = Histogram()
+        self._release = 0
+        self._previous_start = None
+
+    def release_time(self, start_time):
+        """Return the current release time, from the start time and the number of periods."""
+
+        return start_time + self.offset + self._release * self.period
+
+    def reset(self):
+        """Set the releases back to the start, for a new run. The statistics are kept."""
+
+        self._release = 0
+        self._previous_start = None
+
+    def statistics(self):
+        """Return the statistics of the task as a dict."""
+
+        return {"period": self.period, "priority": self.priority, "runs": self.runs, "overruns": self.overruns,
+                "missed_releases": self.missed_releases, "latency": self.latency.as_dict(),
+                "jitter": self.jitter.as_dict(), "execution_time": self.execution_time.as_dict()}
+
+    async def _run(self, clock, start_time):
+        """Run the task once and schedule its next release."""
+
+        release_time = self.release_time(start_time)
+        started = clock.time()
+        started_wall = time.perf_counter()
+
+        result = self.function(release_time)
+        if self._is_coroutine:
+            await result
+
+        finished = clock.time()
+        self.execution_time.add(time.perf_counter() - started_wall)
+        self.latency.add(started - release_time)
+        if self._previous_start is not None:
+            self.jitter.add(started - self._previous_start - self.period)
+        self._previous_start = started
+        self.runs += 1
+
+        # Skip the releases that have passed, whether the task itself or the tasks before it took the time
+        self._release += 1
+        overdue = finished - self.release_time(start_time)
+        missed = 0
+        if overdue > 0.0:
+            missed = int(math.floor(overdue / self.period)) + 1
+            self._release += missed
+            self.missed_releases += missed
+            self._previous_start = None
+
+        if finished - started > self.period:
+            self.overruns += 1
+            if self.on_overrun is not None:
+                self.on_overrun(self, missed)
+
+
+class Scheduler(object):
+    """Runs periodic tasks at their release times, one at a time."""
+
+    def __init__(self, clock=None):
+        """Set up the scheduler.
+
+        Args:
+            clock (RealClock or SimulatedClock)     -- the clock (default: None, a RealClock)
+        """
+
+        self.clock = RealClock() if clock is None else clock
+        self.tasks = []
+        self._running = False
+
+    def add_task(self, name, function, period, priority=0, offset=0.0, on_overrun=None):
+        """Register a periodic task. See Task for the arguments.
+
+        Returns:
+            task (Task)     -- the task
+        """
+
+        task = Task(name, function, period, priority, offset, on_overrun)
+        self.tasks.append(task)
+
+        return task
+
+    def stop(self):
+        """Stop the scheduler after the task that is running."""
+
+        self._running = False
+
+    async def run(self, duration=None):
+        """Run the tasks until stop() is called or the duration has passed. The releases start over
+        from the current time, and the statistics add to those of earlier runs.
+
+        Args:
+            duration (float)    -- how long to run in s, releases at or after the end are not run
+                                   (default: None, until stop())
+        """
+
+        for task in self.tasks:
+            task.reset()
+
+        start_time = self.clock.time()
+        end_time = None if duration is None else start_time + duration
+        queue = [(task.release_time(start_time), task.priority, i, task) for i, task in enumerate(self.tasks)]
+        heapq.heapify(queue)
+        self._running = True
+
+        while self._running and queue:
+            release_time, priority, i, task = queue[0]
+            if end_time is not None and release_time >= end_time:
+                break
+
+            await self.clock.sleep_until(release_time)
+            if not self._running:
+                break
+
+            heapq.heappop(queue)
+            await task._run(self.clock, start_time)
+            heapq.heappush(queue, (task.release_time(start_time), priority, i, task))
+
+        self._running = False
+
+    def statistics(self):
+        """Return the statistics of all the tasks, keyed by task name."""
+
+        return {task.name: task.statistics() for task in self.tasks}
@@ -1,8 +1,29 @@
 # -*- coding: utf-8 -*-
 """Functions related to power to force conversion."""
 
-from sys import exit
 from pymarcyb.util.enumerations import ThrusterType
+import numpy as np
+
+
+GRAV = 9.81
+HP_PER_KW = 1.36332     # metric horsepower
+
+# IMCA conversion factors from kW to kN, indexed by ThrusterType value.
+# Column 0 is the positive direction, column 1 the negative direction.
+# Rows for values without an IMCA relationship (0 and vsp) are NaN.
+IMCA_CONVERSION_FACTORS = np.full((max(t.value for t in ThrusterType) + 1, 2), np.nan)
+IMCA_CONVERSION_FACTORS[ThrusterType.tunnel.value] = \
+    [11.0 * 10**-3 * HP_PER_KW * GRAV, -11.0 * 10**-3 * HP_PER_KW * GRAV]
+IMCA_CONVERSION_FACTORS[ThrusterType.azimuth.value] = \
+    [13.0 * 10**-3 * HP_PER_KW * GRAV, -8.0 * 10**-3 * HP_PER_KW * GRAV]
+IMCA_CONVERSION_FACTORS[ThrusterType.propeller.value] = \
+    [13.0 * 10**-3 * HP_PER_KW * GRAV, -0.7 * 13.0 * 10**-3 * HP_PER_KW * GRAV]
+IMCA_CONVERSION_FACTORS[ThrusterType.waterjet.value] = \
+    [8.0 * 10**-3 * HP_PER_KW * GRAV, 0.0]
+
+# ABS constant K for open and ducted propellers.
+ABS_K_OPEN = 848.0
+ABS_K_DUCTED = 1250.0
 
 
 def imca_p2f(thruster_type, max_power_positive, max_power_negative):
@@ -19,26 +40,13 @@ def imca_p2f(thruster_type, max_power_positive, max_power_negative):
     Returns:
         - max_force_positive (float)        -- maximum force, positive direction, in kN
         - max_force_negative (float)        -- maximum force, negative direction, in kN
+
+    Raises:
+        - ValueError                        -- if there is no IMCA relationship for the thruster type
     """
 
-    grav = 9.81
-    hp_per_Kw = 1.36332     # metric horsepower
-
-    if thruster_type is ThrusterType.tunnel:
-        conversion_factor_positive =  11.0 * 10**-3 * hp_per_Kw * grav
-        conversion_factor_negative = -11.0 * 10**-3 * hp_per_Kw * grav
-    elif thruster_type is ThrusterType.azimuth:
-        conversion_factor_positive =  13.0 * 10**-3 * hp_per_Kw * grav
-        conversion_factor_negative =  -8.0 * 10**-3 * hp_per_Kw * grav
-    elif thruster_type is ThrusterType.propeller:
-        conversion_factor_positive = 13.0 * 10**-3 * hp_per_Kw * grav
-        conversion_factor_negative = -0.7 * conversion_factor_positive
-    elif thruster_type is ThrusterType.waterjet:
-        conversion_factor_positive = 8.0 * 10**-3 * hp_per_Kw * grav
-        conversion_factor_negative = 0.0
-    else:
-        print("Illegal thruster type.")
-        exit(2)
+    conversion_factor_positive, conversion_factor_negative = \
+        imca_conversion_factors(thruster_type)
 
     max_force_positive = conversion_factor_positive * max_power_positive
     max_force_negative = conversion_factor_negative * max_power_negative
@@ -46,6 +54,84 @@ def imca_p2f(thruster_type, max_power_positive, max_power_negative):
     return max_force_positive, max_force_negative
 
 
+def imca_p2f_batch(thruster_types, max_power_positive, max_power_negative):
+    """Return the maximum forces a set of thrusters can apply, in kN, given the maximum power
+    each can deliver, according to the IMCA power-to-force relationship (see IMCA M 140).
+
+    Vectorized version of imca_p2f(). The conversion factors are looked up in
+    IMCA_CONVERSION_FACTORS, so no branching is done per thruster. The powers may have
+    extra leading dimensions (e.g. one row per power-limit scenario), they are broadcast
+    against thruster_types.
+
+    Args:
+        - thruster_types (array of ThrusterType or int)  -- type of each thruster
+        - max_power_positive (array of floats)           -- maximum power, positive direction, in kW
+        - max_power_negative (array of floats)           -- maximum power, negative direction, in kW
+
+    Returns:
+        - max_force_positive (np.ndarray)               -- maximum force, positive direction, in kN
+        - max_force_negative (np.ndarray)               -- maximum force, negative direction, in kN
+
+    Raises:
+        - ValueError                                    -- if any thruster type has no IMCA relationship
+    """
+
+    factors = imca_conversion_factors(thruster_types)
+
+    max_force_positive = factors[..., 0] * np.asarray(max_power_positive, dtype=float)
+    max_force_negative = factors[..., 1] * np.asarray(max_power_negative, dtype=float)
+
+    return max_force_positive, max_force_negative
+
+
+def imca_conversion_factors(thruster_types):
+    """Return the IMCA conversion factors from kW to kN for one or more thruster types.
+
+    Args:
+        - thruster_types (ThrusterType, int or array of those)  -- type of each thruster
+
+    Returns:
+        - factors (np.ndarray)     -- conversion factors, last axis is (positive, negative)
+
+    Raises:
+        - ValueError               -- if any thruster type has no IMCA relationship
+    """
+
+    indices = thruster_type_values(thruster_types)
+
+    valid = (indices >= 0) & (indices < IMCA_CONVERSION_FACTORS.shape[0])
+    factors = IMCA_CONVERSION_FACTORS[np.where(valid, indices, 0)]
+
+    illegal = ~valid | np.isnan(factors[..., 0])
+    if np.any(illegal):
+        raise ValueError("Illegal thruster type for IMCA power-to-force: {0}"
+                         .format(np.unique(indices[illegal]).tolist()))
+
+    return factors
+
+
+def thruster_type_values(thruster_types):
+    """Return the enum values of one or more thruster types as an integer array.
+
+    Args:
+        - thruster_types (ThrusterType, int or array of those)  -- type of each thruster
+
+    Returns:
+        - values (np.ndarray)      -- the ThrusterType values as integers
+    """
+
+    if isinstance(thruster_types, ThrusterType):
+        return np.asarray(thruster_types.value)
+
+    thruster_types = np.asarray(thruster_types)
+
+    if thruster_types.dtype == object:
+        thruster_types = np.vectorize(
+            lambda t: t.value if isinstance(t, ThrusterType) else t, otypes=[int])(thruster_types)
+
+    return thruster_types.astype(int)
+
+
 def abs_p2f(max_power_positive, max_power_negative, diameter, ducted):
     """Return the maximum force a thruster can apply, in kN, given the maximum power it can deliver,
     according to the ABS power-to-force relationship (see ABS Guide For Dynamic Positioning Systems).
@@ -64,11 +150,149 @@ def abs_p2f(max_power_positive, max_power_negative, diameter, ducted):
     """
 
     if ducted == False:
-        K = 848.0
+        K = ABS_K_OPEN
     else:
-        K = 1250.0
+        K = ABS_K_DUCTED
 
     max_force_positive = (K * (max_power_positive * diameter)**(2.0/3.0)) / 1000.0
     max_force_negative = (K * (max_power_negative * diameter)**(2.0/3.0)) / 1000.0
 
     return max_force_positive, max_force_negative
+
+
+def abs_p2f_batch(max_power_positive, max_power_negative, diameters, ducted):
+    """Return the maximum forces a set of thrusters can apply, in kN, given the maximum power
+    each can deliver, according to the ABS power-to-force relationship.
+
+    Vectorized version of abs_p2f(). All arguments are broadcast against each other.
+
+    Args:
+        - max_power_positive (array of floats)   -- maximum power, positive direction, in kW
+        - max_power_negative (array of floats)   -- maximum power, negative direction, in kW
+        - diameters (array of floats)            -- diameter of each thruster, in m
+        - ducted (array of bools)                -- true for the thrusters that are ducted
+
+    Returns:
+        - max_force_positive (np.ndarray)       -- maximum force, positive direction, in kN
+        - max_force_negative (np.ndarray)       -- maximum force, negative direction, in kN
+    """
+
+    K = np.where(np.asarray(ducted, dtype=bool), ABS_K_DUCTED, ABS_K_OPEN)
+    diameters = np.asarray(diameters, dtype=float)
+
+    max_force_positive = (K * (np.asarray(max_power_positive, dtype=float) * diameters)**(2.0/3.0)) / 1000.0
+    max_force_negative = (K * (np.asarray(max_power_negative, dtype=float) * diameters)**(2.0/3.0)) / 1000.0
+
+    return max_force_positive, max_force_negative
+
+
+def imca_f2p(thruster_type, force_positive, force_negative):
+    """Return the power a thruster needs to deliver, in kW, to apply a given force,
+    according to the IMCA power-to-force relationship (see IMCA M 140).
+
+    Inverse of imca_p2f(). The negative force has the same sign convention as in imca_p2f().
+
+    Args:
+        - thruster_type (ThrusterType enum)  -- type of thruster
+        - force_positive (float)             -- force, positive direction, in kN
+        - force_negative (float)             -- force, negative direction, in kN
+
+    Returns:
+        - power_positive (float)            -- power, positive direction, in kW
+        - power_negative (float)            -- power, negative direction, in kW (inf if the
+                                               thruster cannot apply force in that direction)
+
+    Raises:
+        - ValueError                        -- if there is no IMCA relationship for the thruster type
+    """
+
+    power_positive, power_negative = imca_f2p_batch(thruster_type, force_positive, force_negative)
+
+    return power_positive[()], power_negative[()]
+
+
+def imca_f2p_batch(thruster_types, force_positive, force_negative):
+    """Return the power a set of thrusters need to deliver, in kW, to apply given forces,
+    according to the IMCA power-to-force relationship (see IMCA M 140).
+
+    Vectorized version of imca_f2p(). The forces are broadcast against thruster_types.
+
+    Args:
+        - thruster_types (array of ThrusterType or int)  -- type of each thruster
+        - force_positive (array of floats)               -- force, positive direction, in kN
+        - force_negative (array of floats)               -- force, negative direction, in kN
+
+    Returns:
+        - power_positive (np.ndarray)                   -- power, positive direction, in kW
+        - power_negative (np.ndarray)                   -- power, negative direction, in kW
+
+    Raises:
+        - ValueError                                    -- if any thruster type has no IMCA relationship
+    """
+
+    factors = imca_conversion_factors(thruster_types)
+
+    power_positive = _divide_force(np.asarray(force_positive, dtype=float), factors[..., 0])
+    power_negative = _divide_force(np.asarray(force_negative, dtype=float), factors[..., 1])
+
+    return power_positive, power_negative
+
+
+def abs_f2p(force_positive, force_negative, diameter, ducted):
+    """Return the power a thruster needs to deliver, in kW, to apply a given force,
+    according to the ABS power-to-force relationship (see ABS Guide For Dynamic Positioning Systems).
+
+    Inverse of abs_p2f().
+
+    Args:
+        - force_positive (float)             -- force, positive direction, in kN
+        - force_negative (float)             -- force, negative direction, in kN (sign ignored)
+        - diameter (float)                   -- diameter of the thruster, in m
+        - ducted (bool)                      -- true if the thruster is ducted
+
+    Returns:
+        - power_positive (float)            -- power, positive direction, in kW
+        - power_negative (float)            -- power, negative direction, in kW
+    """
+
+    power_positive, power_negative = abs_f2p_batch(force_positive, force_negative, diameter, ducted)
+
+    return power_positive[()], power_negative[()]
+
+
+def abs_f2p_batch(force_positive, force_negative, diameters, ducted):
+    """Return the power a set of thrusters need to deliver, in kW, to apply given forces,
+    according to the ABS power-to-force relationship.
+
+    Vectorized version of abs_f2p(). All arguments are broadcast against each other.
+
+    Args:
+        - force_positive (array of floats)   -- force, positive direction, in kN
+        - force_negative (array of floats)   -- force, negative direction, in kN (sign ignored)
+        - diameters (array of floats)        -- diameter of each thruster, in m
+        - ducted (array of bools)            -- true for the thrusters that are ducted
+
+    Returns:
+        - power_positive (np.ndarray)       -- power, positive direction, in kW
+        - power_negative (np.ndarray)       -- power, negative direction, in kW
+    """
+
+    K = np.where(np.asarray(ducted, dtype=bool), ABS_K_DUCTED, ABS_K_OPEN)
+    diameters = np.asarray(diameters, dtype=float)
+
+    power_positive = (1000.0 * np.abs(np.asarray(force_positive, dtype=float)) / K)**1.5 / diameters
+    power_negative = (1000.0 * np.abs(np.asarray(force_negative, dtype=float)) / K)**1.5 / diameters
+
+    return power_positive, power_negative
+
+
+def _divide_force(force, conversion_factor):
+    """Divide force by conversion factor, giving inf power for forces that cannot be applied."""
+
+    force, conversion_factor = np.broadcast_arrays(force, conversion_factor)
+
+    power = np.full(force.shape, np.inf)
+    power[force == 0.0] = 0.0
+    np.divide(force, conversion_factor, out=power, where=conversion_factor != 0.0)
+
+    return power
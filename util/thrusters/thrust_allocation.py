@@ -0,0 +1,479 @@
+# -*- coding: utf-8 -*-
+"""Functions related to thrust allocation.
+
+Distributes a commanded force in surge and sway and moment in yaw over a set of
+tunnel thrusters, azimuth thrusters and main propellers.
+
+The allocation is done as weighted least-squares with the extended thrust
+formulation, i.e. azimuth thrusters are represented by their force in surge and
+sway. Force limits are handled with an active set method: the thrusters that
+saturate are fixed at their limit and the remaining force is redistributed on the
+others. When that does not reproduce the command, e.g. because a saturated azimuth
+thruster should turn, the allocation is solved as the quadratic program
+
+    minimize 0.5 u^T W u + 0.5 rho |tau - B u|^2_Q  subject to the force limits
+
+with a large rho, which gives the closest achievable force when the command is
+outside the limits. Azimuth rate limits fix the direction of the azimuth thrusters
+that would otherwise turn too fast.
+
+Positions are given in BODY, with x positive forward and y positive to starboard,
+relative to the origin the commanded moment is given about.
+"""
+
+from math import pi
+from pymarcyb.util.enumerations import ThrusterType
+from pymarcyb.util.thrusters import power_to_force as p2f
+import numpy as np
+
+# Weight rho of the residual, relative to the thruster cost weights. The dual of the quadratic
+# program is well conditioned for this weight, and the solution is then refined with the exact
+# weight, which reproduces the command when it is within the limits.
+RESIDUAL_WEIGHT = 1e4
+EXACT_RESIDUAL_WEIGHT = 1e14
+
+# Upper limit of the Newton iterations, for the residual weight and the exact weight
+MAX_NEWTON_ITERATIONS = 50
+MAX_EXACT_NEWTON_ITERATIONS = 5
+
+
+class ThrustAllocator(object):
+    """Thrust allocator for tunnel thrusters, azimuth thrusters and main propellers.
+
+    The configuration matrix and its weighted pseudo-inverse are computed when the
+    thruster layout is set. Pseudo-inverses for other sets of saturated thrusters are
+    cached the first time they are needed, and each call is warm-started from the
+    saturated set and azimuth angles of the previous call.
+    """
+
+    def __init__(self, thruster_types, positions, max_forces_positive, max_forces_negative,
+                 max_azimuth_rates=None, weights=None):
+        """Set up the allocator for a thruster layout.
+
+        Args:
+            thruster_types (array of ThrusterType)  -- type of each thruster
+            positions (array of floats)             -- (x, y) position of each thruster in m, shape (n, 2)
+            max_forces_positive (array of floats)   -- maximum force, positive direction, in kN
+            max_forces_negative (array of floats)   -- maximum force, negative direction, in kN (sign ignored)
+            max_azimuth_rates (array of floats)     -- maximum turning rate of each thruster in rad/s,
+                                                       None or inf for no limit (default: None)
+            weights (array of floats)               -- cost weight of each thruster (default: None, all 1.0)
+
+        Raises:
+            ValueError                              -- if a thruster type is not supported
+        """
+
+        self.set_layout(thruster_types, positions, max_forces_positive, max_forces_negative,
+                        max_azimuth_rates=max_azimuth_rates, weights=weights)
+
+    @classmethod
+    def from_power(cls, thruster_types, positions, max_power_positive, max_power_negative,
+                   diameters=None, ducted=None, max_azimuth_rates=None, weights=None):
+        """Set up the allocator with force limits calculated from thruster power.
+
+        The IMCA power-to-force relationship is used, unless diameters are given,
+        in which case the ABS relationship is used.
+
+        Args:
+            thruster_types (array of ThrusterType)  -- type of each thruster
+            positions (array of floats)             -- (x, y) position of each thruster in m, shape (n, 2)
+            max_power_positive (array of floats)    -- maximum power, positive direction, in kW
+            max_power_negative (array of floats)    -- maximum power, negative direction, in kW
+            diameters (array of floats)             -- diameter of each thruster in m (default: None)
+            ducted (array of bools)                 -- true for ducted thrusters, for ABS (default: None)
+            max_azimuth_rates (array of floats)     -- maximum turning rate of each thruster in rad/s
+                                                       (default: None)
+            weights (array of floats)               -- cost weight of each thruster (default: None)
+
+        Returns:
+            allocator (ThrustAllocator)             -- the thrust allocator
+        """
+
+        if diameters is None:
+            max_forces_positive, max_forces_negative = \
+                p2f.imca_p2f_batch(thruster_types, max_power_positive, max_power_negative)
+        else:
+            if ducted is None:
+                ducted = np.zeros(np.shape(diameters), dtype=bool)
+            max_forces_positive, max_forces_negative = \
+                p2f.abs_p2f_batch(max_power_positive, max_power_negative, diameters, ducted)
+
+        return cls(thruster_types, positions, max_forces_positive, max_forces_negative,
+                   max_azimuth_rates=max_azimuth_rates, weights=weights)
+
+    def set_layout(self, thruster_types, positions, max_forces_positive, max_forces_negative,
+                   max_azimuth_rates=None, weights=None):
+        """Set a new thruster layout, and recompute the configuration matrix.
+
+        Args:
+            thruster_types (array of ThrusterType)  -- type of each thruster
+            positions (array of floats)             -- (x, y) position of each thruster in m, shape (n, 2)
+            max_forces_positive (array of floats)   -- maximum force, positive direction, in kN
+            max_forces_negative (array of floats)   -- maximum force, negative direction, in kN (sign ignored)
+            max_azimuth_rates (array of floats)     -- maximum turning rate of each thruster in rad/s
+                                                       (default: None)
+            weights (array of floats)               -- cost weight of each thruster (default: None)
+
+        Raises:
+            ValueError                              -- if a thruster type is not supported
+        """
+
+        types = p2f.thruster_type_values(thruster_types).ravel()
+        n = len(types)
+        positions = np.asarray(positions, dtype=float).reshape(n, 2)
+
+        # One column per tunnel thruster and main propeller, two per azimuth thruster.
+        column_thruster, column_direction = [], []
+        for i, thruster_type in enumerate(types):
+            if thruster_type == ThrusterType.tunnel.value:
+                column_thruster.append(i)
+                column_direction.append(pi / 2)
+            elif thruster_type == ThrusterType.propeller.value:
+                column_thruster.append(i)
+                column_direction.append(0.0)
+            elif thruster_type == ThrusterType.azimuth.value:
+                column_thruster.extend([i, i])
+                column_direction.extend([0.0, pi / 2])
+            else:
+                raise ValueError("Illegal thruster type for thrust allocation: {0}"
+                                 .format(thruster_type))
+
+        column_thruster = np.array(column_thruster, dtype=int)
+        column_direction = np.array(column_direction)
+        x, y = positions[column_thruster, 0], positions[column_thruster, 1]
+
+        self.n_thrusters = n
+        self.thruster_types = types
+        self.positions = positions
+        self._column_thruster = column_thruster
+        self._column_direction = column_direction
+        self._B = np.vstack((np.cos(column_direction),
+                             np.sin(column_direction),
+                             x * np.sin(column_direction) - y * np.cos(column_direction)))
+
+        self._azimuths = np.flatnonzero(types == ThrusterType.azimuth.value)
+        first_column = np.searchsorted(column_thruster, self._azimuths)
+        self._azimuth_x = first_column
+        self._azimuth_y = first_column + 1
+        self._box = np.ones(len(column_thruster), dtype=bool)
+        self._box[self._azimuth_x] = False
+        self._box[self._azimuth_y] = False
+
+        if weights is None:
+            weights = np.ones(n)
+        self._inverse_weights = 1.0 / np.asarray(weights, dtype=float)[column_thruster]
+
+        # The residual moment is scaled with the thruster arm, so it is comparable with the forces
+        arm = max(1.0, np.sqrt(np.mean(np.sum(positions**2, axis=1)))) if n > 0 else 1.0
+        self._residual_scale = np.array([1.0, 1.0, arm**2]) * np.mean(self._inverse_weights)
+
+        if max_azimuth_rates is None:
+            max_azimuth_rates = np.full(n, np.inf)
+        self.max_azimuth_rates = np.asarray(max_azimuth_rates, dtype=float).reshape(n)
+
+        self.azimuth_angles = np.where(types == ThrusterType.tunnel.value, pi / 2, 0.0)
+        self.residual = np.zeros(3)
+
+        self._factor_cache = {}
+        self.set_force_limits(max_forces_positive, max_forces_negative)
+
+        # Factorize the configuration for the case where no thruster saturates.
+        self._factor(~self._previous_fixed, self._B, self._inverse_weights, True)
+
+    def set_force_limits(self, max_forces_positive, max_forces_negative):
+        """Set new force limits, e.g. after a change in available power or a thruster failure.
+
+        Does not change the configuration matrix.
+
+        Args:
+            max_forces_positive (array of floats)   -- maximum force, positive direction, in kN
+            max_forces_negative (array of floats)   -- maximum force, negative direction, in kN (sign ignored)
+        """
+
+        self.max_forces_positive = np.abs(np.asarray(max_forces_positive, dtype=float)).reshape(self.n_thrusters)
+        self.max_forces_negative = np.abs(np.asarray(max_forces_negative, dtype=float)).reshape(self.n_thrusters)
+
+        self._upper = self.max_forces_positive[self._column_thruster].copy()
+        self._lower = -self.max_forces_negative[self._column_thruster]
+        self._lower[~self._box] = -self._upper[~self._box]
+
+        self._previous_fixed = np.zeros(len(self._column_thruster), dtype=bool)
+        self._previous_u = np.zeros(len(self._column_thruster))
+
+    def allocate(self, tau, dt=None, thrust_reduction=None):
+        """Allocate a commanded force and moment to the thrusters.
+
+        If the command cannot be achieved within the limits, the closest achievable
+        force is allocated and the difference is stored in the residual attribute.
+
+        Args:
+            tau (array of floats)               -- commanded surge force, sway force and yaw moment,
+                                                   in kN and kNm
+            dt (float)                          -- time since the previous allocation in s, used with the
+                                                   azimuth rate limits (default: None, no rate limits)
+            thrust_reduction (array of floats)  -- thrust reduction ratio of each thruster, e.g. from
+                                                   ThrusterLayout.reductions() (default: None)
+
+        Returns:
+            thrusts (np.ndarray)                -- commanded thrust of each thruster in kN
+            angles (np.ndarray)                 -- commanded direction of each thruster in radians
+        """
+
+        tau = np.asarray(tau, dtype=float).reshape(3)
+        B, lower, upper = self._B, self._lower, self._upper
+        azimuth_x, azimuth_y = self._azimuth_x, self._azimuth_y
+        cacheable = thrust_reduction is None
+
+        if thrust_reduction is not None:
+            B = B * np.asarray(thrust_reduction, dtype=float)[self._column_thruster]
+
+        u = self._solve(tau, B, lower, upper, self._box, self._previous_fixed, self._previous_u, cacheable)
+        angles = self.azimuth_angles.copy()
+        directed = np.zeros(len(self._azimuths), dtype=bool)
+
+        if len(self._azimuths) > 0:
+            magnitudes = np.hypot(u[azimuth_x], u[azimuth_y])
+            active = magnitudes > 1e-9
+            wanted = np.where(active, np.arctan2(u[azimuth_y], u[azimuth_x]), angles[self._azimuths])
+
+            if dt is not None:
+                max_steps = self.max_azimuth_rates[self._azimuths] * dt
+                steps = (wanted - angles[self._azimuths] + pi) % (2 * pi) - pi
+                directed = active & (np.abs(steps) > max_steps)
+
+                if np.any(directed):
+                    steps = np.clip(steps, -max_steps, max_steps)
+                    wanted = np.where(directed, angles[self._azimuths] + steps, wanted)
+                    u, B = self._solve_directed(tau, B, directed, wanted)
+
+            angles[self._azimuths] = wanted
+
+        thrusts = np.zeros(self.n_thrusters)
+        box_columns = np.flatnonzero(self._box)
+        thrusts[self._column_thruster[box_columns]] = u[box_columns]
+
+        if len(self._azimuths) > 0:
+            thrusts[self._azimuths] = np.where(directed, u[azimuth_x], np.hypot(u[azimuth_x], u[azimuth_y]))
+
+        self.azimuth_angles = (angles + pi) % (2 * pi) - pi
+        self.residual = tau - B @ u
+
+        return thrusts, self.azimuth_angles.copy()
+
+    def _solve_directed(self, tau, B, directed, angles):
+        """Solve again, with the direction of some azimuth thrusters fixed.
+
+        Returns the solution and the configuration matrix it belongs to.
+        """
+
+        x_columns = self._azimuth_x[directed]
+        y_columns = self._azimuth_y[directed]
+        thrusters = self._azimuths[directed]
+
+        B = B.copy()
+        B[:, x_columns] = np.cos(angles[directed]) * B[:, x_columns] + np.sin(angles[directed]) * B[:, y_columns]
+        B[:, y_columns] = 0.0
+
+        lower, upper, box = self._lower.copy(), self._upper.copy(), self._box.copy()
+        lower[x_columns] = -self.max_forces_negative[thrusters]
+        lower[y_columns], upper[y_columns] = 0.0, 0.0
+        box[x_columns], box[y_columns] = True, True
+
+        fixed = np.zeros(len(box), dtype=bool)
+        fixed[y_columns] = True
+
+        u = self._solve(tau, B, lower, upper, box, fixed, np.zeros(len(box)), False, update_warm_start=False)
+
+        return u, B
+
+    def _solve(self, tau, B, lower, upper, box, fixed, u_start, cacheable, update_warm_start=True):
+        """Weighted least-squares with the force limits.
+
+        First tries the active set of the previous call, then builds the active set up from
+        scratch, one saturated thruster at a time. If neither reproduces the command, the
+        quadratic program is solved by _solve_dual().
+        """
+
+        pinned = lower == upper
+        tolerance = 1e-6 * (1.0 + np.linalg.norm(tau))
+        u = None
+
+        if np.any(fixed & ~pinned):
+            u, fixed_out = self._active_set(tau, B, lower, upper, box, fixed | pinned, u_start, cacheable, True)
+            if np.linalg.norm(tau - B @ u) > tolerance:
+                u = None
+
+        if u is None:
+            u, fixed_out = self._active_set(tau, B, lower, upper, box, pinned, u_start, cacheable, False)
+            if np.linalg.norm(tau - B @ u) > tolerance:
+                u, fixed_out = self._solve_dual(tau, B, lower, upper, box)
+
+        if update_warm_start:
+            self._previous_fixed = fixed_out
+            self._previous_u = u.copy()
+
+        return u
+
+    def _solve_dual(self, tau, B, lower, upper, box):
+        """Solve the quadratic program by Newton's method on its dual.
+
+        For the multipliers l, the thrusts that minimize the Lagrangian are the unconstrained
+        thrusts W^-1 B^T l, clipped to the limits or scaled onto the circle of the azimuth
+        thrusters. The dual g(l) = l^T tau - 0.5 l^T (rho Q)^-1 l - sum_j phi_j(B^T l) is
+        concave with the residual of those thrusts as gradient, so each Newton step is a 3x3
+        solve, with a backtracking line search.
+
+        Returns the solution and the saturated columns.
+        """
+
+        inverse_weights = self._inverse_weights
+        grouped = ~box[self._azimuth_x]
+        group_x, group_y = self._azimuth_x[grouped], self._azimuth_y[grouped]
+        radii = upper[group_x]
+
+        def thrusts(multipliers):
+            unconstrained = inverse_weights * (B.T @ multipliers)
+            u = np.clip(unconstrained, lower, upper)
+            magnitudes = np.hypot(unconstrained[group_x], unconstrained[group_y])
+            scale = np.minimum(1.0, radii / np.maximum(magnitudes, 1e-300))
+            u[group_x] = scale * unconstrained[group_x]
+            u[group_y] = scale * unconstrained[group_y]
+            return unconstrained, u, magnitudes, scale
+
+        def newton(multipliers, weight, max_iterations):
+            inverse_residual_weights = self._residual_scale / weight
+
+            def dual(multipliers, state):
+                unconstrained, u = state[0], state[1]
+                return multipliers @ tau - 0.5 * multipliers @ (inverse_residual_weights * multipliers) - \
+                    np.sum((unconstrained * u - 0.5 * u * u) / inverse_weights)
+
+            state = thrusts(multipliers)
+            value = dual(multipliers, state)
+
+            for _ in range(max_iterations):
+                unconstrained, u, magnitudes, scale = state
+                gradient = tau - inverse_residual_weights * multipliers - B @ u
+                if np.all(np.abs(gradient) <= 1e-13 * (1.0 + np.abs(tau))):
+                    break
+
+                # Generalized Hessian of -g, from the derivative of the thrusts with respect to l
+                slopes = np.where((unconstrained > lower) & (unconstrained < upper), inverse_weights, 0.0)
+                slopes[group_x] = slopes[group_y] = scale * inverse_weights[group_x]
+                hessian = (B * slopes) @ B.T + np.diag(inverse_residual_weights)
+                on_circle = magnitudes > radii
+                if np.any(on_circle):
+                    x, y = group_x[on_circle], group_y[on_circle]
+                    directions = (B[:, x] * unconstrained[x] + B[:, y] * unconstrained[y]) / magnitudes[on_circle]
+                    hessian -= (directions * slopes[x]) @ directions.T
+
+                step = np.linalg.solve(hessian, gradient)
+                slope = gradient @ step
+                length = 1.0
+                for _ in range(60):
+                    candidate = multipliers + length * step
+                    candidate_state = thrusts(candidate)
+                    candidate_value = dual(candidate, candidate_state)
+                    if candidate_value >= value + 1e-4 * length * slope:
+                        break
+                    length *= 0.5
+                else:
+                    break
+
+                multipliers, state, value = candidate, candidate_state, candidate_value
+                if length * np.linalg.norm(step) <= 1e-14 * np.linalg.norm(multipliers):
+                    break
+
+            return multipliers, state
+
+        multipliers, state = newton(np.zeros(3), RESIDUAL_WEIGHT, MAX_NEWTON_ITERATIONS)
+        _, exact_state = newton(multipliers, EXACT_RESIDUAL_WEIGHT, MAX_EXACT_NEWTON_ITERATIONS)
+        if np.all(np.abs(tau - B @ exact_state[1]) <= 1e-6 * (1.0 + np.abs(tau))):
+            state = exact_state
+
+        unconstrained, u, _, scale = state
+        fixed = (lower == upper) | (box & ((unconstrained <= lower) | (unconstrained >= upper)))
+        fixed[group_x] = fixed[group_y] = scale < 1.0
+
+        return u, fixed
+
+    def _active_set(self, tau, B, lower, upper, box, fixed, u_start, cacheable, release):
+        """Run the active set iterations from a given set of saturated thrusters."""
+
+        inverse_weights = self._inverse_weights
+        azimuth_x, azimuth_y = self._azimuth_x, self._azimuth_y
+        group_limits = upper[azimuth_x]
+        grouped = ~box[azimuth_x]
+
+        fixed = fixed.copy()
+        u = np.where(fixed, np.clip(u_start, lower, upper), 0.0)
+        magnitudes = np.hypot(u[azimuth_x], u[azimuth_y])
+        scale = np.where(grouped & (magnitudes > group_limits), group_limits / np.maximum(magnitudes, 1e-12), 1.0)
+        u[azimuth_x] *= scale
+        u[azimuth_y] *= scale
+
+        for _ in range(2 * len(u) + 2):
+            free = ~fixed
+            if not np.any(free):
+                break
+
+            G_inv = self._factor(free, B, inverse_weights, cacheable)
+            multipliers = G_inv @ (tau - B @ np.where(fixed, u, 0.0))
+            wanted = inverse_weights * (B.T @ multipliers)
+            u[free] = wanted[free]
+
+            # Saturate the thruster that exceeds its limit the most.
+            excess = np.zeros(len(u))
+            excess[box] = np.maximum(u[box] - upper[box], lower[box] - u[box]) / np.maximum(upper[box] - lower[box], 1e-12)
+            magnitudes = np.hypot(u[azimuth_x], u[azimuth_y])
+            excess[azimuth_x] = np.where(grouped, (magnitudes - group_limits) / np.maximum(group_limits, 1e-12),
+                                         excess[azimuth_x])
+            excess[fixed] = 0.0
+
+            worst = np.argmax(excess)
+            if excess[worst] > 1e-12:
+                if box[worst]:
+                    u[worst] = min(max(u[worst], lower[worst]), upper[worst])
+                    fixed[worst] = True
+                else:
+                    group = np.searchsorted(azimuth_x, worst)
+                    u[[azimuth_x[group], azimuth_y[group]]] *= group_limits[group] / magnitudes[group]
+                    fixed[[azimuth_x[group], azimuth_y[group]]] = True
+                continue
+
+            if not release:
+                break
+
+            # Release the saturated thrusters that would rather be inside their limits.
+            box_release = fixed & box & (wanted < upper) & (wanted > lower)
+            group_release = grouped & fixed[azimuth_x] & \
+                (np.hypot(wanted[azimuth_x], wanted[azimuth_y]) < group_limits)
+
+            if not (np.any(box_release) or np.any(group_release)):
+                break
+
+            fixed[box_release] = False
+            fixed[azimuth_x[group_release]] = False
+            fixed[azimuth_y[group_release]] = False
+
+        return u, fixed
+
+    def _factor(self, free, B, inverse_weights, cacheable):
+        """Return the inverse of the weighted configuration matrix product for the free columns."""
+
+        if cacheable:
+            key = free.tobytes()
+            G_inv = self._factor_cache.get(key)
+            if G_inv is not None:
+                return G_inv
+
+        weighted = B * (inverse_weights * free)
+        G = weighted @ B.T
+        G_inv = np.linalg.inv(G + 1e-12 * (np.trace(G) + 1.0) * np.eye(3))
+
+        if cacheable:
+            if len(self._factor_cache) > 1024:
+                self._factor_cache.clear()
+            self._factor_cache[key] = G_inv
+
+        return G_inv
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""Functions related to thruster interaction for a whole thruster layout.
+
+The effective thrust reduction ratio of every thruster is precomputed for a grid of
+azimuth angles, so that it can be looked up directly in the control loop.
+
+A thruster is reduced when its wake is directed at another thruster, according to
+the ABS in line tandem condition, and by the Coanda effect if it is mounted under
+the hull. The reduction ratios of all the thrusters hit by the wake are multiplied.
+"""
+
+from math import pi, radians
+from pymarcyb.util.thrusters import thruster_hull_interaction as thi
+from pymarcyb.util.thrusters import thruster_thruster_interaction as tti
+import numpy as np
+
+
+class ThrusterLayout(object):
+    """Table of effective thrust reduction ratios, shape (n_thrusters, n_azimuth_bins).
+
+    Bin k is centered at the azimuth angle k * 2 pi / n_azimuth_bins, where the angle
+    is the direction of the thrust. The wake goes in the opposite direction.
+
+    Changing the position, diameter or activity of a thruster only rebuilds the rows
+    of the thrusters whose reduction is affected by the change.
+    """
+
+    def __init__(self, positions, diameters, n_azimuth_bins=360, wake_half_angle=radians(10.0),
+                 under_hull=None, forbidden_limit=0.8, active=None):
+        """Set up the table for a thruster layout.
+
+        Args:
+            positions (array of floats)     -- (x, y) position of each thruster in m, shape (n, 2)
+            diameters (array of floats)     -- diameter of each thruster in m
+            n_azimuth_bins (int)            -- number of azimuth angles in the table (default: 360)
+            wake_half_angle (float)         -- half of the opening angle of the wake, in radians
+                                               (default: 10 degrees)
+            under_hull (array of bools)     -- true for the thrusters that have Coanda effect
+                                               (default: None, no thrusters)
+            forbidden_limit (float)         -- angles with a reduction ratio below this are
+                                               forbidden (default: 0.8)
+            active (array of bools)         -- false for the thrusters that are not running, and
+                                               therefore not affected by the wake of others
+                                               (default: None, all running)
+        """
+
+        self.positions = np.array(positions, dtype=float).reshape(-1, 2)
+        n = len(self.positions)
+
+        self.diameters = np.array(diameters, dtype=float).reshape(n)
+        self.n_azimuth_bins = n_azimuth_bins
+        self.bin_width = 2 * pi / n_azimuth_bins
+        self.wake_half_angle = wake_half_angle
+        self.forbidden_limit = forbidden_limit
+        self.under_hull = np.zeros(n, dtype=bool) if under_hull is None else np.array(under_hull, dtype=bool)
+        self.active = np.ones(n, dtype=bool) if active is None else np.array(active, dtype=bool)
+
+        self._wake_directions = np.arange(n_azimuth_bins) * self.bin_width + pi
+        self._pair_reduction = self._pair_reductions(np.arange(n), np.arange(n))
+        self.table = np.ones((n, n_azimuth_bins))
+        self.forbidden = np.zeros((n, n_azimuth_bins), dtype=bool)
+        self._rebuild_rows(np.arange(n))
+
+    @property
+    def n_thrusters(self):
+        """Number of thrusters in the layout."""
+
+        return len(self.positions)
+
+    def angle_index(self, angles):
+        """Return the table column for one or more azimuth angles.
+
+        Args:
+            angles (float or array of floats)   -- azimuth angles in radians
+
+        Returns:
+            index (int or np.ndarray)           -- the table columns
+        """
+
+        return np.rint(np.asarray(angles) / self.bin_width).astype(int) % self.n_azimuth_bins
+
+    def reduction(self, thruster, angle):
+        """Return the effective thrust reduction ratio of one thruster at one azimuth angle.
+
+        Args:
+            thruster (int)      -- index of the thruster
+            angle (float)       -- azimuth angle in radians
+
+        Returns:
+            t (float)           -- thrust reduction ratio, unitless
+        """
+
+        return self.table[thruster, int(round(angle / self.bin_width)) % self.n_azimuth_bins]
+
+    def reductions(self, angles):
+        """Return the effective thrust reduction ratio of every thruster.
+
+        Args:
+            angles (array of floats)    -- azimuth angle of each thruster in radians
+
+        Returns:
+            t (np.ndarray)              -- thrust reduction ratio of each thruster, unitless
+        """
+
+        return self.table[np.arange(self.n_thrusters), self.angle_index(angles)]
+
+    def is_forbidden(self, angles):
+        """Return whether the azimuth angle of each thruster is in a forbidden zone.
+
+        Args:
+            angles (array of floats)    -- azimuth angle of each thruster in radians
+
+        Returns:
+            forbidden (np.ndarray)      -- true for the thrusters in a forbidden zone
+        """
+
+        return self.forbidden[np.arange(self.n_thrusters), self.angle_index(angles)]
+
+    def move_thruster(self, thruster, position):
+        """Move a thruster and rebuild the affected rows.
+
+        Args:
+            thruster (int)              -- index of the thruster
+            position (array of floats)  -- new (x, y) position in m
+        """
+
+        self.positions[thruster] = position
+        self._update_thruster(thruster)
+
+    def set_diameter(self, thruster, diameter):
+        """Change the diameter of a thruster and rebuild its row.
+
+        Args:
+            thruster (int)      -- index of the thruster
+            diameter (float)    -- new diameter in m
+        """
+
+        self.diameters[thruster] = diameter
+        self._update_thruster(thruster)
+
+    def set_active(self, thruster, active):
+        """Start or stop a thruster and rebuild the affected rows.
+
+        Args:
+            thruster (int)      -- index of the thruster
+            active (bool)       -- true if the thruster is running
+        """
+
+        self.active[thruster] = active
+        self._update_thruster(thruster)
+
+    def _update_thruster(self, thruster):
+        """Recompute the pairs involving a thruster and rebuild the rows that changed."""
+
+        everyone = np.arange(self.n_thrusters)
+        as_target = self._pair_reductions(everyone, np.array([thruster]))[:, 0, :]
+        changed = np.any(as_target != self._pair_reduction[:, thruster, :], axis=1)
+        changed[thruster] = True
+
+        self._pair_reduction[:, thruster, :] = as_target
+        self._pair_reduction[thruster, :, :] = self._pair_reductions(np.array([thruster]), everyone)[0]
+        self._rebuild_rows(np.flatnonzero(changed))
+
+    def _rebuild_rows(self, rows):
+        """Rebuild the reduction table and forbidden zones for some thrusters."""
+
+        coanda = np.where(self.under_hull[rows], thi.abs_coanda_effect(), 1.0)
+        self.table[rows] = coanda[:, np.newaxis] * np.prod(self._pair_reduction[rows], axis=1)
+        self.forbidden[rows] = self.table[rows] < self.forbidden_limit
+
+    def _pair_reductions(self, thrusters, others):
+        """Return the thrust reduction ratio of each thruster due to its wake hitting each
+        of the others, shape (len(thrusters), len(others), n_azimuth_bins).
+        """
+
+        offsets = self.positions[others][np.newaxis, :, :] - self.positions[thrusters][:, np.newaxis, :]
+        distances = np.hypot(offsets[..., 0], offsets[..., 1])
+        bearings = np.arctan2(offsets[..., 1], offsets[..., 0])
+
+        misalignment = (self._wake_directions - bearings[..., np.newaxis] + pi) % (2 * pi) - pi
+        hit = (np.abs(misalignment) <= self.wake_half_angle) & (distances[..., np.newaxis] > 0.0) \
+            & self.active[others][np.newaxis, :, np.newaxis]
+
+        ratios = tti.abs_inline_tandem_condition(distances, self.diameters[thrusters][:, np.newaxis])
+
+        return np.where(hit, ratios[..., np.newaxis], 1.0)
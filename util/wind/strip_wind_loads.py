@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""Wind loads with the projected areas given as height bands.
+
+The lumped wind load model applies the wind speed at 10 m to the whole frontal
+and lateral area, which underestimates the loads on tall vessels. Here the areas
+are split into horizontal bands, each with the mean wind speed at its height,
+from the logarithmic profile of wind_spectrum.U10_to_Uz():
+
+    U(z) = U_10 + 2.5 sqrt(C_10 U_10) ln(z / 10)
+
+The load is the sum over the bands of A_i U(z_i)^2, which is the load of the
+lumped model with the area scaled by
+
+    sum A_i U(z_i)^2 / (A U_10^2) = (M_0 + 5 r M_1 + 6.25 r^2 M_2) / M_0,  r = sqrt(C_10 / U_10)
+
+where M_k = sum A_i ln(z_i / 10)^k are moments of the bands that depend on the
+vessel only. They are calculated once, so a load costs the same as with the
+lumped model, plus a few multiplications.
+
+The vessel speed is added to the wind at 10 m, so the angle of attack and the
+relative wind speed are those of the lumped model, and the height profile scales
+the dynamic pressure.
+"""
+
+from pymarcyb.util.enumerations import CoefficientType
+from pymarcyb.util.wind import wind_forces as wf
+from pymarcyb.util.wind import wind_spectrum as ws
+import numpy as np
+
+
+class StripWindLoads(object):
+    """Wind loads of a vessel with its frontal and lateral areas given as height bands."""
+
+    def __init__(self, frontal_heights, frontal_areas, lateral_heights, lateral_areas, C_10=0.0025):
+        """Set up the model and calculate the moments of the bands.
+
+        Args:
+            frontal_heights (array of floats)   -- heights of the centroids of the frontal bands above the
+                                                   water line in m
+            frontal_areas (array of floats)     -- areas of the frontal bands in m^2
+            lateral_heights (array of floats)   -- heights of the centroids of the lateral bands above the
+                                                   water line in m
+            lateral_areas (array of floats)     -- areas of the lateral bands in m^2
+            C_10 (float)                        -- surface drag coefficient at altitude 10 m (default: 0.0025)
+
+        Raises:
+            ValueError                          -- if a band is not above the water line
+        """
+
+        self.C_10 = C_10
+        self.frontal_heights = np.asarray(frontal_heights, dtype=float)
+        self.frontal_areas = np.asarray(frontal_areas, dtype=float)
+        self.lateral_heights = np.asarray(lateral_heights, dtype=float)
+        self.lateral_areas = np.asarray(lateral_areas, dtype=float)
+
+        for heights in (self.frontal_heights, self.lateral_heights):
+            if np.any(heights <= 0.0):
+                raise ValueError("Illegal band height: {0}".format(heights[heights <= 0.0].tolist()))
+
+        self.frontal_area = self.frontal_areas.sum()
+        self.lateral_area = self.lateral_areas.sum()
+        self.frontal_moments = _moments(self.frontal_heights, self.frontal_areas)
+        self.lateral_moments = _moments(self.lateral_heights, self.lateral_areas)
+
+    def area_factors(self, U_10):
+        """Return the factors that scale the lumped loads to the strip loads.
+
+        Args:
+            U_10 (array of floats)      -- mean wind speed at 10 m altitude [m/s]
+
+        Returns:
+            frontal_factor (np.ndarray) -- factor of the surge force
+            lateral_factor (np.ndarray) -- factor of the sway force and yaw moment
+        """
+
+        U_10 = np.asarray(U_10, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r = np.where(U_10 > 0.0, np.sqrt(self.C_10 / U_10), 0.0)
+
+        frontal_factor = (self.frontal_moments[0] + 5.0 * r * self.frontal_moments[1] +
+                          6.25 * r**2 * self.frontal_moments[2]) / self.frontal_moments[0]
+        lateral_factor = (self.lateral_moments[0] + 5.0 * r * self.lateral_moments[1] +
+                          6.25 * r**2 * self.lateral_moments[2]) / self.lateral_moments[0]
+
+        return frontal_factor, lateral_factor
+
+    def band_wind_speeds(self, U_10):
+        """Return the mean wind speeds at the heights of the bands.
+
+        Args:
+            U_10 (array of floats)      -- mean wind speed at 10 m altitude [m/s]
+
+        Returns:
+            frontal_speeds (np.ndarray) -- wind speeds at the frontal bands, shape (..., n_frontal_bands)
+            lateral_speeds (np.ndarray) -- wind speeds at the lateral bands, shape (..., n_lateral_bands)
+        """
+
+        U_10 = np.asarray(U_10, dtype=float)[..., np.newaxis]
+
+        return (ws.U10_to_Uz_batch(U_10, self.C_10, self.frontal_heights),
+                ws.U10_to_Uz_batch(U_10, self.C_10, self.lateral_heights))
+
+    def wind_forces_and_moment_batch(self, wind_speed, wind_direction, Loa, s_L, coeffs=CoefficientType.blendermann,
+                                     vessel_type=None, superstructure_area=None, breadth=None, S=None, masts=None,
+                                     temperature=20.0, vessel_heading=0.0, vessel_speed_surge=0.0,
+                                     vessel_speed_sway=0.0, coefficient_fit=None):
+        """Return the wind force (surge and sway) and moment (yaw) acting on the vessel, with the
+        wind profile over the height bands.
+
+        The wind speed is the mean wind speed at 10 m. The total areas of the bands are used as the
+        frontal and lateral areas. See wind_forces.wind_forces_and_moment_batch() for the arguments.
+
+        Returns:
+            wind_forces_and_moment (np.ndarray) -- the wind forces and moment in kN/kNm, shape (3, ...)
+
+        Raises:
+            ValueError                          -- if the parameters for the coefficient type are missing
+        """
+
+        loads = wf.wind_forces_and_moment_batch(
+            wind_speed, wind_direction, self.frontal_area, self.lateral_area, Loa, s_L, coeffs=coeffs,
+            vessel_type=vessel_type, superstructure_area=superstructure_area, breadth=breadth, S=S, masts=masts,
+            temperature=temperature, vessel_heading=vessel_heading, vessel_speed_surge=vessel_speed_surge,
+            vessel_speed_sway=vessel_speed_sway, coefficient_fit=coefficient_fit)
+
+        frontal_factor, lateral_factor = self.area_factors(wind_speed)
+        loads[0] *= frontal_factor
+        loads[1:] *= lateral_factor
+
+        return loads
+
+
+def _moments(heights, areas):
+    """Return the moments sum A_i ln(z_i / 10)^k of the bands, for k = 0, 1 and 2."""
+
+    logarithms = np.log(heights / 10.0)
+
+    return np.array([areas.sum(), (areas * logarithms).sum(), (areas * logarithms**2).sum()])
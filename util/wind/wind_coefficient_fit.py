@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""Truncated Fourier series fits of wind coefficients.
+
+The wind coefficients C_X, C_Y and C_N of a vessel are periodic in the angle of
+attack, so they can be compressed to a few Fourier coefficients each:
+
+    C(alpha) = a_0 + sum_k (a_k cos(k alpha) + b_k sin(k alpha)),  k = 1 ... order
+
+The series is fitted by least squares to samples of Blendermann's or Isherwood's
+coefficients, or to a measured wind tunnel table. Evaluating it is a Horner loop
+over the order in e^(i alpha), i.e. a few multiply-adds per angle, and the
+derivatives with respect to the angle of attack are exact and smooth, unlike
+the derivatives of the piecewise-linear Isherwood interpolation.
+
+Tables that only cover 0 to 180 degrees are mirrored to the port side, with
+C_X even and C_Y and C_N odd in the angle of attack.
+"""
+
+from pymarcyb.util.wind import wind_coefficients as wc
+import numpy as np
+
+
+class WindCoefficientFit(object):
+    """Fourier series of C_X, C_Y and C_N in the angle of attack."""
+
+    def __init__(self, cosine_coefficients, sine_coefficients):
+        """Set up the fit from its coefficients. Use one of the from_* methods to fit them.
+
+        Args:
+            cosine_coefficients (np.ndarray)    -- a_0 ... a_order of C_X, C_Y and C_N, shape (3, order + 1)
+            sine_coefficients (np.ndarray)      -- b_0 ... b_order of C_X, C_Y and C_N, shape (3, order + 1),
+                                                   b_0 is not used
+        """
+
+        self.cosine_coefficients = np.array(cosine_coefficients, dtype=float)
+        self.sine_coefficients = np.array(sine_coefficients, dtype=float)
+        self.sine_coefficients[:, 0] = 0.0
+        self.order = self.cosine_coefficients.shape[1] - 1
+
+        # Errors at the fitted samples, set by from_samples()
+        self.rms_error = None
+        self.max_error = None
+
+        # C(alpha) = Re(sum_k c_k z^k) with z = e^(i alpha) and c_k = a_k - i b_k,
+        # and dC/dalpha = Re(sum_k i k c_k z^k)
+        complex_coefficients = self.cosine_coefficients - 1j * self.sine_coefficients
+        self._coefficients = complex_coefficients[:, ::-1].copy()
+        self._derivative_coefficients = (1j * np.arange(self.order + 1) * complex_coefficients)[:, ::-1].copy()
+
+    @classmethod
+    def from_samples(cls, angles_of_attack, C_X, C_Y, C_N, order, symmetric=False):
+        """Fit the series to samples of the coefficients by least squares.
+
+        Args:
+            angles_of_attack (array of floats)  -- the angles of attack in radians
+            C_X (array of floats)               -- wind coefficients in surge
+            C_Y (array of floats)               -- wind coefficients in sway
+            C_N (array of floats)               -- wind coefficients in yaw
+            order (int)                         -- the highest harmonic of the series
+            symmetric (bool)                    -- mirror the samples to negative angles, with C_X even and
+                                                   C_Y and C_N odd (default: False)
+
+        Returns:
+            fit (WindCoefficientFit)            -- the fit, with the errors at the samples
+
+        Raises:
+            ValueError                          -- if the order is negative, or too high for the samples
+        """
+
+        angles = np.asarray(angles_of_attack, dtype=float).ravel()
+        samples = np.array([np.broadcast_to(np.asarray(C, dtype=float).ravel(), angles.shape)
+                            for C in (C_X, C_Y, C_N)])
+
+        if symmetric:
+            mirrored = np.sin(angles) != 0.0
+            angles = np.concatenate((angles, -angles[mirrored]))
+            samples = np.concatenate((samples, np.array([[1.0], [-1.0], [-1.0]]) * samples[:, mirrored]), axis=1)
+
+        n_angles = len(np.unique(np.round(np.mod(angles, 2 * np.pi), 12)))
+        if order < 0 or 2 * order + 1 > n_angles:
+            raise ValueError("Illegal order for {0} distinct angles: {1}".format(n_angles, order))
+
+        harmonics = np.outer(angles, np.arange(order + 1))
+        design = np.hstack((np.cos(harmonics), np.sin(harmonics[:, 1:])))
+        solution = np.linalg.lstsq(design, samples.T, rcond=None)[0].T
+
+        sine_coefficients = np.zeros((3, order + 1))
+        sine_coefficients[:, 1:] = solution[:, order + 1:]
+        fit = cls(solution[:, :order + 1], sine_coefficients)
+
+        errors = np.array(fit.evaluate(angles)) - samples
+        fit.rms_error = np.sqrt(np.mean(errors**2, axis=1))
+        fit.max_error = np.abs(errors).max(axis=1)
+
+        return fit
+
+    @classmethod
+    def from_blendermann(cls, vessel_type, frontal_area, lateral_area, Loa, s_L, order=12, n_samples=720):
+        """Fit the series to Blendermann's coefficients. See wind_coefficients.blendermann() for the
+        vessel arguments.
+
+        Args:
+            order (int)                 -- the highest harmonic of the series (default: 12)
+            n_samples (int)             -- number of angles of attack over the full circle (default: 720)
+
+        Returns:
+            fit (WindCoefficientFit)    -- the fit
+        """
+
+        angles = np.linspace(0.0, 2 * np.pi, n_samples, endpoint=False)
+
+        return cls.from_samples(angles, *wc.blendermann(vessel_type, frontal_area, lateral_area, Loa, s_L, angles),
+                                order=order)
+
+    @classmethod
+    def from_isherwood(cls, frontal_area, lateral_area, superstructure_area, Loa, breadth, S, s_L, masts, order=12,
+                       n_samples=361):
+        """Fit the series to Isherwood's coefficients, mirrored to the port side. See
+        wind_coefficients.isherwood() for the vessel arguments.
+
+        Args:
+            order (int)                 -- the highest harmonic of the series (default: 12)
+            n_samples (int)             -- number of angles of attack from 0 to 180 degrees (default: 361)
+
+        Returns:
+            fit (WindCoefficientFit)    -- the fit
+        """
+
+        angles = np.linspace(0.0, np.pi, n_samples)
+        coefficients = wc.isherwood(frontal_area, lateral_area, superstructure_area, Loa, breadth, S, s_L, masts,
+                                    angles)
+
+        return cls.from_samples(angles, *coefficients, order=order, symmetric=True)
+
+    @classmethod
+    def from_table(cls, table, order, degrees=True):
+        """Fit the series to a measured table of wind coefficients, e.g. from a wind tunnel.
+
+        A table with angles from 0 to 180 degrees only is mirrored to the port side.
+
+        Args:
+            table (string or np.ndarray)    -- path to a CSV file with a header line, or an array, with the
+                                               columns angle of attack, C_X, C_Y and C_N
+            order (int)                     -- the highest harmonic of the series
+            degrees (bool)                  -- the angles are in degrees (default: True)
+
+        Returns:
+            fit (WindCoefficientFit)        -- the fit
+        """
+
+        if isinstance(table, str):
+            table = np.loadtxt(table, delimiter=",", skiprows=1, ndmin=2)
+
+        table = np.asarray(table, dtype=float)
+        angles = np.radians(table[:, 0]) if degrees else table[:, 0]
+        symmetric = angles.min() >= 0.0 and angles.max() <= np.pi + 1e-9
+
+        return cls.from_samples(angles, table[:, 1], table[:, 2], table[:, 3], order=order, symmetric=symmetric)
+
+    def evaluate(self, angle_of_attack, dtype=np.float64):
+        """Return the wind coefficients at some angles of attack.
+
+        Args:
+            angle_of_attack (array of floats)   -- the angles of attack in radians
+            dtype (np.dtype)                    -- float32 or float64, the precision of the calculation.
+                                                   With float32 the coefficients are within 1e-6 of float64,
+                                                   relative to the largest of each (default: float64)
+
+        Returns:
+            C_X (np.ndarray)                    -- wind coefficients in surge
+            C_Y (np.ndarray)                    -- wind coefficients in sway
+            C_N (np.ndarray)                    -- wind coefficients in yaw
+        """
+
+        C_X, C_Y, C_N = _horner(self._coefficients, angle_of_attack, dtype)
+
+        return C_X, C_Y, C_N
+
+    def derivatives(self, angle_of_attack):
+        """Return the derivatives of the wind coefficients with respect to the angle of attack.
+
+        Args:
+            angle_of_attack (array of floats)   -- the angles of attack in radians
+
+        Returns:
+            dC_X (np.ndarray)                   -- derivative of the wind coefficient in surge per radian
+            dC_Y (np.ndarray)                   -- derivative of the wind coefficient in sway per radian
+            dC_N (np.ndarray)                   -- derivative of the wind coefficient in yaw per radian
+        """
+
+        dC_X, dC_Y, dC_N = _horner(self._derivative_coefficients, angle_of_attack)
+
+        return dC_X, dC_Y, dC_N
+
+
+def _horner(coefficients, angle_of_attack, dtype=np.float64):
+    """Return the real part of the polynomials in e^(i alpha), with the coefficients highest order first,
+    calculated in the complex type of dtype.
+    """
+
+    z = np.exp(1j * np.asarray(angle_of_attack, dtype=dtype))
+    coefficients = coefficients.astype(z.dtype, copy=False)
+    result = np.multiply.outer(coefficients[:, 0], np.ones_like(z))
+    for coefficient in coefficients[:, 1:].T:
+        result *= z
+        result += coefficient.reshape((3,) + (1,) * z.ndim)
+
+    return result.real
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""Spatially coherent wind gust fields at several points.
+
+The gusts at points some distance apart are partly correlated. The correlation
+is given by Davenport's coherence, which falls off with the frequency and the
+separation of the points:
+
+    coh_jk(f) = exp(-f sqrt((C_x dx)^2 + (C_y dy)^2 + (C_z dz)^2) / U_10)
+
+The cross-spectral matrix at each frequency is the point spectrum times the
+coherence matrix. The coherence matrices of all frequencies are decomposed in
+one batched Cholesky (or eigen) decomposition, and the gusts are synthesized as
+sums of harmonic components with independent random phases (Shinozuka's
+method), with one inverse FFT per point. The decomposition only depends on the
+points, wind speed, spectrum and time grid, so it is made once per WindField and
+reused for every seed.
+
+Records longer than one FFT block are streamed block by block. The blocks are
+joined by crossfades with weights whose squares sum to one, so the variance and
+the coherence are kept across the joins.
+"""
+
+from pymarcyb.util.enumerations import WindSpectrumType
+from pymarcyb.util.wind import wind_spectrum as ws
+import numpy as np
+
+# Davenport decay coefficients along the wind, across the wind and vertically
+DAVENPORT_DECAY = (3.0, 10.0, 10.0)
+
+
+class WindField(object):
+    """Generator of coherent gust time series at several points."""
+
+    def __init__(self, points, U_10, n_samples, dt, spectrum_type=WindSpectrumType.harris, decay=DAVENPORT_DECAY,
+                 method="cholesky", **parameters):
+        """Set up the generator and decompose the cross-spectral matrices.
+
+        Args:
+            points (array of floats)            -- positions of the points in m, along the wind, across the
+                                                   wind and up, shape (n_points, 3)
+            U_10 (float)                        -- mean wind speed at 10 m altitude [m/s]
+            n_samples (int)                     -- number of samples per block
+            dt (float)                          -- time step [s]
+            spectrum_type (WindSpectrumType)    -- the point spectrum (default: harris)
+            decay (tuple of floats)             -- Davenport decay coefficients along the wind, across the
+                                                   wind and vertically (default: DAVENPORT_DECAY)
+            method (string)                     -- "cholesky" or "eigen", the latter also works for
+                                                   coincident points (default: "cholesky")
+            parameters                          -- the spectrum parameters, e.g. kappa and L
+
+        Raises:
+            ValueError                          -- if the method is unknown, or the coherence matrices are
+                                                   not positive definite with Cholesky
+        """
+
+        if method not in ("cholesky", "eigen"):
+            raise ValueError("Illegal decomposition method: {0}".format(method))
+
+        self.points = np.atleast_2d(np.asarray(points, dtype=float))
+        self.U_10 = U_10
+        self.n_samples = n_samples
+        self.dt = dt
+        self.frequencies = np.fft.rfftfreq(n_samples, dt)
+
+        # The point spectrum, which is not defined at zero frequency
+        spectrum = np.zeros(len(self.frequencies))
+        spectrum[1:] = ws.wind_spectrum_batch(spectrum_type, U_10, self.frequencies[1:], **parameters)
+        df = self.frequencies[1]
+        amplitudes = np.sqrt(2.0 * spectrum * df)
+        amplitudes[0] = 0.0
+        if n_samples % 2 == 0:
+            amplitudes[-1] = 0.0
+
+        # Davenport coherence of all point pairs at all frequencies, shape (n_frequencies, n_points, n_points)
+        separations = self.points[:, np.newaxis, :] - self.points[np.newaxis, :, :]
+        distances = np.sqrt(((np.asarray(decay) * separations)**2).sum(axis=-1))
+        coherence = np.exp(-self.frequencies[:, np.newaxis, np.newaxis] * distances / U_10)
+        # Full coherence at zero frequency is singular, and has no energy anyway
+        coherence[0] = np.eye(len(self.points))
+
+        if method == "cholesky":
+            try:
+                factors = np.linalg.cholesky(coherence)
+            except np.linalg.LinAlgError:
+                raise ValueError("The coherence matrices are not positive definite, use method=\"eigen\".")
+        else:
+            eigenvalues, eigenvectors = np.linalg.eigh(coherence)
+            factors = eigenvectors * np.sqrt(np.maximum(eigenvalues, 0.0))[:, np.newaxis, :]
+
+        # The harmonic amplitudes of the inverse FFT are included in the factors
+        self._factors = (0.5 * n_samples * amplitudes)[:, np.newaxis, np.newaxis] * factors
+
+    @property
+    def n_points(self):
+        """Number of points."""
+
+        return len(self.points)
+
+    def generate(self, rng=None):
+        """Return one block of gust time series.
+
+        Args:
+            rng (np.random.Generator)   -- random generator or seed for the phases (default: None, fresh entropy)
+
+        Returns:
+            gusts (np.ndarray)          -- zero-mean gusts in m/s, to add to the mean wind speed, shape
+                                           (n_points, n_samples)
+        """
+
+        rng = np.random.default_rng(rng)
+        phases = rng.uniform(0.0, 2 * np.pi, (len(self.frequencies), self.n_points, 1))
+        components = np.matmul(self._factors, np.exp(1j * phases))[:, :, 0]
+
+        return np.fft.irfft(components.T, self.n_samples)
+
+    def stream(self, n_samples, rng=None, n_overlap=None):
+        """Yield gust time series longer than a block, in chunks.
+
+        The chunks are consecutive parts of one record. Each chunk is a new block,
+        crossfaded with the end of the previous one.
+
+        Args:
+            n_samples (int)             -- total number of samples of the record
+            rng (np.random.Generator)   -- random generator or seed for the phases (default: None, fresh entropy)
+            n_overlap (int)             -- number of samples of the crossfades, at most half a block
+                                           (default: None, 1/8 of a block)
+
+        Yields:
+            gusts (np.ndarray)          -- the next chunk of zero-mean gusts in m/s, shape
+                                           (n_points, n_samples per block - n_overlap), the last one shorter
+
+        Raises:
+            ValueError                  -- if n_overlap is negative, or longer than half a block
+        """
+
+        n_overlap = self.n_samples // 8 if n_overlap is None else n_overlap
+        if not 0 <= n_overlap <= self.n_samples // 2:
+            raise ValueError("Illegal number of overlapping samples: {0}".format(n_overlap))
+
+        return self._stream(n_samples, np.random.default_rng(rng), n_overlap)
+
+    def _stream(self, n_samples, rng, n_overlap):
+        """Yield the chunks of stream(), with the arguments checked."""
+
+        n_step = self.n_samples - n_overlap
+
+        # Power complementary crossfade, fade_in^2 + fade_out^2 = 1
+        angles = 0.5 * np.pi * (np.arange(n_overlap) + 0.5) / max(n_overlap, 1)
+        fade_in, fade_out = np.sin(angles), np.cos(angles)
+
+        block = self.generate(rng)
+        chunk = block[:, :n_step]
+        remaining = n_samples
+        while remaining > 0:
+            yield chunk[:, :remaining]
+            remaining -= chunk.shape[1]
+            if remaining <= 0:
+                return
+
+            following = self.generate(rng)
+            chunk = np.concatenate((block[:, n_step:] * fade_out + following[:, :n_overlap] * fade_in,
+                                    following[:, n_overlap:n_step]), axis=1)
+            block = following
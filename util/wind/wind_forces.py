@@ -2,15 +2,15 @@
 """Functions related to wind forces."""
 
 from pymarcyb.util.enumerations import CoefficientType
+from pymarcyb.util.loads import flow_loads as fl
 from pymarcyb.util.wind import wind_coefficients as wc
-from math import pi
 import numpy as np
 
 
 def wind_forces_and_moment(wind_speed, wind_direction, frontal_area, lateral_area, Loa, s_L, coeffs=
                            CoefficientType.blendermann, vessel_type=None, superstructure_area=None, breadth=None,
                            S=None, masts=None, temperature=20.0, vessel_heading=0.0, vessel_speed_surge=0.0,
-                           vessel_speed_sway=0.0):
+                           vessel_speed_sway=0.0, coefficient_fit=None):
     """Return the wind force (surge and sway) and moment (yaw) acting
     on the vessel.
 
@@ -31,48 +31,102 @@ def wind_forces_and_moment(wind_speed, wind_direction, frontal_area, lateral_are
         vessel_heading (float)              -- vessel heading in radians (default: 0.0)
         vessel_speed_surge (float)          -- vessel speed in surge in m/s (default: 0.0)
         vessel_speed_sway (float)           -- vessel speed in sway in m/s (default: 0.0)
+        coefficient_fit (WindCoefficientFit)-- Fourier fit of the coefficients for use with fourier_fit
+                                               (default: None)
 
     Returns:
         wind_forces_and_moment (np.matrix)  -- the wind forces and moment in kN/kNm
     """
 
-    rho_w = calculate_rho_w(temperature)
+    # Calculate coefficients depending on coefficient calculation method
+    if coeffs is CoefficientType.blendermann and vessel_type is None:
+        print("Please enter the correct parameters for Blendermann.\n")
+        return np.matrix(np.zeros((3, 1)))
+    elif coeffs is CoefficientType.isherwood and \
+            (superstructure_area is None or breadth is None or S is None or masts is None):
+        print("Please enter the correct parameters for Isherwood.\n")
+        return np.matrix(np.zeros((3, 1)))
+    elif coeffs is CoefficientType.fourier_fit and coefficient_fit is None:
+        print("Please enter the coefficient fit.\n")
+        return np.matrix(np.zeros((3, 1)))
+
+    wind_forces_and_moment = wind_forces_and_moment_batch(
+        wind_speed, wind_direction, frontal_area, lateral_area, Loa, s_L, coeffs=coeffs, vessel_type=vessel_type,
+        superstructure_area=superstructure_area, breadth=breadth, S=S, masts=masts, temperature=temperature,
+        vessel_heading=vessel_heading, vessel_speed_surge=vessel_speed_surge, vessel_speed_sway=vessel_speed_sway,
+        coefficient_fit=coefficient_fit)
+
+    return np.matrix(wind_forces_and_moment.reshape(3, 1))
+
+
+def wind_forces_and_moment_batch(wind_speed, wind_direction, frontal_area, lateral_area, Loa, s_L, coeffs=
+                                 CoefficientType.blendermann, vessel_type=None, superstructure_area=None,
+                                 breadth=None, S=None, masts=None, temperature=20.0, vessel_heading=0.0,
+                                 vessel_speed_surge=0.0, vessel_speed_sway=0.0, coefficient_fit=None,
+                                 dtype=np.float64):
+    """Return the wind force (surge and sway) and moment (yaw) acting
+    on the vessel, for arrays of wind and vessel conditions.
+
+    Vectorized version of wind_forces_and_moment(). The wind speed, wind direction,
+    temperature, vessel heading and vessel speeds are broadcast against each other.
+
+    With dtype float32, the whole calculation is done in float32. The loads are then
+    within 1e-5 of the largest load magnitude, relative to float64.
+
+    Args:
+        wind_speed (array of floats)        -- wind speed in m/s
+        wind_direction (array of floats)    -- wind direction in radians
+        frontal_area (float)                -- frontal area of the vessel in m^2
+        lateral_area (float)                -- lateral area of the vessel in m^2
+        Loa (float)                         -- vessel length over all in m
+        s_L (float)                         -- centroid of the wind area in the lateral direction, ahead of Lpp/2, in m
+        coeffs (CoefficientType)            -- how to determine the wind coefficients
+        vessel_type (string)                -- vessel type to use with Blendermann (default: None)
+        superstructure_area (float)         -- lateral superstructure area in m^2 for use with Isherwood (default: None)
+        breadth (float)                     -- vessel breadth in m (default: None)
+        S (float)                           -- length of the lateral proj. in m for use with Isherwood (default: None)
+        masts (int)                         -- number of masts or king posts for use with Isherwood (default: None)
+        temperature (array of floats)       -- temperature in degrees C (default: 20)
+        vessel_heading (array of floats)    -- vessel heading in radians (default: 0.0)
+        vessel_speed_surge (array of floats)-- vessel speed in surge in m/s (default: 0.0)
+        vessel_speed_sway (array of floats) -- vessel speed in sway in m/s (default: 0.0)
+        coefficient_fit (WindCoefficientFit)-- Fourier fit of the coefficients for use with fourier_fit
+                                               (default: None)
+        dtype (np.dtype)                    -- float32 or float64, the precision of the calculation
+                                               (default: float64)
+
+    Returns:
+        wind_forces_and_moment (np.ndarray) -- the wind forces and moment in kN/kNm, shape (3, ...)
+
+    Raises:
+        ValueError                          -- if the parameters for the coefficient type are missing
+    """
 
-    # Relative velocities
-    wind_speed_surge = wind_speed * np.cos(wind_direction - vessel_heading)
-    wind_speed_sway  = wind_speed * np.sin(wind_direction - vessel_heading)
-    relative_velocity_surge = vessel_speed_surge - wind_speed_surge
-    relative_velocity_sway  = vessel_speed_sway  - wind_speed_sway
-    relative_wind_speed = np.sqrt(relative_velocity_surge**2 + relative_velocity_sway**2)
+    rho_w = calculate_rho_w(np.asarray(temperature, dtype=dtype))
 
-    # The wind is coming from the angle of attack
-    angle_of_attack = np.arctan2(relative_velocity_sway, relative_velocity_surge) + pi
+    relative_wind_speed, angle_of_attack = fl.relative_flow(wind_speed, wind_direction, vessel_heading,
+                                                            vessel_speed_surge, vessel_speed_sway, dtype=dtype)
 
     # Calculate coefficients depending on coefficient calculation method
     if coeffs is CoefficientType.blendermann:
         if vessel_type is None:
-            print("Please enter the correct parameters for Blendermann.\n")
-            C_X, C_Y, C_N = 0, 0, 0
-        else:
-            C_X, C_Y, C_N = wc.blendermann(vessel_type, frontal_area, lateral_area, Loa, s_L, angle_of_attack)
+            raise ValueError("Please enter the correct parameters for Blendermann.")
+        C_X, C_Y, C_N = wc.blendermann(vessel_type, frontal_area, lateral_area, Loa, s_L, angle_of_attack,
+                                       dtype=dtype)
     elif coeffs is CoefficientType.isherwood:
         if superstructure_area is None or breadth is None or S is None or masts is None:
-            print("Please enter the correct parameters for Isherwood.\n")
-            C_X, C_Y, C_N = 0, 0, 0
-        else:
-            C_X, C_Y, C_N = wc.isherwood(frontal_area, lateral_area, superstructure_area, Loa, breadth, S, s_L, masts,
-                angle_of_attack)
-
-    q = 0.5 * rho_w * relative_wind_speed**2
-    wind_force_surge = 10**-3 * q * C_X * frontal_area
-    wind_force_sway  = 10**-3 * q * C_Y * lateral_area 
-    wind_moment_yaw  = 10**-3 * q * C_N * lateral_area * Loa
-
-    wind_forces_and_moment = np.matrix([[wind_force_surge],
-                                        [wind_force_sway],
-                                        [wind_moment_yaw]])
-
-    return wind_forces_and_moment
+            raise ValueError("Please enter the correct parameters for Isherwood.")
+        C_X, C_Y, C_N = wc.isherwood(frontal_area, lateral_area, superstructure_area, Loa, breadth, S, s_L, masts,
+            angle_of_attack, dtype=dtype)
+    elif coeffs is CoefficientType.fourier_fit:
+        if coefficient_fit is None:
+            raise ValueError("Please enter the coefficient fit.")
+        C_X, C_Y, C_N = coefficient_fit.evaluate(angle_of_attack, dtype=dtype)
+    else:
+        raise ValueError("Illegal coefficient type for wind forces: {0}".format(coeffs))
+
+    return fl.quadratic_loads(rho_w, relative_wind_speed, C_X, C_Y, C_N, frontal_area, lateral_area, Loa,
+                              dtype=dtype)
 
 
 def calculate_rho_w(temperature):
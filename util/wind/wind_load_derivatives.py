@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""Analytic derivatives of the wind loads, and a search for the optimal heading.
+
+The wind loads are tau = 1/2 rho V^2 C(alpha) A, where the relative wind speed V
+and the angle of attack alpha depend on the vessel heading and the wind speed.
+The derivatives follow from the chain rule, with the analytic derivatives of the
+wind coefficients with respect to the angle of attack.
+
+optimal_heading() finds the heading with the least wind load for many wind
+conditions at once. It evaluates a coarse grid of headings, brackets the best
+minimum of the objective, and refines it with safeguarded secant steps on the
+derivative of the objective, instead of evaluating the loads every 0.1 degree.
+"""
+
+from pymarcyb.util.enumerations import CoefficientType
+from pymarcyb.util.kinematics import angle_transformation as at
+from pymarcyb.util.wind import wind_coefficients as wc
+from pymarcyb.util.wind import wind_forces as wf
+import numpy as np
+
+
+def wind_load_derivatives(wind_speed, wind_direction, frontal_area, lateral_area, Loa, s_L, coeffs=
+                          CoefficientType.blendermann, vessel_type=None, superstructure_area=None, breadth=None,
+                          S=None, masts=None, temperature=20.0, vessel_heading=0.0, vessel_speed_surge=0.0,
+                          vessel_speed_sway=0.0, coefficient_fit=None):
+    """Return the wind loads and their derivatives with respect to the vessel heading and the wind speed.
+
+    The arguments are the same as for wind_forces.wind_forces_and_moment_batch(), and are
+    broadcast against each other.
+
+    Returns:
+        loads (np.ndarray)                  -- the wind forces and moment in kN/kNm, shape (3, ...)
+        d_heading (np.ndarray)              -- derivatives with respect to the heading in kN/rad and kNm/rad,
+                                               shape (3, ...)
+        d_wind_speed (np.ndarray)           -- derivatives with respect to the wind speed in kN/(m/s) and
+                                               kNm/(m/s), shape (3, ...)
+
+    Raises:
+        ValueError                          -- if the parameters for the coefficient type are missing
+    """
+
+    rho_w = wf.calculate_rho_w(np.asarray(temperature, dtype=float))
+
+    # Relative wind and its derivatives, as in flow_loads.relative_flow()
+    relative_direction = np.asarray(wind_direction, dtype=float) - vessel_heading
+    cos_direction, sin_direction = np.cos(relative_direction), np.sin(relative_direction)
+    u_r = vessel_speed_surge - wind_speed * cos_direction
+    v_r = vessel_speed_sway - wind_speed * sin_direction
+    V_squared = u_r**2 + v_r**2
+    V = np.sqrt(V_squared)
+    angle_of_attack = np.arctan2(v_r, u_r) + np.pi
+
+    du_r_heading, dv_r_heading = -wind_speed * sin_direction, wind_speed * cos_direction
+    du_r_speed, dv_r_speed = -cos_direction, -sin_direction
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dalpha_heading = np.where(V_squared > 0.0, (u_r * dv_r_heading - v_r * du_r_heading) / V_squared, 0.0)
+        dalpha_speed = np.where(V_squared > 0.0, (u_r * dv_r_speed - v_r * du_r_speed) / V_squared, 0.0)
+
+    # d(V^2) = 2 (u_r du_r + v_r dv_r)
+    dV_squared_heading = 2 * (u_r * du_r_heading + v_r * dv_r_heading)
+    dV_squared_speed = 2 * (u_r * du_r_speed + v_r * dv_r_speed)
+
+    C, dC = _coefficients_and_derivatives(angle_of_attack, frontal_area, lateral_area, Loa, s_L, coeffs,
+                                          vessel_type, superstructure_area, breadth, S, masts, coefficient_fit)
+
+    # Loads per unit dynamic pressure and coefficient, in kN
+    scale = 10**-3 * 0.5 * rho_w * np.array([frontal_area, lateral_area, lateral_area * Loa]).reshape(
+        (3,) + (1,) * np.ndim(V))
+    C, dC = np.array(np.broadcast_arrays(*C)), np.array(np.broadcast_arrays(*dC))
+
+    loads = scale * V_squared * C
+    d_heading = scale * (dV_squared_heading * C + V_squared * dC * dalpha_heading)
+    d_wind_speed = scale * (dV_squared_speed * C + V_squared * dC * dalpha_speed)
+
+    return loads, d_heading, d_wind_speed
+
+
+def optimal_heading(wind_speed, wind_direction, frontal_area, lateral_area, Loa, s_L, coeffs=
+                    CoefficientType.blendermann, vessel_type=None, superstructure_area=None, breadth=None, S=None,
+                    masts=None, temperature=20.0, coefficient_fit=None, objective="thrust", n_grid=72,
+                    n_iterations=12):
+    """Return the headings with the least wind load, for arrays of wind conditions.
+
+    The objectives are:
+        "thrust"        -- the sum of squares of the forces and of the moment divided by Loa,
+                           as a measure of the thrust needed to hold the vessel
+        "yaw_moment"    -- zero yaw moment, i.e. the weathervane heading the wind turns the vessel
+                           towards, the one with the least thrust measure if there are several
+
+    Args:
+        wind_speed (array of floats)        -- wind speed in m/s
+        wind_direction (array of floats)    -- wind direction in radians
+        objective (string)                  -- "thrust" or "yaw_moment" (default: "thrust")
+        n_grid (int)                        -- number of headings in the coarse grid (default: 72)
+        n_iterations (int)                  -- number of refining iterations (default: 12)
+        See wind_forces.wind_forces_and_moment_batch() for the other arguments.
+
+    Returns:
+        headings (np.ndarray)               -- the optimal headings in radians, between -pi and pi
+        loads (np.ndarray)                  -- the wind forces and moment at the headings in kN/kNm,
+                                               shape (3, ...)
+
+    Raises:
+        ValueError                          -- if the objective is unknown
+    """
+
+    if objective not in ("thrust", "yaw_moment"):
+        raise ValueError("Illegal objective: {0}".format(objective))
+
+    wind_speed, wind_direction, temperature = np.broadcast_arrays(
+        np.asarray(wind_speed, dtype=float), np.asarray(wind_direction, dtype=float),
+        np.asarray(temperature, dtype=float))
+    shape = wind_speed.shape
+    wind_speed, wind_direction, temperature = (x.reshape(-1, 1) for x in (wind_speed, wind_direction, temperature))
+
+    parameters = dict(frontal_area=frontal_area, lateral_area=lateral_area, Loa=Loa, s_L=s_L, coeffs=coeffs,
+                      vessel_type=vessel_type, superstructure_area=superstructure_area, breadth=breadth, S=S,
+                      masts=masts, coefficient_fit=coefficient_fit)
+    weights = np.array([1.0, 1.0, 1.0 / Loa**2]).reshape(3, 1, 1)
+
+    def evaluate(headings):
+        """Return the loads, the thrust measure, and the function whose zero crossing from below is sought."""
+        loads, d_heading, _ = wind_load_derivatives(wind_speed, wind_direction, vessel_heading=headings,
+                                                    temperature=temperature, **parameters)
+        J = (weights * loads**2).sum(axis=0)
+        if objective == "thrust":
+            return loads, J, (2 * weights * loads * d_heading).sum(axis=0)
+        # The stable equilibria are where the moment goes from positive to negative
+        return loads, J, -loads[2]
+
+    # Coarse grid, and the bracket of each condition
+    step = 2 * np.pi / n_grid
+    grid = np.arange(n_grid) * step
+    loads, J, g = evaluate(grid[np.newaxis, :])
+    rows = np.arange(len(wind_speed))
+
+    if objective == "thrust":
+        # The least thrust grid point, and its downhill neighbour
+        best = np.argmin(J, axis=1)
+        a = grid[best] + np.where(g[rows, best] < 0.0, 0.0, -step)
+    else:
+        # The stable equilibrium with the least thrust, or the smallest moment if there is none
+        crossing = (g < 0.0) & (np.roll(g, -1, axis=1) >= 0.0)
+        best = np.where(crossing.any(axis=1), np.argmin(np.where(crossing, J, np.inf), axis=1),
+                        np.argmin(np.abs(g), axis=1))
+        a = grid[best]
+    b = a + step
+    g_a = evaluate(a[:, np.newaxis])[2][:, 0]
+    g_b = evaluate(b[:, np.newaxis])[2][:, 0]
+
+    # Safeguarded secant (regula falsi, Illinois variant) on g = 0, bisection where there is no sign change
+    side = np.zeros(len(a))
+    for _ in range(n_iterations):
+        bracketed = (g_a < 0.0) & (g_b > 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            secant = a - g_a * (b - a) / (g_b - g_a)
+        t = np.where(bracketed & (secant > a) & (secant < b), secant, 0.5 * (a + b))
+        g_t = evaluate(t[:, np.newaxis])[2][:, 0]
+
+        left = g_t < 0.0
+        a, g_a = np.where(left, t, a), np.where(left, g_t, g_a)
+        b, g_b = np.where(left, b, t), np.where(left, g_b, g_t)
+
+        # Halve the value at the end point that was kept twice, so the secant does not get stuck
+        g_b = np.where(left & (side == 1), 0.5 * g_b, g_b)
+        g_a = np.where(~left & (side == -1), 0.5 * g_a, g_a)
+        side = np.where(left, 1, -1)
+
+    # The best of the end points and the middle of the bracket, as the coefficients may jump in the bracket,
+    # e.g. Isherwood's at head wind
+    candidates = np.column_stack((a, 0.5 * (a + b), b))
+    loads, J, g = evaluate(candidates)
+    best = np.argmin(J if objective == "thrust" else np.abs(g), axis=1)
+    headings, _ = at.transform_to_pipi_array(candidates[rows, best])
+
+    return headings.reshape(shape), loads[:, rows, best].reshape((3,) + shape)
+
+
+def _coefficients_and_derivatives(angle_of_attack, frontal_area, lateral_area, Loa, s_L, coeffs, vessel_type,
+                                  superstructure_area, breadth, S, masts, coefficient_fit):
+    """Return the wind coefficients and their derivatives with respect to the angle of attack."""
+
+    if coeffs is CoefficientType.blendermann:
+        if vessel_type is None:
+            raise ValueError("Please enter the correct parameters for Blendermann.")
+        return (wc.blendermann(vessel_type, frontal_area, lateral_area, Loa, s_L, angle_of_attack),
+                wc.blendermann_derivatives(vessel_type, frontal_area, lateral_area, Loa, s_L, angle_of_attack))
+    elif coeffs is CoefficientType.isherwood:
+        if superstructure_area is None or breadth is None or S is None or masts is None:
+            raise ValueError("Please enter the correct parameters for Isherwood.")
+        vessel = (frontal_area, lateral_area, superstructure_area, Loa, breadth, S, s_L, masts)
+        return wc.isherwood(*vessel, angle_of_attack), wc.isherwood_derivatives(*vessel, angle_of_attack)
+    elif coeffs is CoefficientType.fourier_fit:
+        if coefficient_fit is None:
+            raise ValueError("Please enter the coefficient fit.")
+        return coefficient_fit.evaluate(angle_of_attack), coefficient_fit.derivatives(angle_of_attack)
+
+    raise ValueError("Illegal coefficient type for wind forces: {0}".format(coeffs))
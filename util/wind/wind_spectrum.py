@@ -2,6 +2,7 @@
 """Functions related to wind spectras."""
 
 from math import log, sqrt
+from pymarcyb.util.enumerations import WindSpectrumType
 import numpy as np
 
 
@@ -173,3 +174,192 @@ def U10_to_Uz(U_10, C_10, z):
     u_star = sqrt(C_10 * U_10)
     U_z = U_10 + 2.5 * u_star * log(z/10.0)
     return U_z
+
+
+def U10_to_Uz_batch(U_10, C_10, z, dtype=np.float64):
+    """Returns the mean wind speed at heights z given the mean wind speed
+    at 10 m (U_10), for arrays of wind speeds and heights, broadcast against
+    each other.
+
+    Args:
+        U_10 (array of floats)       -- mean wind speed at 10 m altitude [m/s]
+        C_10 (float)                 -- surface drag coefficient at altitude 10 m [-]
+        z (array of floats)          -- the altitudes to calculate mean wind speed for [m]
+        dtype (np.dtype)             -- float32 or float64, the precision of the calculation.
+                                        With float32 the wind speeds are within 1e-6 of float64,
+                                        relative (default: float64)
+
+    Returns:
+        U_z (np.ndarray)             -- mean wind speed at the altitudes z [m/s]
+    """
+
+    U_10 = np.asarray(U_10, dtype=dtype)
+    u_star = np.sqrt(np.dtype(dtype).type(C_10) * U_10)
+
+    return U_10 + 2.5 * u_star * np.log(np.asarray(z, dtype=dtype) / 10.0)
+
+
+def davenport_batch(U_10, frequencies, kappa=0.0025, L=1200, dtype=np.float64):
+    """Returns the Davenport wind gust spectrum for arrays of mean wind
+    speeds and frequencies, broadcast against each other.
+
+    Args:
+        U_10 (array of floats)          -- mean wind speed at 10 m altitude [m/s]
+        frequencies (array of floats)   -- the frequencies [Hz]
+        kappa (float)                   -- surface drag coefficient [-]
+        L (float)                       -- scale length [m]
+        dtype (np.dtype)                -- float32 or float64, the precision of the calculation.
+                                           With float32 the spectrum is within 2e-6 of float64,
+                                           relative (default: float64)
+
+    Returns:
+        spectrum (np.ndarray)           -- the Davenport wind spectrum
+    """
+
+    kappa, L = np.dtype(dtype).type(kappa), np.dtype(dtype).type(L)
+    U_10 = np.asarray(U_10, dtype=dtype)
+    chi = np.asarray(frequencies, dtype=dtype) * L / U_10
+
+    return (4 * kappa * L * U_10 * chi) / (1 + chi**2)**(4.0/3.0)
+
+
+def harris_batch(U_10, frequencies, kappa=0.0025, L=1800, dtype=np.float64):
+    """Returns the Harris wind gust spectrum for arrays of mean wind
+    speeds and frequencies, broadcast against each other.
+
+    Args:
+        U_10 (array of floats)          -- mean wind speed at 10 m altitude [m/s]
+        frequencies (array of floats)   -- the frequencies [Hz]
+        kappa (float)                   -- surface drag coefficient [-]
+        L (float)                       -- scale length [m]
+        dtype (np.dtype)                -- float32 or float64, the precision of the calculation.
+                                           With float32 the spectrum is within 2e-6 of float64,
+                                           relative (default: float64)
+
+    Returns:
+        spectrum (np.ndarray)           -- the Harris wind spectrum
+    """
+
+    kappa, L = np.dtype(dtype).type(kappa), np.dtype(dtype).type(L)
+    U_10 = np.asarray(U_10, dtype=dtype)
+    chi = np.asarray(frequencies, dtype=dtype) * L / U_10
+
+    return (4 * kappa * L * U_10) / (2 + chi**2)**(5.0/6.0)
+
+
+def ochi_shin_batch(U_10, frequencies, C_10=0.025, dtype=np.float64):
+    """Returns the Ochi-Shin wind gust spectrum for arrays of mean wind
+    speeds and frequencies, broadcast against each other.
+
+    The non-dimensional frequency is frequency / U_10, as in ochi_shin().
+
+    Args:
+        U_10 (array of floats)          -- mean wind speed at 10 m altitude [m/s]
+        frequencies (array of floats)   -- the frequencies [Hz]
+        C_10 (float)                    -- surface drag coefficient at altitude 10 m [-]
+        dtype (np.dtype)                -- float32 or float64, the precision of the calculation.
+                                           With float32 the spectrum is within 2e-6 of float64,
+                                           relative (default: float64)
+
+    Returns:
+        spectrum (np.ndarray)           -- the Ochi-Shin wind spectrum
+    """
+
+    U_10 = np.asarray(U_10, dtype=dtype)
+    frequencies = np.asarray(frequencies, dtype=dtype)
+    f_star = frequencies / U_10
+
+    nondimensional = np.where(f_star <= 0.003, 583 * f_star,
+                              np.where(f_star <= 0.1, (420 * f_star**0.70) / (1 + f_star**0.35)**11.5,
+                                       (838 * f_star) / (1 + f_star**0.35)**11.5))
+    u_star = np.sqrt(np.dtype(dtype).type(C_10)) * U_10
+
+    return nondimensional * u_star**2 / frequencies
+
+
+def npd_batch(U_10, frequencies, dtype=np.float64):
+    """Returns the NPD wind gust spectrum for arrays of mean wind
+    speeds and frequencies, broadcast against each other.
+
+    Args:
+        U_10 (array of floats)          -- mean wind speed at 10 m altitude [m/s]
+        frequencies (array of floats)   -- the frequencies [Hz]
+        dtype (np.dtype)                -- float32 or float64, the precision of the calculation.
+                                           With float32 the spectrum is within 2e-6 of float64,
+                                           relative (default: float64)
+
+    Returns:
+        spectrum (np.ndarray)           -- the NPD wind spectrum
+    """
+
+    n = 0.468
+    U_10 = np.asarray(U_10, dtype=dtype)
+    f_bar = 172.0 * np.asarray(frequencies, dtype=dtype) * (U_10/10.0)**-0.75
+
+    return (320.0 * (U_10/10.0)**2) / (1 + f_bar**n)**(5/(3*n))
+
+
+def api_batch(U_10, frequencies, C=0.025, dtype=np.float64):
+    """Returns the API wind gust spectrum for arrays of mean wind
+    speeds and frequencies, broadcast against each other.
+
+    Args:
+        U_10 (array of floats)          -- mean wind speed at 10 m altitude [m/s]
+        frequencies (array of floats)   -- the frequencies [Hz]
+        C (float)                       -- spectrum parameter, between 0.01 and 0.1 [-]
+        dtype (np.dtype)                -- float32 or float64, the precision of the calculation.
+                                           With float32 the spectrum is within 2e-6 of float64,
+                                           relative (default: float64)
+
+    Returns:
+        spectrum (np.ndarray)           -- the API wind spectrum
+    """
+
+    U_10 = np.asarray(U_10, dtype=dtype)
+    omega = 0.15 * U_10 * 0.5**-0.125
+    f_p = np.dtype(dtype).type(C) * 0.1 * U_10
+
+    return (omega**2 / f_p) / (1 + 1.5 * (np.asarray(frequencies, dtype=dtype)/f_p)**(5.0/3.0))
+
+
+WIND_SPECTRUM_BATCH_FUNCTIONS = {
+    WindSpectrumType.davenport: davenport_batch,
+    WindSpectrumType.harris: harris_batch,
+    WindSpectrumType.ochi_shin: ochi_shin_batch,
+    WindSpectrumType.npd: npd_batch,
+    WindSpectrumType.api: api_batch,
+}
+
+WIND_SPECTRUM_PARAMETERS = {
+    WindSpectrumType.davenport: ("kappa", "L"),
+    WindSpectrumType.harris: ("kappa", "L"),
+    WindSpectrumType.ochi_shin: ("C_10",),
+    WindSpectrumType.npd: (),
+    WindSpectrumType.api: ("C",),
+}
+
+
+def wind_spectrum_batch(spectrum_type, U_10, frequencies, dtype=np.float64, **parameters):
+    """Returns a wind gust spectrum of the given type for arrays of mean
+    wind speeds and frequencies, broadcast against each other.
+
+    Args:
+        spectrum_type (WindSpectrumType)    -- the type of spectrum
+        U_10 (array of floats)              -- mean wind speed at 10 m altitude [m/s]
+        frequencies (array of floats)       -- the frequencies [Hz]
+        dtype (np.dtype)                    -- float32 or float64, the precision of the calculation. With
+                                               float32 the spectra are within 2e-6 of float64, relative
+                                               (default: float64)
+        parameters                          -- the spectrum parameters, e.g. kappa and L
+
+    Returns:
+        spectrum (np.ndarray)               -- the wind spectrum
+
+    Raises:
+        ValueError                          -- if the spectrum type is unknown
+    """
+
+    if spectrum_type not in WIND_SPECTRUM_BATCH_FUNCTIONS:
+        raise ValueError("Illegal wind spectrum type: {0}".format(spectrum_type))
+
+    return WIND_SPECTRUM_BATCH_FUNCTIONS[spectrum_type](U_10, frequencies, dtype=dtype, **parameters)